@@ -4,41 +4,42 @@ import numpy as np
 import talib.abstract as ta
 import pandas_ta as pta
 from typing import Dict, List
+import logging
 
 from freqtrade.persistence import Trade
 from freqtrade.strategy.interface import IStrategy
 from pandas import DataFrame, Series, DatetimeIndex, merge
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from freqtrade.strategy import merge_informative_pair, CategoricalParameter, DecimalParameter, IntParameter, stoploss_from_open
 from functools import reduce
+from pathlib import Path
 from technical.indicators import RMI, zema
+from strategy_utils.dependencies import ColumnUsage
+from strategy_utils.indicators import ewo, williams_r
+from strategy_utils.lazy import LazyColumns
+from strategy_utils.market_context import MarketContextCache, shift
+from strategy_utils.ohlcv import OHLCVStore
+from strategy_utils.snapshot import LastCandleCache
+from strategy_utils.trailing import BUY, STOP, UPDATE, TrailingBuyBook, TrailingBuyState
+
+logger = logging.getLogger(__name__)
 
 # --------------------------------
-def EWO(dataframe, ema_length=5, ema2_length=35):
-    df = dataframe.copy()
-    ema1 = ta.EMA(df, timeperiod=ema_length)
-    ema2 = ta.EMA(df, timeperiod=ema2_length)
-    emadif = (ema1 - ema2) / df['low'] * 100
-    return emadif
-
-# Williams %R
-def williams_r(dataframe: DataFrame, period: int = 14) -> Series:
-    """Williams %R, or just %R, is a technical analysis oscillator showing the current closing price in relation to the high and low
-        of the past N days (for a given N). It was developed by a publisher and promoter of trading materials, Larry Williams.
-        Its purpose is to tell whether a stock or commodity market is trading near the high or the low, or somewhere in between,
-        of its recent trading range.
-        The oscillator is on a negative scale, from −100 (lowest) up to 0 (highest).
-    """
-
-    highest_high = dataframe["high"].rolling(center=False, window=period).max()
-    lowest_low = dataframe["low"].rolling(center=False, window=period).min()
-
-    WR = Series(
-        (highest_high - dataframe["close"]) / (highest_high - lowest_low),
-        name=f"{period} Williams %R",
-        )
 
-    return WR * -100
+
+def btc_dump_protection(informative: DataFrame, threshold: float) -> Dict[str, np.ndarray]:
+    source = ((informative['open'] + informative['close'] + informative['high'] + informative['low']) / 4).to_numpy()
+    close = informative['close'].to_numpy()
+    btc_5m = shift(source, 1)                                   # Get recent BTC price
+    btc_threshold = btc_5m * threshold                          # BTC dump n% in 5 min
+    btc_delta = shift(close, 2) - shift(close, 1)               # should be positive if dump
+    return {
+        'btc_threshold': btc_threshold,
+        'btc_diff': btc_threshold - btc_delta,                  # Need be larger than 0
+        'btc_5m': btc_5m,
+        'btc_1d': shift(source, 288),
+    }
+
 
 class BB_RPB_TSL_RNG_TBS_GOLD(IStrategy):
     '''
@@ -164,6 +165,15 @@ class BB_RPB_TSL_RNG_TBS_GOLD(IStrategy):
     ## Sell params
     sell_btc_safe = IntParameter(-400, -300, default=-365, optimize = True)
     base_nb_candles_sell = IntParameter(5, 80, default=sell_params['base_nb_candles_sell'], space='sell', optimize=True)
+
+    # cci_length_* / rmi_length_* / ma_sell_* are only built for the values in use (every value in hyperopt)
+    lazy_columns = LazyColumns()
+
+    # BTC protection columns shared by all pairs
+    market_context = MarketContextCache()
+
+    # indicator columns no condition or callback reads are skipped
+    column_usage = ColumnUsage()
     high_offset          = DecimalParameter(0.95, 1.1, default=sell_params['high_offset'], space='sell', optimize=True)
     high_offset_2        = DecimalParameter(0.99, 1.5, default=sell_params['high_offset_2'], space='sell', optimize=True)      
 
@@ -181,6 +191,11 @@ class BB_RPB_TSL_RNG_TBS_GOLD(IStrategy):
 
     ############################################################################
 
+    def bot_start(self, **kwargs) -> None:
+        # BTC candles of backtests / hyperopt from the OHLCVStore, once imported there
+        if self.config['runmode'].value in ('hyperopt', 'backtest'):
+            self.market_context.store = OHLCVStore(Path(self.config['user_data_dir']) / 'ohlcv')
+
     def informative_pairs(self):
 
         pairs = self.dp.current_whitelist()
@@ -227,6 +242,21 @@ class BB_RPB_TSL_RNG_TBS_GOLD(IStrategy):
 
     ############################################################################
 
+    def ensure_hyperopt_columns(self, dataframe: DataFrame, metadata: dict, every_value: bool = False) -> None:
+        # columns depending on hyperoptable lengths, the values can change per hyperopt epoch,
+        # every_value: for all values of .range, see LazyColumns about hyperopt
+        pair = metadata['pair']
+
+        def values(parameter):
+            return parameter.range if every_value else [parameter.value]
+
+        for cci_length in values(self.buy_cci_length):
+            self.lazy_columns.ensure(dataframe, pair, f'cci_length_{cci_length}', ta.CCI, timeperiod=cci_length)
+        for rmi_length in values(self.buy_rmi_length):
+            self.lazy_columns.ensure(dataframe, pair, f'rmi_length_{rmi_length}', RMI, length=rmi_length, mom=4)
+        for ma_sell in values(self.base_nb_candles_sell):
+            self.lazy_columns.ensure(dataframe, pair, f'ma_sell_{ma_sell}', ta.EMA, timeperiod=ma_sell)
+
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
 
         assert self.dp, "DataProvider is required for multiple timeframes."
@@ -244,45 +274,35 @@ class BB_RPB_TSL_RNG_TBS_GOLD(IStrategy):
 
         ### BTC protection
 
-        # BTC info
-        if self.config['stake_currency'] in ['USDT','BUSD','USDC','DAI','TUSD','PAX','USD','EUR','GBP']:
-            btc_info_pair = f"BTC/{self.config['stake_currency']}"
-        else:
-            btc_info_pair = "BTC/USDT"
-        inf_tf = '5m'
-        informative = self.dp.get_pair_dataframe(btc_info_pair, timeframe=inf_tf)
-        informative_past = informative.copy().shift(1)                                                                                                   # Get recent BTC info
-
-        # BTC 5m dump protection
-        informative_past_source = (informative_past['open'] + informative_past['close'] + informative_past['high'] + informative_past['low']) / 4        # Get BTC price
-        informative_threshold = informative_past_source * self.buy_threshold.value                                                                       # BTC dump n% in 5 min
-        informative_past_delta = informative_past['close'].shift(1) - informative_past['close']                                                          # should be positive if dump
-        informative_diff = informative_threshold - informative_past_delta                                                                                # Need be larger than 0
-        dataframe['btc_threshold'] = informative_threshold
-        dataframe['btc_diff'] = informative_diff
-
-        # BTC 1d dump protection
-        informative_past_1d = informative.copy().shift(288)
-        informative_past_source_1d = (informative_past_1d['open'] + informative_past_1d['close'] + informative_past_1d['high'] + informative_past_1d['low']) / 4
-        dataframe['btc_5m'] = informative_past_source
-        dataframe['btc_1d'] = informative_past_source_1d
+        # BTC 5m / 1d dump protection, computed once per candle for all pairs
+        # (not fetched while the is_btc_safe condition stays commented out)
+        if self.column_usage.needs('btc_threshold', 'btc_diff', 'btc_5m', 'btc_1d'):
+            # BTC info
+            if self.config['stake_currency'] in ['USDT','BUSD','USDC','DAI','TUSD','PAX','USD','EUR','GBP']:
+                btc_info_pair = f"BTC/{self.config['stake_currency']}"
+            else:
+                btc_info_pair = "BTC/USDT"
+            inf_tf = '5m'
+
+            btc_context = self.market_context.get(self.dp, btc_info_pair, inf_tf, btc_dump_protection,
+                                                  self.buy_threshold.value, candle=dataframe['date'].iat[-1],
+                                                  first=dataframe['date'].iat[0])
+            for name, values in btc_context.align(dataframe).items():
+                if self.column_usage.needs(name):
+                    dataframe[name] = values
 
         ### Other checks
 
         dataframe['bb_width'] = ((dataframe['bb_upperband2'] - dataframe['bb_lowerband2']) / dataframe['bb_middleband2'])
         dataframe['bb_delta'] = ((dataframe['bb_lowerband2'] - dataframe['bb_lowerband3']) / dataframe['bb_lowerband2'])
-        dataframe['bb_bottom_cross'] = qtpylib.crossed_below(dataframe['close'], dataframe['bb_lowerband3']).astype('int')
-
-        # CCI hyperopt
-        for val in self.buy_cci_length.range:
-            dataframe[f'cci_length_{val}'] = ta.CCI(dataframe, val)
+        if self.column_usage.needs('bb_bottom_cross'):
+            dataframe['bb_bottom_cross'] = qtpylib.crossed_below(dataframe['close'], dataframe['bb_lowerband3']).astype('int')
 
-        dataframe['cci'] = ta.CCI(dataframe, 26)
-        dataframe['cci_long'] = ta.CCI(dataframe, 170)
+        if self.column_usage.needs('cci'):
+            dataframe['cci'] = ta.CCI(dataframe, 26)
+        if self.column_usage.needs('cci_long'):
+            dataframe['cci_long'] = ta.CCI(dataframe, 170)
 
-        # RMI hyperopt
-        for val in self.buy_rmi_length.range:
-            dataframe[f'rmi_length_{val}'] = RMI(dataframe, length=val, mom=4)
         #dataframe['rmi'] = RMI(dataframe, length=8, mom=4)
 
         # SRSI hyperopt ?
@@ -295,7 +315,8 @@ class BB_RPB_TSL_RNG_TBS_GOLD(IStrategy):
 
         # SMA
         dataframe['sma_15'] = ta.SMA(dataframe, timeperiod=15)
-        dataframe['sma_30'] = ta.SMA(dataframe, timeperiod=30)
+        if self.column_usage.needs('sma_30'):
+            dataframe['sma_30'] = ta.SMA(dataframe, timeperiod=30)
 
         # CTI
         dataframe['cti'] = pta.cti(dataframe["close"], length=20)
@@ -307,7 +328,8 @@ class BB_RPB_TSL_RNG_TBS_GOLD(IStrategy):
         dataframe['ema_16'] = ta.EMA(dataframe, timeperiod=16)
         dataframe['ema_26'] = ta.EMA(dataframe, timeperiod=26)
         dataframe['hma_50'] = qtpylib.hull_moving_average(dataframe['close'], window=50)
-        dataframe['ema_100'] = ta.EMA(dataframe, timeperiod=100)   
+        if self.column_usage.needs('ema_100'):
+            dataframe['ema_100'] = ta.EMA(dataframe, timeperiod=100)
         dataframe['sma_9'] = ta.SMA(dataframe, timeperiod=9)        
 
         # RSI
@@ -316,7 +338,7 @@ class BB_RPB_TSL_RNG_TBS_GOLD(IStrategy):
         dataframe['rsi_slow'] = ta.RSI(dataframe, timeperiod=20)
 
         # Elliot
-        dataframe['EWO'] = EWO(dataframe, 50, 200)
+        dataframe['EWO'] = ewo(dataframe, 50, 200, normalize_by='low')
 
         # Cofi
         stoch_fast = ta.STOCHF(dataframe, 5, 3, 0, 3, 0)
@@ -331,14 +353,13 @@ class BB_RPB_TSL_RNG_TBS_GOLD(IStrategy):
         dataframe['volume_mean_4'] = dataframe['volume'].rolling(4).mean().shift(1)
 
 
-        # Calculate all ma_sell values
-        for val in self.base_nb_candles_sell.range:
-            dataframe[f'ma_sell_{val}'] = ta.EMA(dataframe, timeperiod=val)        
+        # CCI / RMI / ma_sell hyperopt
+        self.ensure_hyperopt_columns(dataframe, metadata, every_value=True)
 
         return dataframe
 
     def populate_buy_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
-
+        self.ensure_hyperopt_columns(dataframe, metadata)
 
         conditions = []
         dataframe.loc[:, 'buy_tag'] = ''
@@ -463,6 +484,7 @@ class BB_RPB_TSL_RNG_TBS_GOLD(IStrategy):
         return dataframe
 
     def populate_sell_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+        self.ensure_hyperopt_columns(dataframe, metadata)
         conditions = []
 
         conditions.append(
@@ -506,7 +528,11 @@ class TrailingBuyStrat2(BB_RPB_TSL_RNG_TBS_GOLD):
 
     process_only_new_candles = True
 
-    custom_info_trail_buy = dict()
+    # trailing buy state per pair
+    trailing_buy_book = TrailingBuyBook()
+
+    # last analyzed candle per pair for confirm_trade_entry
+    last_candles = LastCandleCache()
 
     # Trailing buy parameters
     trailing_buy_order_enabled = True
@@ -521,23 +547,11 @@ class TrailingBuyStrat2(BB_RPB_TSL_RNG_TBS_GOLD):
     trailing_buy_max_stop = 0.02  # stop trailing buy if current_price > starting_price * (1+trailing_buy_max_stop)
     trailing_buy_max_buy = 0.000  # buy if price between uplimit (=min of serie (current_price * (1 + trailing_buy_offset())) and (start_price * 1+trailing_buy_max_buy))
 
-    init_trailing_dict = {
-        'trailing_buy_order_started': False,
-        'trailing_buy_order_uplimit': 0,
-        'start_trailing_price': 0,
-        'buy_tag': None,
-        'start_trailing_time': None,
-        'offset': 0,
-        'allow_trailing': False,
-    }
-
-    def trailing_buy(self, pair, reinit=False):
-        # returns trailing buy info for pair (init if necessary)
-        if not pair in self.custom_info_trail_buy:
-            self.custom_info_trail_buy[pair] = dict()
-        if (reinit or not 'trailing_buy' in self.custom_info_trail_buy[pair]):
-            self.custom_info_trail_buy[pair]['trailing_buy'] = self.init_trailing_dict.copy()
-        return self.custom_info_trail_buy[pair]['trailing_buy']
+    def trailing_buy(self, pair, reinit=False) -> TrailingBuyState:
+        # returns trailing buy info for pair (reset in place if reinit)
+        if reinit:
+            return self.trailing_buy_book.reset(pair)
+        return self.trailing_buy_book[pair]
 
     def trailing_buy_info(self, pair: str, current_price: float):
         # current_time live, dry run
@@ -548,25 +562,21 @@ class TrailingBuyStrat2(BB_RPB_TSL_RNG_TBS_GOLD):
 
         duration = 0
         try:
-            duration = (current_time - trailing_buy['start_trailing_time'])
+            duration = (current_time - trailing_buy.start_time)
         except TypeError:
             duration = 0
         finally:
             logger.info(
                 f"pair: {pair} : "
-                f"start: {trailing_buy['start_trailing_price']:.4f}, "
+                f"start: {trailing_buy.start_price:.4f}, "
                 f"duration: {duration}, "
                 f"current: {current_price:.4f}, "
-                f"uplimit: {trailing_buy['trailing_buy_order_uplimit']:.4f}, "
-                f"profit: {self.current_trailing_profit_ratio(pair, current_price)*100:.2f}%, "
-                f"offset: {trailing_buy['offset']}")
+                f"uplimit: {trailing_buy.uplimit:.4f}, "
+                f"profit: {trailing_buy.profit_ratio(current_price)*100:.2f}%, "
+                f"offset: {trailing_buy.offset}")
 
     def current_trailing_profit_ratio(self, pair: str, current_price: float) -> float:
-        trailing_buy = self.trailing_buy(pair)
-        if trailing_buy['trailing_buy_order_started']:
-            return (trailing_buy['start_trailing_price'] - current_price) / trailing_buy['start_trailing_price']
-        else:
-            return 0
+        return self.trailing_buy(pair).profit_ratio(current_price)
 
     def trailing_buy_offset(self, dataframe, pair: str, current_price: float):
         # return rebound limit before a buy in % of initial price, function of current price
@@ -577,14 +587,14 @@ class TrailingBuyStrat2(BB_RPB_TSL_RNG_TBS_GOLD):
         default_offset = 0.005
 
         trailing_buy = self.trailing_buy(pair)
-        if not trailing_buy['trailing_buy_order_started']:
+        if not trailing_buy.started:
             return default_offset
 
         # example with duration and indicators
         # dry run, live only
-        last_candle = dataframe.iloc[-1]
+        last_candle = self.last_candles.get(self.dp, pair, self.timeframe)
         current_time = datetime.now(timezone.utc)
-        trailing_duration = current_time - trailing_buy['start_trailing_time']
+        trailing_duration = current_time - trailing_buy.start_time
         if trailing_duration.total_seconds() > self.trailing_expire_seconds:
             if ((current_trailing_profit_ratio > 0) and (last_candle['buy'] == 1)):
                 # more than 1h, price under first signal, buy signal still active -> buy
@@ -627,34 +637,20 @@ class TrailingBuyStrat2(BB_RPB_TSL_RNG_TBS_GOLD):
             if self.trailing_buy_order_enabled and self.config['runmode'].value in ('live', 'dry_run'):
                 val = False
                 dataframe, _ = self.dp.get_analyzed_dataframe(pair, self.timeframe)
-                if(len(dataframe) >= 1):
-                    last_candle = dataframe.iloc[-1].squeeze()
+                last_candle = self.last_candles.get(self.dp, pair, self.timeframe)
+                if last_candle is not None:
                     current_price = rate
                     trailing_buy = self.trailing_buy(pair)
                     trailing_buy_offset = self.trailing_buy_offset(dataframe, pair, current_price)
 
-                    if trailing_buy['allow_trailing']:
-                        if (not trailing_buy['trailing_buy_order_started'] and (last_candle['buy'] == 1)):
+                    if trailing_buy.allow_trailing:
+                        if (not trailing_buy.started and (last_candle['buy'] == 1)):
                             # start trailing buy
-                            
-                            # self.custom_info_trail_buy[pair]['trailing_buy']['trailing_buy_order_started'] = True
-                            # self.custom_info_trail_buy[pair]['trailing_buy']['trailing_buy_order_uplimit'] = last_candle['close']
-                            # self.custom_info_trail_buy[pair]['trailing_buy']['start_trailing_price'] = last_candle['close']
-                            # self.custom_info_trail_buy[pair]['trailing_buy']['buy_tag'] = f"initial_buy_tag (strat trail price {last_candle['close']})"
-                            # self.custom_info_trail_buy[pair]['trailing_buy']['start_trailing_time'] = datetime.now(timezone.utc)
-                            # self.custom_info_trail_buy[pair]['trailing_buy']['offset'] = 0
-
-                            trailing_buy['trailing_buy_order_started'] = True
-                            trailing_buy['trailing_buy_order_uplimit'] = last_candle['close']
-                            trailing_buy['start_trailing_price'] = last_candle['close']
-                            trailing_buy['buy_tag'] = last_candle['buy_tag']
-                            trailing_buy['start_trailing_time'] = datetime.now(timezone.utc)
-                            trailing_buy['offset'] = 0
-                            
+                            trailing_buy.start(last_candle['close'], last_candle['buy_tag'], datetime.now(timezone.utc))
                             self.trailing_buy_info(pair, current_price)
                             logger.info(f'start trailing buy for {pair} at {last_candle["close"]}')
 
-                        elif trailing_buy['trailing_buy_order_started']:
+                        elif trailing_buy.started:
                             if trailing_buy_offset == 'forcebuy':
                                 # buy in custom conditions
                                 val = True
@@ -667,29 +663,27 @@ class TrailingBuyStrat2(BB_RPB_TSL_RNG_TBS_GOLD):
                                 self.trailing_buy(pair, reinit=True)
                                 logger.info(f'STOP trailing buy for {pair} because "trailing buy offset" returned None')
 
-                            elif current_price < trailing_buy['trailing_buy_order_uplimit']:
-                                # update uplimit
-                                old_uplimit = trailing_buy["trailing_buy_order_uplimit"]
-                                self.custom_info_trail_buy[pair]['trailing_buy']['trailing_buy_order_uplimit'] = min(current_price * (1 + trailing_buy_offset), self.custom_info_trail_buy[pair]['trailing_buy']['trailing_buy_order_uplimit'])
-                                self.custom_info_trail_buy[pair]['trailing_buy']['offset'] = trailing_buy_offset
-                                self.trailing_buy_info(pair, current_price)
-                                logger.info(f'update trailing buy for {pair} at {old_uplimit} -> {self.custom_info_trail_buy[pair]["trailing_buy"]["trailing_buy_order_uplimit"]}')
-                            elif current_price < (trailing_buy['start_trailing_price'] * (1 + self.trailing_buy_max_buy)):
-                                # buy ! current price > uplimit && lower thant starting price
-                                val = True
-                                ratio = "%.2f" % ((self.current_trailing_profit_ratio(pair, current_price)) * 100)
-                                self.trailing_buy_info(pair, current_price)
-                                logger.info(f"current price ({current_price}) > uplimit ({trailing_buy['trailing_buy_order_uplimit']}) and lower than starting price price ({(trailing_buy['start_trailing_price'] * (1 + self.trailing_buy_max_buy))}). OK for {pair} ({ratio} %), order may not be triggered if all slots are full")
-
-                            elif current_price > (trailing_buy['start_trailing_price'] * (1 + self.trailing_buy_max_stop)):
-                                # stop trailing buy because price is too high
-                                self.trailing_buy(pair, reinit=True)
-                                self.trailing_buy_info(pair, current_price)
-                                logger.info(f'STOP trailing buy for {pair} because of the price is higher than starting price * {1 + self.trailing_buy_max_stop}')
                             else:
-                                # uplimit > current_price > max_price, continue trailing and wait for the price to go down
-                                self.trailing_buy_info(pair, current_price)
-                                logger.info(f'price too high for {pair} !')
+                                old_uplimit = trailing_buy.uplimit
+                                action = trailing_buy.step(current_price, trailing_buy_offset, self.trailing_buy_max_buy, self.trailing_buy_max_stop)
+                                if action == UPDATE:
+                                    self.trailing_buy_info(pair, current_price)
+                                    logger.info(f'update trailing buy for {pair} at {old_uplimit} -> {trailing_buy.uplimit}')
+                                elif action == BUY:
+                                    # buy ! current price > uplimit && lower thant starting price
+                                    val = True
+                                    ratio = "%.2f" % ((self.current_trailing_profit_ratio(pair, current_price)) * 100)
+                                    self.trailing_buy_info(pair, current_price)
+                                    logger.info(f"current price ({current_price}) > uplimit ({trailing_buy.uplimit}) and lower than starting price price ({(trailing_buy.start_price * (1 + self.trailing_buy_max_buy))}). OK for {pair} ({ratio} %), order may not be triggered if all slots are full")
+                                elif action == STOP:
+                                    # stop trailing buy because price is too high
+                                    self.trailing_buy(pair, reinit=True)
+                                    self.trailing_buy_info(pair, current_price)
+                                    logger.info(f'STOP trailing buy for {pair} because of the price is higher than starting price * {1 + self.trailing_buy_max_stop}')
+                                else:
+                                    # uplimit > current_price > max_price, continue trailing and wait for the price to go down
+                                    self.trailing_buy_info(pair, current_price)
+                                    logger.info(f'price too high for {pair} !')
 
                     else:
                         logger.info(f"Wait for next buy signal for {pair}")
@@ -708,19 +702,18 @@ class TrailingBuyStrat2(BB_RPB_TSL_RNG_TBS_GOLD):
             last_candle = dataframe.iloc[-1].squeeze()
             trailing_buy = self.trailing_buy(metadata['pair'])
             if (last_candle['buy'] == 1):
-                if not trailing_buy['trailing_buy_order_started']:
+                if not trailing_buy.started:
                     open_trades = Trade.get_trades([Trade.pair == metadata['pair'], Trade.is_open.is_(True), ]).all()
                     if not open_trades:
                         logger.info(f"Set 'allow_trailing' to True for {metadata['pair']} to start trailing!!!")
-                        # self.custom_info_trail_buy[metadata['pair']]['trailing_buy']['allow_trailing'] = True
-                        trailing_buy['allow_trailing'] = True
+                        trailing_buy.allow_trailing = True
                         initial_buy_tag = last_candle['buy_tag'] if 'buy_tag' in last_candle else 'buy signal'
                         dataframe.loc[:, 'buy_tag'] = f"{initial_buy_tag} (start trail price {last_candle['close']})"
             else:
-                if (trailing_buy['trailing_buy_order_started'] == True):
+                if trailing_buy.started:
                     logger.info(f"Continue trailing for {metadata['pair']}. Manually trigger buy signal!!")
                     dataframe.loc[:,'buy'] = 1
-                    dataframe.loc[:, 'buy_tag'] = trailing_buy['buy_tag']
+                    dataframe.loc[:, 'buy_tag'] = trailing_buy.buy_tag
                     # dataframe['buy'] = 1
 
         return dataframe
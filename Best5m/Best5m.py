@@ -30,7 +30,9 @@ from freqtrade.strategy.interface import IStrategy
 from freqtrade.strategy import IntParameter, DecimalParameter, CategoricalParameter
 from freqtrade.persistence import Trade
 from pandas import DataFrame
+from pathlib import Path
 import talib.abstract as ta
+from strategy_utils.indicator_cache import IndicatorCache
 
 logger = logging.getLogger(__name__)
 
@@ -108,6 +110,10 @@ class Best5m(IStrategy):
     rsi_buy_threshold = IntParameter(low=10, high=50, default=30, space='buy', optimize=True)
     rsi_sell_threshold = IntParameter(low=50, high=90, default=70, space='sell', optimize=True)
 
+    # SMA / RSI arrays per length, so hyperopt epochs reuse them instead of recomputing
+    # (hyperopt / backtest only, set in bot_start: live candles never come back)
+    indicator_cache = None
+
     def __init__(self, config: dict) -> None:
         super().__init__(config)
         """
@@ -140,12 +146,30 @@ class Best5m(IStrategy):
         """
         Calculate technical indicators: SMA (fast/slow), RSI.
         """
-        dataframe['fast_sma'] = ta.SMA(dataframe, timeperiod=int(self.fast_ma_length.value))
-        dataframe['slow_sma'] = ta.SMA(dataframe, timeperiod=int(self.slow_ma_length.value))
-        dataframe['rsi'] = ta.RSI(dataframe, timeperiod=int(self.rsi_length.value))
+        self.ensure_indicator_columns(dataframe, metadata)
 
         return dataframe
 
+    def ensure_indicator_columns(self, dataframe: DataFrame, metadata: dict) -> None:
+        """
+        fast_sma / slow_sma / rsi for the current lengths. Hyperopt only runs
+        populate_indicators once, so the entry and exit trends call this again
+        for the lengths of each epoch.
+        """
+        pair = metadata['pair']
+        dataframe['fast_sma'] = self.cached_indicator(
+            dataframe, pair, 'sma', ta.SMA, timeperiod=int(self.fast_ma_length.value))
+        dataframe['slow_sma'] = self.cached_indicator(
+            dataframe, pair, 'sma', ta.SMA, timeperiod=int(self.slow_ma_length.value))
+        dataframe['rsi'] = self.cached_indicator(
+            dataframe, pair, 'rsi', ta.RSI, timeperiod=int(self.rsi_length.value))
+
+    def cached_indicator(self, dataframe: DataFrame, pair: str, name: str, compute, **params):
+        """indicator_cache.get() in hyperopt / backtest, compute() in live runs."""
+        if self.indicator_cache is None:
+            return compute(dataframe, **params)
+        return self.indicator_cache.get(dataframe, pair, self.timeframe, name, compute, **params)
+
     # -------------------------------------------------------------------------
     # 8) Entry Signal Logic (Long / Short)
     # -------------------------------------------------------------------------
@@ -153,6 +177,8 @@ class Best5m(IStrategy):
         """
         Determine when to open a long or short position based on SMA and RSI signals.
         """
+        self.ensure_indicator_columns(dataframe, metadata)
+
         long_conditions = (
             (dataframe['fast_sma'] > dataframe['slow_sma']) &
             (dataframe['rsi'] < self.rsi_buy_threshold.value)
@@ -175,6 +201,8 @@ class Best5m(IStrategy):
         """
         Determine when to exit a long or short position based on reversed conditions.
         """
+        self.ensure_indicator_columns(dataframe, metadata)
+
         dataframe['exit_long'] = 0
         dataframe['exit_short'] = 0
 
@@ -256,6 +284,10 @@ class Best5m(IStrategy):
         Called at bot start. Use this to assign the hyperopt values to the actual parameters.
         """
         super().bot_start(**kwargs)
+
+        # keep the indicator arrays on disk for the hyperopt workers and later runs
+        if self.config['runmode'].value in ('hyperopt', 'backtest'):
+            self.indicator_cache = IndicatorCache(Path(self.config['user_data_dir']) / 'indicator_cache')
         
         # Assign hyperopt values to actual trailing stop parameters
         self.trailing_stop = self.trailing_stop_opt.value
@@ -9,9 +9,13 @@ import freqtrade.vendor.qtpylib.indicators as qtpylib
 import datetime
 from technical.util import resample_to_interval, resampled_merge
 from datetime import datetime, timedelta
+from pathlib import Path
 from freqtrade.persistence import Trade
 from freqtrade.strategy import stoploss_from_open, merge_informative_pair, DecimalParameter, IntParameter, CategoricalParameter
 import technical.indicators as ftt
+from strategy_utils.indicators import ewo
+from strategy_utils.indicator_cache import IndicatorCache
+from strategy_utils.lazy import LazyColumns
 
 buy_params = {
       "base_nb_candles_buy": 17,
@@ -26,13 +30,6 @@ sell_params = {
       "high_offset": 1.019
     }
 
-def EWO(dataframe, ema_length=5, ema2_length=35):
-    df = dataframe.copy()
-    ema1 = ta.SMA(df, timeperiod=ema_length)
-    ema2 = ta.SMA(df, timeperiod=ema2_length)
-    emadif = (ema1 - ema2) / df['close'] * 100
-    return emadif
-
 def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
 
 
@@ -190,6 +187,8 @@ class ElliotV5_SMA(IStrategy):
         5, 80, default=buy_params['base_nb_candles_buy'], space='buy', optimize=True)
     base_nb_candles_sell = IntParameter(
         5, 80, default=sell_params['base_nb_candles_sell'], space='sell', optimize=True)
+    # ma_buy_* / ma_sell_* are only built for the values in use (every value in hyperopt)
+    lazy_columns = LazyColumns()
     low_offset = DecimalParameter(
         0.9, 0.99, default=buy_params['low_offset'], space='buy', optimize=True)
     high_offset = DecimalParameter(
@@ -242,21 +241,34 @@ class ElliotV5_SMA(IStrategy):
 
         return dataframe
 
-    def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+    def bot_start(self, **kwargs) -> None:
+        # hyperopt workers and runs on the same data share the ma_buy_* / ma_sell_* arrays
+        if self.config['runmode'].value in ('hyperopt', 'backtest'):
+            self.lazy_columns = LazyColumns(
+                IndicatorCache(Path(self.config['user_data_dir']) / 'indicator_cache'), self.timeframe)
+
+    def ensure_ma_columns(self, dataframe: DataFrame, metadata: dict, every_value: bool = False) -> None:
+        # ma_buy / ma_sell for the current base_nb_candles_* values (they change per hyperopt epoch),
+        # every_value: for all values of .range, see LazyColumns about hyperopt
+        buy = self.base_nb_candles_buy
+        sell = self.base_nb_candles_sell
+        for value in (buy.range if every_value else [buy.value]):
+            self.lazy_columns.ensure(dataframe, metadata['pair'], f'ma_buy_{value}', ta.EMA, timeperiod=value)
+        for value in (sell.range if every_value else [sell.value]):
+            self.lazy_columns.ensure(dataframe, metadata['pair'], f'ma_sell_{value}', ta.EMA, timeperiod=value)
 
-        for val in self.base_nb_candles_buy.range:
-            dataframe[f'ma_buy_{val}'] = ta.EMA(dataframe, timeperiod=val)
+    def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
 
-        for val in self.base_nb_candles_sell.range:
-            dataframe[f'ma_sell_{val}'] = ta.EMA(dataframe, timeperiod=val)
+        self.ensure_ma_columns(dataframe, metadata, every_value=True)
 
-        dataframe['EWO'] = EWO(dataframe, self.fast_ewo, self.slow_ewo)
+        dataframe['EWO'] = ewo(dataframe, self.fast_ewo, self.slow_ewo, ma_type='sma')
 
         dataframe['rsi'] = ta.RSI(dataframe, timeperiod=14)
 
         return dataframe
 
     def populate_entry_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+        self.ensure_ma_columns(dataframe, metadata)
         conditions = []
 
         conditions.append(
@@ -285,6 +297,7 @@ class ElliotV5_SMA(IStrategy):
         return dataframe
 
     def populate_exit_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+        self.ensure_ma_columns(dataframe, metadata)
         conditions = []
 
         conditions.append(
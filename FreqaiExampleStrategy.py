@@ -7,6 +7,8 @@ from technical import qtpylib
 
 from freqtrade.strategy import IStrategy
 
+from strategy_utils.snapshot import LastCandleCache
+
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +46,9 @@ class FreqaiExampleStrategy(IStrategy):
     startup_candle_count: int = 40
     can_short = True
 
+    # last analyzed candle per pair, read by confirm_trade_entry
+    last_candles = LastCandleCache()
+
     def feature_engineering_expand_all(
         self, dataframe: DataFrame, period: int, metadata: dict, **kwargs
     ) -> DataFrame:
@@ -280,8 +285,9 @@ class FreqaiExampleStrategy(IStrategy):
         side: str,
         **kwargs,
     ) -> bool:
-        df, _ = self.dp.get_analyzed_dataframe(pair, self.timeframe)
-        last_candle = df.iloc[-1].squeeze()
+        last_candle = self.last_candles.get(self.dp, pair, self.timeframe)
+        if last_candle is None:
+            return True
 
         if side == "long":
             if rate > (last_candle["close"] * (1 + 0.0025)):
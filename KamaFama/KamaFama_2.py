@@ -16,30 +16,17 @@ from freqtrade.persistence import Trade, Order
 from freqtrade.strategy import stoploss_from_open, DecimalParameter, IntParameter, CategoricalParameter
 import technical.indicators as ftt
 from functools import reduce
+from strategy_utils.candles import FormingCandles
+from strategy_utils.compact import compact_dataframe
+from strategy_utils.indicators import williams_r
+from strategy_utils.rolling import rolling_max_multi
+from strategy_utils.snapshot import LastCandleCache
+from strategy_utils.streaming import RSI, FormingFastK, Formula, IncrementalIndicators, Indicator, RollingMax, RollingMin
 
 pd.options.mode.chained_assignment = None  # default='warn'
 
 # ------- Strategie by Mastaaa1987
 
-def williams_r(dataframe: DataFrame, period: int = 14) -> Series:
-    """Williams %R, or just %R, is a technical analysis oscillator showing the current closing price in relation to the high and low
-        of the past N days (for a given N). It was developed by a publisher and promoter of trading materials, Larry Williams.
-        Its purpose is to tell whether a stock or commodity market is trading near the high or the low, or somewhere in between,
-        of its recent trading range.
-        The oscillator is on a negative scale, from −100 (lowest) up to 0 (highest).
-    """
-
-    highest_high = dataframe["high"].rolling(center=False, window=period).max()
-    lowest_low = dataframe["low"].rolling(center=False, window=period).min()
-
-    WR = Series(
-        (highest_high - dataframe["close"]) / (highest_high - lowest_low),
-        name=f"{period} Williams %R",
-        )
-
-    return WR * -100
-
-
 class KamaFama_2(IStrategy):
     INTERFACE_VERSION = 2
 
@@ -62,7 +49,17 @@ class KamaFama_2(IStrategy):
     minimal_roi = {
         "0": 1
     }
-    cc = {}
+    # forming candle per open trade for custom_exit, dropped when the trade closes
+    forming_candles = FormingCandles('KamaFama_2 forming candles', max_entries=1000, ttl=24 * 3600)
+
+    # last analyzed candle per pair for custom_exit
+    last_candles = LastCandleCache()
+
+    # fastk of the forming candle (live custom_exit), same as STOCHF over the analyzed candles + pc
+    forming_fastk = FormingFastK(5, 3)
+
+    # opt-in: keep the analyzed dataframe as float32 / int8 / categorical in live runs
+    compact_analyzed_dataframe = False
 
     # Stoploss:
     stoploss = -0.25
@@ -118,6 +115,21 @@ class KamaFama_2(IStrategy):
         }
     }
 
+    # live / dry_run: the long RSIs and %R are updated candle by candle
+    _incremental = None
+
+    def incremental_indicators(self) -> IncrementalIndicators:
+        if self._incremental is None:
+            self._incremental = IncrementalIndicators([
+                Indicator('rsi_84', RSI, 'close', 84),
+                Indicator('rsi_112', RSI, 'close', 112),
+                Indicator('hh_14', RollingMax, 'high', 14),
+                Indicator('ll_14', RollingMin, 'low', 14),
+                Indicator('r_14', Formula, ('hh_14', 'll_14', 'close'),
+                          lambda hh, ll, close: ((hh - close) / (hh - ll)) * -100),
+            ])
+        return self._incremental
+
     def custom_stoploss(self, pair: str, trade: Trade, current_time: datetime,
                         current_rate: float, current_profit: float, **kwargs) -> float:
 
@@ -143,18 +155,24 @@ class KamaFama_2(IStrategy):
         stoch_fast = ta.STOCHF(dataframe, 5, 3, 0, 3, 0)
         dataframe['fastk'] = stoch_fast['fastk']
 
-        # RSI
-        dataframe['rsi_84'] = ta.RSI(dataframe, timeperiod=84)
-        dataframe['rsi_112'] = ta.RSI(dataframe, timeperiod=112)
+        if self.config['runmode'].value in ('live', 'dry_run'):
+            indicators = self.incremental_indicators().update(metadata['pair'], dataframe)
+            for column in ('rsi_84', 'rsi_112', 'r_14'):
+                dataframe[column] = indicators[column]
+        else:
+            # RSI
+            dataframe['rsi_84'] = ta.RSI(dataframe, timeperiod=84)
+            dataframe['rsi_112'] = ta.RSI(dataframe, timeperiod=112)
 
-        # Williams %R
-        dataframe['r_14'] = williams_r(dataframe, period=14)
+            # Williams %R
+            dataframe['r_14'] = williams_r(dataframe, period=14)
 
         return dataframe
 
     def populate_entry_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         conditions = []
         dataframe.loc[:, 'enter_tag'] = ''
+        close_max_48, close_max_288 = rolling_max_multi(dataframe['close'].to_numpy(), (48, 288))
 
         buy = (
                 (dataframe['kama'] > dataframe['fama']) &
@@ -162,13 +180,13 @@ class KamaFama_2(IStrategy):
                 (dataframe['r_14'] < -61.3) &
                 (dataframe['mama_diff'] < -0.025) &
                 (dataframe['cti'] < -0.715) &
-                (dataframe['close'].rolling(48).max() >= dataframe['close'] * 1.05) &
-                (dataframe['close'].rolling(288).max() >= dataframe['close'] * 1.125) &
+                (close_max_48 >= dataframe['close'] * 1.05) &
+                (close_max_288 >= dataframe['close'] * 1.125) &
                 (dataframe['rsi_84'] < 60) &
                 (dataframe['rsi_112'] < 60)
         )
         conditions.append(buy)
-        dataframe.loc[buy, 'enter_tag'] += 'buy'
+        dataframe.loc[buy, 'enter_tag'] = 'buy'
 
         if conditions:
             dataframe.loc[reduce(lambda x, y: x | y, conditions), 'enter_long'] = 1
@@ -178,43 +196,33 @@ class KamaFama_2(IStrategy):
     def populate_exit_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         dataframe.loc[:, 'exit_long'] = 0
 
+        if self.compact_analyzed_dataframe and self.config['runmode'].value in ('live', 'dry_run'):
+            dataframe = compact_dataframe(dataframe)
+
         return dataframe
 
+    def order_filled(self, pair: str, trade: Trade, order: Order, current_time: datetime, **kwargs) -> None:
+        # forget the state of closed trades
+        if not trade.is_open:
+            self.forming_candles.remove(trade.id)
+
     def custom_exit(self, pair: str, trade: 'Trade', current_time: 'datetime', current_rate: float,
                     current_profit: float, **kwargs):
-        dataframe, _ = self.dp.get_analyzed_dataframe(pair=pair, timeframe=self.timeframe)
-        current_candle = dataframe.iloc[-1].squeeze()
+        current_candle = self.last_candles.get(self.dp, pair, self.timeframe)
+        if current_candle is None:
+            return None
 
         min_profit = trade.calc_profit_ratio(trade.min_rate)
 
         if self.config['runmode'].value in ('live', 'dry_run'):
-            state = self.cc
-            pc = state.get(trade.id, {'date': current_candle['date'], 'open': current_candle['close'], 'high': current_candle['close'], 'low': current_candle['close'], 'close': current_rate, 'volume': 0})
-            if current_candle['date'] != pc['date']:
-                pc['date'] = current_candle['date']
-                pc['high'] = current_candle['close']
-                pc['low'] = current_candle['close']
-                pc['open'] = current_candle['close']
-                pc['close'] = current_rate
-            if current_rate > pc['high']:
-                pc['high'] = current_rate
-            if current_rate < pc['low']:
-                pc['low'] = current_rate
-            if current_rate != pc['close']:
-                pc['close'] = current_rate
-
-            state[trade.id] = pc
+            pc = self.forming_candles.update(trade.id, current_candle['date'], current_candle['close'], current_rate)
 
         if current_profit > 0:
             # if min_profit <= -0.015:
             if self.config['runmode'].value in ('live', 'dry_run'):
                 if current_time > pc['date'] + timedelta(minutes=9) + timedelta(seconds=55):
-                    df = dataframe.copy()
-                    df = df._append(pc, ignore_index = True)
-                    stoch_fast = ta.STOCHF(df, 5, 3, 0, 3, 0)
-                    df['fastk'] = stoch_fast['fastk']
-                    cc = df.iloc[-1].squeeze()
-                    if cc["fastk"] > self.sell_fastx.value:
+                    fastk = self.forming_fastk.get(self.dp, pair, self.timeframe, pc['high'], pc['low'], pc['close'])
+                    if fastk > self.sell_fastx.value:
                         return "fastk_profit_sell_2"
             else:
                 if current_candle["fastk"] > self.sell_fastx.value:
@@ -16,6 +16,8 @@ from freqtrade.strategy import DecimalParameter, IntParameter
 from pandas import DataFrame
 import talib.abstract as ta
 import numpy as np
+from strategy_utils.signal_grid import SignalGrid
+from strategy_utils.streaming import ATR, EMA, Formula, IncrementalIndicators, Indicator
 
 class MACDVStrategy(IStrategy):
     
@@ -38,7 +40,30 @@ class MACDVStrategy(IStrategy):
     use_exit_signal = True
     ignore_roi_if_entry_signal = False
 
+    # 实盘/模拟盘增量计算指标 (每根新K线只计算新的一行)
+    _incremental = None
+
+    def incremental_indicators(self) -> IncrementalIndicators:
+        if self._incremental is None:
+            self._incremental = IncrementalIndicators([
+                Indicator('ema200', EMA, 'close', self.ema_period.value),
+                Indicator('ema_fast', EMA, 'close', 12),
+                Indicator('ema_slow', EMA, 'close', 26),
+                Indicator('atr', ATR, ('high', 'low', 'close'), 26),
+                Indicator('macd', Formula, ('ema_fast', 'ema_slow', 'atr'),
+                          lambda ema_fast, ema_slow, atr: ((ema_fast - ema_slow) / atr) * 100),
+                Indicator('signal', EMA, 'macd', 9),
+            ])
+        return self._incremental
+
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+        if self.config['runmode'].value in ('live', 'dry_run'):
+            indicators = self.incremental_indicators().update(metadata['pair'], dataframe)
+            for column in ('ema200', 'atr', 'macd', 'signal'):
+                dataframe[column] = indicators[column]
+            dataframe['hist'] = dataframe['macd'] - dataframe['signal']
+            return dataframe
+
         # 计算EMA200
         dataframe['ema200'] = ta.EMA(dataframe, timeperiod=self.ema_period.value)
 
@@ -74,6 +99,12 @@ class MACDVStrategy(IStrategy):
 
         return dataframe
 
+    def entry_signal_grid(self, dataframe: DataFrame, metadata: dict) -> SignalGrid:
+        # populate_entry_trend 的阈值参数批量评估 (strategy_utils.signal_grid)
+        return SignalGrid(
+            (dataframe['close'] > dataframe['ema200']) & (dataframe['volume'] > 0)
+        ).branch((dataframe['macd'], '>', 'macdv_threshold'))
+
     def populate_exit_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         # 初始化所有退出信号为0
         dataframe['exit_signal'] = 0
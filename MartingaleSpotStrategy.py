@@ -39,6 +39,12 @@ class MartingaleSpot(IStrategy):
         "stoploss_on_exchange_limit_ratio": 0.99
     }
 
+    # DCA ladder: profit at which a trade with n entries adds its stake again (dca_add_thresholds[n - 1])
+    # and profit at which it exits (dca_exit_targets[n - 1], the last one for more entries).
+    # Replayed quickly over long 1m histories by strategy_utils.dca_ladder.simulate_dca_ladder.
+    dca_add_thresholds = (-0.025, -0.05, -0.10, -0.20)
+    dca_exit_targets = (0.04, 0.02, 0.01, 0.005)
+
     def populate_indicators(self, df: DataFrame, metadata: dict) -> DataFrame:
 
         return df
@@ -68,12 +74,9 @@ class MartingaleSpot(IStrategy):
 
         total_wallet = self.wallets.get_total_stake_amount()
         count_of_entries = trade.nr_of_successful_entries
-        condition_1 = current_profit <= -0.025 and count_of_entries == 1
-        condition_2 = current_profit <= -0.05 and count_of_entries == 2
-        condition_3 = current_profit <= -0.10 and count_of_entries == 3
-        condition_4 = current_profit <= -0.20 and count_of_entries == 4
+        thresholds = self.dca_add_thresholds
 
-        if condition_1 or condition_2 or condition_3 or condition_4:
+        if 1 <= count_of_entries <= len(thresholds) and current_profit <= thresholds[count_of_entries - 1]:
             stake_amount = trade.stake_amount
         else:
             return None
@@ -91,15 +94,12 @@ class MartingaleSpot(IStrategy):
                     current_profit: float, **kwargs):
 
         count_of_entries = trade.nr_of_successful_entries
+        if count_of_entries < 1:
+            return None
 
-        if count_of_entries == 1 and current_profit >= 0.04:
-            return 'roi_4%'
-        elif count_of_entries == 2 and current_profit >= 0.02:
-            return 'roi_2%'
-        elif count_of_entries == 3 and current_profit >= 0.01:
-            return 'roi_1%'
-        elif count_of_entries >= 4 and current_profit >= 0.005:
-            return 'roi_0.5%'
+        target = self.dca_exit_targets[min(count_of_entries, len(self.dca_exit_targets)) - 1]
+        if current_profit >= target:
+            return f'roi_{target * 100:g}%'
 
         return None
 
@@ -26,10 +26,20 @@ import datetime
 from technical.util import resample_to_interval, resampled_merge
 from datetime import datetime, timedelta
 from freqtrade.persistence import Trade
-from freqtrade.strategy import stoploss_from_open, merge_informative_pair, DecimalParameter, IntParameter, CategoricalParameter
+from freqtrade.strategy import stoploss_from_open, DecimalParameter, IntParameter, CategoricalParameter
 import technical.indicators as ftt
 import logging
 import pandas as pd
+from strategy_utils.compact import compact_dataframe
+from strategy_utils.dependencies import ColumnUsage
+from strategy_utils.indicators import ewo
+from strategy_utils.informative import InformativeJoin
+from strategy_utils.lazy import LazyColumns
+from strategy_utils.rolling import running_min_since
+from strategy_utils.snapshot import LastCandleCache
+from strategy_utils.store import BoundedStore
+from strategy_utils.tickers import TickerSnapshot
+from strategy_utils.trailing import BUY, UPDATE, TrailingBuyBook, replay_trailing_buy
 
 
 logger = logging.getLogger(__name__)
@@ -40,14 +50,6 @@ logger = logging.getLogger(__name__)
 
 
 
-def EWO(dataframe, ema_length=5, ema2_length=50):
-    df = dataframe.copy()
-    ema1 = ta.EMA(df, timeperiod=ema_length)
-    ema2 = ta.EMA(df, timeperiod=ema2_length)
-    emadif = (ema1 - ema2) / df['low'] * 120
-    return emadif
-
-
 class NASOSv5_mod3(IStrategy):
     INTERFACE_VERSION = 2
 
@@ -93,6 +95,15 @@ class NASOSv5_mod3(IStrategy):
         2, 20, default=buy_params['base_nb_candles_buy'], space='buy', optimize=True)
     base_nb_candles_sell = IntParameter(
         2, 25, default=sell_params['base_nb_candles_sell'], space='sell', optimize=True)
+
+    # ma_buy_* / ma_sell_* are only built for the values in use (every value in hyperopt)
+    lazy_columns = LazyColumns()
+
+    # last analyzed candle per pair for the callbacks
+    last_candles = LastCandleCache()
+
+    # opt-in: keep the analyzed dataframe as float32 / int8 / categorical in live runs
+    compact_analyzed_dataframe = False
     low_offset = DecimalParameter(
         0.9, 0.99, default=buy_params['low_offset'], space='buy', optimize=True)
     low_offset_2 = DecimalParameter(
@@ -142,6 +153,13 @@ class NASOSv5_mod3(IStrategy):
     inf_15m = '15m'
     inf_1h = '1h'
 
+    # 15m columns read by the strategy, joined without merge_informative_pair
+    informative_15m_columns = ('close',)
+    informative_15m_join = InformativeJoin(timeframe, inf_15m)
+
+    # indicator columns no condition or callback reads are skipped
+    column_usage = ColumnUsage()
+
     process_only_new_candles = True
     startup_candle_count = 200
     use_custom_stoploss = False
@@ -168,6 +186,9 @@ class NASOSv5_mod3(IStrategy):
         'max_slippage': -0.02
     }
 
+    # sell retries per pair while the slippage is too high
+    slippage_retries = BoundedStore('NASOSv5 slippage retries', max_entries=1000, ttl=24 * 3600)
+
     protections = [
         # 	{
         # 		"method": "StoplossGuard",
@@ -221,8 +242,7 @@ class NASOSv5_mod3(IStrategy):
                            rate: float, time_in_force: str, sell_reason: str,
                            current_time: datetime, **kwargs) -> bool:
 
-        dataframe, _ = self.dp.get_analyzed_dataframe(pair, self.timeframe)
-        last_candle = dataframe.iloc[-1]
+        last_candle = self.last_candles.get(self.dp, pair, self.timeframe)
 
         if (last_candle is not None):
             if (sell_reason in ['sell_signal']):
@@ -230,21 +250,17 @@ class NASOSv5_mod3(IStrategy):
                     return False
 
         # slippage
-        try:
-            state = self.slippage_protection['__pair_retries']
-        except KeyError:
-            state = self.slippage_protection['__pair_retries'] = {}
-
-        candle = dataframe.iloc[-1].squeeze()
+        if last_candle is None:
+            return True
 
-        slippage = (rate / candle['close']) - 1
+        slippage = (rate / last_candle['close']) - 1
         if slippage < self.slippage_protection['max_slippage']:
-            pair_retries = state.get(pair, 0)
+            pair_retries = self.slippage_retries.get(pair, 0)
             if pair_retries < self.slippage_protection['retries']:
-                state[pair] = pair_retries + 1
+                self.slippage_retries[pair] = pair_retries + 1
                 return False
 
-        state[pair] = 0
+        self.slippage_retries.pop(pair, None)
 
         return True
 
@@ -287,22 +303,26 @@ class NASOSv5_mod3(IStrategy):
 
         return informative_15m
 
-    def normal_tf_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+    def ensure_ma_columns(self, dataframe: DataFrame, metadata: dict, every_value: bool = False) -> None:
+        # ma_buy / ma_sell for the current base_nb_candles_* values (they change per hyperopt epoch),
+        # every_value: for all values of .range, see LazyColumns about hyperopt
+        buy = self.base_nb_candles_buy
+        sell = self.base_nb_candles_sell
+        for value in (buy.range if every_value else [buy.value]):
+            self.lazy_columns.ensure(dataframe, metadata['pair'], f'ma_buy_{value}', ta.EMA, timeperiod=value)
+        for value in (sell.range if every_value else [sell.value]):
+            self.lazy_columns.ensure(dataframe, metadata['pair'], f'ma_sell_{value}', ta.EMA, timeperiod=value)
 
-        # Calculate all ma_buy values
-        for val in self.base_nb_candles_buy.range:
-            dataframe[f'ma_buy_{val}'] = ta.EMA(dataframe, timeperiod=val)
+    def normal_tf_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
 
-        # Calculate all ma_sell values
-        for val in self.base_nb_candles_sell.range:
-            dataframe[f'ma_sell_{val}'] = ta.EMA(dataframe, timeperiod=val)
+        self.ensure_ma_columns(dataframe, metadata, every_value=True)
 
         dataframe['hma_50'] = qtpylib.hull_moving_average(dataframe['close'], window=50)
         dataframe['ema_100'] = ta.EMA(dataframe, timeperiod=100)
 
         dataframe['sma_9'] = ta.SMA(dataframe, timeperiod=9)
         # Elliot
-        dataframe['EWO'] = EWO(dataframe, self.fast_ewo, self.slow_ewo)
+        dataframe['EWO'] = ewo(dataframe, self.fast_ewo, self.slow_ewo, normalize_by='low', scale=120)
 
         # RSI
         dataframe['rsi'] = ta.RSI(dataframe, timeperiod=20)
@@ -315,8 +335,9 @@ class NASOSv5_mod3(IStrategy):
         dataframe['pct_change'] = dataframe['close'].pct_change(periods=8)
         dataframe['pct_change_int'] = ((dataframe['pct_change'] > 0.15).astype(int) | (dataframe['pct_change'] < -0.15).astype(int))
 
-        dataframe['pct_change_short'] = dataframe['close'].pct_change(periods=8)
-        dataframe['pct_change_int_short'] = ((dataframe['pct_change_short'] > 0.08).astype(int) | (dataframe['pct_change_short'] < -0.08).astype(int))
+        if self.column_usage.needs('isshortpumping'):
+            dataframe['pct_change_short'] = dataframe['close'].pct_change(periods=8)
+            dataframe['pct_change_int_short'] = ((dataframe['pct_change_short'] > 0.08).astype(int) | (dataframe['pct_change_short'] < -0.08).astype(int))
 
         dataframe['ispumping'] = (
          (dataframe['pct_change_int'].rolling(20).sum() >= 0.4)
@@ -326,9 +347,10 @@ class NASOSv5_mod3(IStrategy):
          (dataframe['pct_change_int'].rolling(30).sum() >= 0.48)
         ).astype('int')
 
-        dataframe['isshortpumping'] = (
-         (dataframe['pct_change_int_short'].rolling(10).sum() >= 0.10)
-        ).astype('int')
+        if self.column_usage.needs('isshortpumping'):
+            dataframe['isshortpumping'] = (
+             (dataframe['pct_change_int_short'].rolling(10).sum() >= 0.10)
+            ).astype('int')
 
         dataframe['recentispumping'] = (dataframe['ispumping'].rolling(300).max() > 0) | (dataframe['islongpumping'].rolling(300).max() > 0)# | (dataframe['isshortpumping'].rolling(300).max() > 0)
         """
@@ -340,8 +362,8 @@ class NASOSv5_mod3(IStrategy):
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         # informative_1h = self.informative_1h_indicators(dataframe, metadata)
         informative_15m = self.informative_15m_indicators(dataframe, metadata)
-        dataframe = merge_informative_pair(
-            dataframe, informative_15m, self.timeframe, self.inf_15m, ffill=True)
+        dataframe = self.informative_15m_join.join(
+            dataframe, informative_15m, metadata['pair'], self.informative_15m_columns)
 
         # The indicators for the normal (5m) timeframe
         dataframe = self.normal_tf_indicators(dataframe, metadata)
@@ -349,6 +371,7 @@ class NASOSv5_mod3(IStrategy):
         return dataframe
 
     def populate_buy_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+        self.ensure_ma_columns(dataframe, metadata)
 
         dont_buy_conditions = []
 
@@ -404,6 +427,7 @@ class NASOSv5_mod3(IStrategy):
         return dataframe
 
     def populate_sell_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+        self.ensure_ma_columns(dataframe, metadata)
         conditions = []
 
         conditions.append(
@@ -429,6 +453,9 @@ class NASOSv5_mod3(IStrategy):
                 'sell'
             ]=1
 
+        if self.compact_analyzed_dataframe and self.config['runmode'].value in ('live', 'dry_run'):
+            dataframe = compact_dataframe(dataframe)
+
         return dataframe
 
 class NASOSv5HO(NASOSv5_mod3):
@@ -469,6 +496,7 @@ class NASOSv5HO(NASOSv5_mod3):
 
 class NASOSv5PD(NASOSv5_mod3):
     def populate_buy_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+        self.ensure_ma_columns(dataframe, metadata)
 
         dont_buy_conditions = []
 
@@ -589,49 +617,30 @@ class TrailingBuyStrat(NASOSv5_mod3):
     trailing_buy_offset = 0.005
     process_only_new_candles = True
 
-    custom_info = dict() # custom_info should be a dict
+    # trailing buy state per pair
+    trailing_buy_book = TrailingBuyBook()
+
+    # prices of all pairs from one fetch_tickers per loop
+    tickers = TickerSnapshot(ttl=3)
+
+    # backtest: replay the live state machine on the closes instead of the vectorised approximation
+    trailing_buy_replay = False
 
     def custom_sell(self, pair: str, trade: Trade, current_time: datetime, current_rate: float,
                     current_profit: float, **kwargs):
         tag = super(TrailingBuyStrat, self).custom_sell(pair, trade, current_time, current_rate, current_profit, **kwargs)
         if tag:
-            self.custom_info[pair]['trailing_buy'] = {
-                'trailing_buy_order_started': False,
-                'trailing_buy_order_uplimit': 0,
-                'start_trailing_price': 0,
-                'buy_tag': None
-            }
+            self.trailing_buy_book.reset(pair)
             logger.info(f'STOP trailing buy for {pair} because of {tag}')
         return tag
 
-    def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
-        dataframe = super(TrailingBuyStrat, self).populate_indicators(dataframe, metadata)
-        if not metadata["pair"] in self.custom_info:
-            self.custom_info[metadata["pair"]] = dict()
-        if not 'trailing_buy' in self.custom_info[metadata['pair']]:
-            self.custom_info[metadata["pair"]]['trailing_buy'] = {
-                'trailing_buy_order_started': False,
-                'trailing_buy_order_uplimit': 0,
-                'start_trailing_price': 0,
-                'buy_tag': None
-            }
-        return dataframe
-
     def confirm_trade_exit(self, pair: str, trade: Trade, order_type: str, amount: float,
                            rate: float, time_in_force: str, sell_reason: str, **kwargs) -> bool:
         val = super(TrailingBuyStrat, self).confirm_trade_exit(pair, trade, order_type, amount, rate, time_in_force, sell_reason, **kwargs)
-        self.custom_info[pair]['trailing_buy']['trailing_buy_order_started'] = False
-        self.custom_info[pair]['trailing_buy']['trailing_buy_order_uplimit'] = 0
-        self.custom_info[pair]['trailing_buy']['start_trailing_price'] = 0
-        self.custom_info[pair]['trailing_buy']['buy_tag'] = None
+        self.trailing_buy_book.reset(pair)
         return val
 
     def populate_buy_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
-        def get_local_min(x):
-            win = dataframe.loc[:, 'barssince_last_buy'].iloc[x.shape[0] - 1].astype('int')
-            win = max(win, 0)
-            return pd.Series(x).rolling(window=win).min().iloc[-1]
-
         dataframe = super(TrailingBuyStrat, self).populate_buy_trend(dataframe, metadata)
         dataframe = dataframe.rename(columns={"buy": "pre_buy"})
 
@@ -642,60 +651,55 @@ class TrailingBuyStrat(NASOSv5_mod3):
             else:
                 current_price = last_candle['close']
             dataframe['buy'] = 0
-            if not self.custom_info[metadata["pair"]]['trailing_buy']['trailing_buy_order_started'] and last_candle['pre_buy'] == 1:
-                self.custom_info[metadata["pair"]]['trailing_buy']['trailing_buy_order_started'] = True
-                self.custom_info[metadata["pair"]]['trailing_buy']['start_trailing_price'] = last_candle['close']
-                self.custom_info[metadata["pair"]]['trailing_buy']['buy_tag'] = last_candle['buy_tag']
-                self.custom_info[metadata["pair"]]['trailing_buy']['trailing_buy_order_uplimit'] = last_candle[f'close']
+            trailing_buy = self.trailing_buy_book[metadata['pair']]
+            if not trailing_buy.started and last_candle['pre_buy'] == 1:
+                trailing_buy.start(last_candle['close'], last_candle['buy_tag'])
                 logger.info(f'start trailing buy for {metadata["pair"]} at {last_candle["close"]}')
-            elif self.custom_info[metadata["pair"]]['trailing_buy']['trailing_buy_order_started']:
-                if current_price < self.custom_info[metadata["pair"]]['trailing_buy']['trailing_buy_order_uplimit']:
-                    self.custom_info[metadata["pair"]]['trailing_buy']['trailing_buy_order_uplimit'] = min(current_price * (1 + self.trailing_buy_offset), self.custom_info[metadata["pair"]]['trailing_buy']['trailing_buy_order_uplimit'])
-                    logger.info(f'update trailing buy for {metadata["pair"]} at {self.custom_info[metadata["pair"]]["trailing_buy"]["trailing_buy_order_uplimit"]}')
-                elif current_price < self.custom_info[metadata["pair"]]['trailing_buy']['start_trailing_price']:
+            elif trailing_buy.started:
+                action = trailing_buy.step(current_price, self.trailing_buy_offset)
+                if action == UPDATE:
+                    logger.info(f'update trailing buy for {metadata["pair"]} at {trailing_buy.uplimit}')
+                elif action == BUY:
                     dataframe.iloc[-1, dataframe.columns.get_loc('buy')] = 1
-                    ratio = "%.2f" % ((current_price / self.custom_info[metadata['pair']]['trailing_buy']['start_trailing_price']) * 100)
-                    dataframe.iloc[-1, dataframe.columns.get_loc('buy_tag')] = f"{self.custom_info[metadata['pair']]['trailing_buy']['buy_tag']} ({ratio} %)"
+                    ratio = "%.2f" % ((current_price / trailing_buy.start_price) * 100)
+                    dataframe.iloc[-1, dataframe.columns.get_loc('buy_tag')] = f"{trailing_buy.buy_tag} ({ratio} %)"
                     # stop trailing when buy signal ! prevent from buyin much higher price when slot is free
-                    self.custom_info[metadata["pair"]]['trailing_buy']['trailing_buy_order_started'] = False
-                    self.custom_info[metadata["pair"]]['trailing_buy']['trailing_buy_order_uplimit'] = 0
-                    self.custom_info[metadata["pair"]]['trailing_buy']['start_trailing_price'] = None
-                    self.custom_info[metadata["pair"]]['trailing_buy']['buy_tag'] = None
+                    trailing_buy.reset()
                 else:
-                    logger.info(f'price to high for {metadata["pair"]} at {current_price} vs {self.custom_info[metadata["pair"]]["trailing_buy"]["trailing_buy_order_uplimit"]}')
+                    logger.info(f'price to high for {metadata["pair"]} at {current_price} vs {trailing_buy.uplimit}')
+        elif self.trailing_buy_order_enabled and self.trailing_buy_replay:
+            # FOR BACKTEST, same state machine as live, on the closes
+            dataframe['buy'] = replay_trailing_buy(
+                (dataframe['pre_buy'] == 1).to_numpy(), dataframe['close'].to_numpy(), self.trailing_buy_offset)
         elif self.trailing_buy_order_enabled:
             # FOR BACKTEST
-            # PROBABLY STILL NOT WORKING
-            dataframe.loc[
+            dataframe['buy'] = 0
+            # pre_buy is 1, 0 (dont_buy) or NaN (no signal)
+            dataframe['pre_buy_switch'] = (
                 (dataframe['pre_buy'] == 1) &
-                (dataframe['pre_buy'].shift() == 0)
-            , 'pre_buy_switch'] = 1
-            dataframe['pre_buy_switch'] = dataframe['pre_buy_switch'].fillna(0)
+                (dataframe['pre_buy'].shift() != 1)
+            ).astype(int)
 
             dataframe['barssince_last_buy'] = dataframe['pre_buy_switch'].groupby(dataframe['pre_buy_switch'].cumsum()).cumcount()
 
-            # Create integer positions of each row
+            # close of the candle which started the trailing (barssince_last_buy candles ago)
             idx_positions = np.arange(len(dataframe))
-            # "shift" those integer positions by the amount in shift col
-            shifted_idx_positions = idx_positions - dataframe["barssince_last_buy"]
-            # get the label based index from our DatetimeIndex
-            shifted_loc_index = dataframe.index[shifted_idx_positions]
-            # Retrieve the "shifted" values and assign them as a new column
-            dataframe["close_5m_last_buy"] = dataframe.loc[shifted_loc_index, "close_5m"].values
-
-            dataframe.loc[:, 'close_lower'] = dataframe.loc[:, 'close'].expanding().apply(get_local_min)
-            dataframe['close_lower'] = np.where(dataframe['close_lower'].isna() == True, dataframe['close'], dataframe['close_lower'])
+            shifted_idx_positions = idx_positions - dataframe['barssince_last_buy'].to_numpy()
+            dataframe['close_last_buy'] = dataframe['close'].to_numpy()[shifted_idx_positions]
+
+            # lowest close since the trailing started, O(n) instead of expanding().apply()
+            dataframe['close_lower'] = running_min_since(dataframe['close'], dataframe['barssince_last_buy'] == 0)
             dataframe['close_lower_offset'] = dataframe['close_lower'] * (1 + self.trailing_buy_offset)
-            dataframe['trailing_buy_order_uplimit'] = np.where(dataframe['barssince_last_buy'] < 20, pd.DataFrame([dataframe['close_5m_last_buy'], dataframe['close_lower_offset']]).min(), np.nan)
+            dataframe['trailing_buy_order_uplimit'] = np.where(dataframe['barssince_last_buy'] < 20, np.fmin(dataframe['close_last_buy'], dataframe['close_lower_offset']), np.nan)
 
-            dataframe.loc[
+            dataframe['trailing_buy'] = (
                 (dataframe['barssince_last_buy'] < 20) & # must buy within last 20 candles after signal
                 (dataframe['close'] > dataframe['trailing_buy_order_uplimit'])
-            , 'trailing_buy'] = 1
+            ).astype(int)
 
             dataframe['trailing_buy_count'] = dataframe['trailing_buy'].rolling(20).sum()
 
-            dataframe.log[
+            dataframe.loc[
                 (dataframe['trailing_buy'] == 1) &
                 (dataframe['trailing_buy_count'] == 1)
             , 'buy'] = 1
@@ -706,6 +710,4 @@ class TrailingBuyStrat(NASOSv5_mod3):
         return dataframe
 
     def get_current_price(self, pair: str) -> float:
-        ticker = self.dp.ticker(pair)
-        current_price = ticker['last']
-        return current_price
+        return self.tickers.last(self.dp, pair)
@@ -2,12 +2,19 @@ import freqtrade.vendor.qtpylib.indicators as qtpylib
 import numpy as np
 import talib.abstract as ta
 from freqtrade.strategy.interface import IStrategy
-from freqtrade.strategy import (merge_informative_pair,
-                                DecimalParameter, IntParameter, CategoricalParameter)
+from freqtrade.strategy import DecimalParameter, IntParameter, CategoricalParameter
 from pandas import DataFrame
 from functools import reduce
 from freqtrade.persistence import Trade
 from datetime import datetime
+from strategy_utils.compact import compact_dataframe
+from strategy_utils.dependencies import ColumnUsage
+from strategy_utils.indicators import dip_protection, ewo, pump_protection
+from strategy_utils.informative import InformativeJoin
+from strategy_utils.parallel import ParallelAnalysisMixin
+from strategy_utils.rolling import RollingCache
+from strategy_utils.decision_table import ExitLadder
+from strategy_utils.snapshot import LastCandleCache
 
 
 ###########################################################################################################
@@ -45,7 +52,7 @@ from datetime import datetime
 # I hope you do enough testing before proceeding.
 # Thank you to those who created these strategies.
 
-class NFI5MOHO_WIP(IStrategy):
+class NFI5MOHO_WIP(ParallelAnalysisMixin, IStrategy):
     INTERFACE_VERSION = 2
 
     # Optional order type mapping.
@@ -219,6 +226,17 @@ class NFI5MOHO_WIP(IStrategy):
     timeframe = '5m'
     inf_1h = '1h'
 
+    # 1h columns read by the strategy (as `{column}_1h`), joined without merge_informative_pair
+    informative_1h_columns = (
+        'ema_50', 'ema_100', 'ema_200', 'sma_200', 'rsi', 'bb_upperband',
+        'safe_pump_24', 'safe_pump_36', 'safe_pump_24_strict', 'safe_pump_36_strict',
+        'safe_pump_24_loose', 'safe_pump_36_loose', 'safe_pump_48_loose',
+    )
+    informative_1h_join = InformativeJoin(timeframe, inf_1h)
+
+    # indicator columns no condition or callback reads are skipped
+    column_usage = ColumnUsage()
+
     # Run "populate_indicators()" only for new candle.
     process_only_new_candles = True
 
@@ -230,6 +248,15 @@ class NFI5MOHO_WIP(IStrategy):
     # Number of candles the strategy requires before producing valid signals
     startup_candle_count: int = 300
 
+    # last analyzed candle per pair for custom_sell
+    last_candles = LastCandleCache()
+
+    # opt-in: keep the analyzed dataframe as float32 / int8 / categorical in live runs
+    compact_analyzed_dataframe = False
+
+    # opt-in: analyse the pairs of a new candle in that many processes in live runs
+    parallel_analysis_workers = 0
+
     # plot config
     plot_config = {
         'main_plot': {
@@ -278,6 +305,15 @@ class NFI5MOHO_WIP(IStrategy):
     buy_dip_threshold_11 = DecimalParameter(0.05, 0.4, default=0.42, space='buy', decimals=3, optimize=False, load=True)
     buy_dip_threshold_12 = DecimalParameter(0.2, 0.5, default=0.66, space='buy', decimals=3, optimize=False, load=True)
 
+    # Dip protection columns: (column, index of buy_dip_threshold_* for each of dip_windows)
+    # the open rolling max of all windows is computed in one pass
+    dip_windows = (1, 2, 12, 144)
+    safe_dips_protections = (
+        ('safe_dips', (1, 2, 3, 4)),
+        ('safe_dips_strict', (5, 6, 7, 8)),
+        ('safe_dips_loose', (9, 10, 11, 12)),
+    )
+
     # 24 hours
     buy_pump_pull_threshold_1 = DecimalParameter(1.5, 3.0, default=1.75, space='buy', decimals=2, optimize=False, load=True)
     buy_pump_threshold_1 = DecimalParameter(0.4, 1.0, default=0.5, space='buy', decimals=3, optimize=False, load=True)
@@ -308,6 +344,20 @@ class NFI5MOHO_WIP(IStrategy):
     buy_pump_pull_threshold_9 = DecimalParameter(1.5, 3.0, default=1.4, space='buy', decimals=2, optimize=False, load=True)
     buy_pump_threshold_9 = DecimalParameter(0.4, 1.8, default=1.3, space='buy', decimals=3, optimize=False, load=True)
 
+    # 1h pump protection columns: (column, window, index of buy_pump_threshold_* / buy_pump_pull_threshold_*)
+    # each window's rolling max/min is computed once for all variants
+    safe_pump_protections = (
+        ('safe_pump_24', 24, 1),
+        ('safe_pump_36', 36, 2),
+        ('safe_pump_48', 48, 3),
+        ('safe_pump_24_strict', 24, 4),
+        ('safe_pump_36_strict', 36, 5),
+        ('safe_pump_48_strict', 48, 6),
+        ('safe_pump_24_loose', 24, 7),
+        ('safe_pump_36_loose', 36, 8),
+        ('safe_pump_48_loose', 48, 9),
+    )
+
     buy_min_inc_1 = DecimalParameter(0.01, 0.05, default=0.022, space='buy', decimals=3, optimize=False, load=True)
     buy_rsi_1h_min_1 = DecimalParameter(25.0, 40.0, default=30.0, space='buy', decimals=1, optimize=False, load=True)
     buy_rsi_1h_max_1 = DecimalParameter(70.0, 90.0, default=84.0, space='buy', decimals=1, optimize=False, load=True)
@@ -484,52 +534,104 @@ class NFI5MOHO_WIP(IStrategy):
         return int(self.timeframe[:-1])
 
 
+    # custom_sell as a compiled table, built in bot_start: the values of the sell_custom_* /
+    # sell_trail_* parameters are frozen into it, so they must stay optimize=False
+    exit_ladder = None
+    exit_ladder_features = ('profit', 'max_profit', 'rsi', 'close', 'ema_200', 'ema_100', 'sma_200_dec', 'rsi_1h', 'ema_200_rel')
+
+    def bot_start(self, **kwargs) -> None:
+        self.exit_ladder = self.build_exit_ladder()
+
+    def build_exit_ladder(self) -> ExitLadder:
+        for name, parameter in self.enumerate_parameters('sell'):
+            if name.startswith(('sell_custom_', 'sell_trail_')) and parameter.optimize:
+                raise ValueError(f"{name} is compiled into the exit ladder once, it can't be optimized")
+
+        # the custom_sell rules in order, the first match wins
+        def signal_profit(profit, rsi):
+            return [('profit', '>', None, profit.value), ('rsi', '<', None, rsi.value)]
+
+        def signal_profit_under(profit, rsi):
+            return signal_profit(profit, rsi) + [('close', '<', 'ema_200', 0.0)]
+
+        def signal_trail(profit_min, profit_max, down):
+            return [
+                ('profit', '>', None, profit_min.value),
+                ('profit', '<', None, profit_max.value),
+                ('max_profit', '>', 'profit', down.value),
+            ]
+
+        def signal_under_ema(rel, rsi_diff):
+            return [
+                ('close', '<', 'ema_200', 0.0),
+                ('ema_200_rel', '<', None, rel.value),
+                ('rsi', '>', 'rsi_1h', rsi_diff.value),
+            ]
+
+        return ExitLadder(self.exit_ladder_features, [
+            ('signal_profit_4', signal_profit(self.sell_custom_profit_4, self.sell_custom_rsi_4)),
+            ('signal_profit_3', signal_profit(self.sell_custom_profit_3, self.sell_custom_rsi_3)),
+            ('signal_profit_2', signal_profit(self.sell_custom_profit_2, self.sell_custom_rsi_2)),
+            ('signal_profit_1', signal_profit(self.sell_custom_profit_1, self.sell_custom_rsi_1)),
+            ('signal_profit_0', signal_profit(self.sell_custom_profit_0, self.sell_custom_rsi_0)),
+
+            ('signal_profit_u_1', signal_profit_under(self.sell_custom_under_profit_1, self.sell_custom_under_rsi_1)),
+            ('signal_profit_u_2', signal_profit_under(self.sell_custom_under_profit_2, self.sell_custom_under_rsi_2)),
+            ('signal_profit_u_3', signal_profit_under(self.sell_custom_under_profit_3, self.sell_custom_under_rsi_3)),
+
+            ('signal_profit_d_1', [('profit', '>', None, self.sell_custom_dec_profit_1.value), ('sma_200_dec', '>', None, 0.0)]),
+            ('signal_profit_d_2', [('profit', '>', None, self.sell_custom_dec_profit_2.value), ('close', '<', 'ema_100', 0.0)]),
+
+            ('signal_profit_t_1', signal_trail(self.sell_trail_profit_min_1, self.sell_trail_profit_max_1, self.sell_trail_down_1)),
+            ('signal_profit_t_2', signal_trail(self.sell_trail_profit_min_2, self.sell_trail_profit_max_2, self.sell_trail_down_2)),
+
+            ('signal_profit_u_t_1', [('close', '<', 'ema_200', 0.0)] + signal_trail(self.sell_trail_profit_min_3, self.sell_trail_profit_max_3, self.sell_trail_down_3)),
+
+            ('signal_profit_u_e_1', [('profit', '>', None, 0.0)] + signal_under_ema(self.sell_custom_profit_under_rel_1, self.sell_custom_profit_under_rsi_diff_1)),
+
+            ('signal_stoploss_u_1', [('profit', '<', None, -0.0)] + signal_under_ema(self.sell_custom_stoploss_under_rel_1, self.sell_custom_stoploss_under_rsi_diff_1)),
+        ])
+
     def custom_sell(self, pair: str, trade: 'Trade', current_time: 'datetime', current_rate: float,
                     current_profit: float, **kwargs):
-        dataframe, _ = self.dp.get_analyzed_dataframe(pair, self.timeframe)
-        last_candle = dataframe.iloc[-1].squeeze()
+        last_candle = self.last_candles.get(self.dp, pair, self.timeframe)
+        if last_candle is None:
+            return None
+
+        if self.exit_ladder is None:
+            self.exit_ladder = self.build_exit_ladder()
 
         max_profit = ((trade.max_rate - trade.open_rate) / trade.open_rate)
+        ema_200_rel = (last_candle['ema_200'] - last_candle['close']) / last_candle['close']
 
-        if (last_candle is not None):
-            if (current_profit > self.sell_custom_profit_4.value) & (last_candle['rsi'] < self.sell_custom_rsi_4.value):
-                return 'signal_profit_4'
-            elif (current_profit > self.sell_custom_profit_3.value) & (last_candle['rsi'] < self.sell_custom_rsi_3.value):
-                return 'signal_profit_3'
-            elif (current_profit > self.sell_custom_profit_2.value) & (last_candle['rsi'] < self.sell_custom_rsi_2.value):
-                return 'signal_profit_2'
-            elif (current_profit > self.sell_custom_profit_1.value) & (last_candle['rsi'] < self.sell_custom_rsi_1.value):
-                return 'signal_profit_1'
-            elif (current_profit > self.sell_custom_profit_0.value) & (last_candle['rsi'] < self.sell_custom_rsi_0.value):
-                return 'signal_profit_0'
-
-            elif (current_profit > self.sell_custom_under_profit_1.value) & (last_candle['rsi'] < self.sell_custom_under_rsi_1.value) & (last_candle['close'] < last_candle['ema_200']):
-                return 'signal_profit_u_1'
-            elif (current_profit > self.sell_custom_under_profit_2.value) & (last_candle['rsi'] < self.sell_custom_under_rsi_2.value) & (last_candle['close'] < last_candle['ema_200']):
-                return 'signal_profit_u_2'
-            elif (current_profit > self.sell_custom_under_profit_3.value) & (last_candle['rsi'] < self.sell_custom_under_rsi_3.value) & (last_candle['close'] < last_candle['ema_200']):
-                return 'signal_profit_u_3'
-
-            elif (current_profit > self.sell_custom_dec_profit_1.value) & (last_candle['sma_200_dec']):
-                return 'signal_profit_d_1'
-            elif (current_profit > self.sell_custom_dec_profit_2.value) & (last_candle['close'] < last_candle['ema_100']):
-                return 'signal_profit_d_2'
-
-            elif (current_profit > self.sell_trail_profit_min_1.value) & (current_profit < self.sell_trail_profit_max_1.value) & (max_profit > (current_profit + self.sell_trail_down_1.value)):
-                return 'signal_profit_t_1'
-            elif (current_profit > self.sell_trail_profit_min_2.value) & (current_profit < self.sell_trail_profit_max_2.value) & (max_profit > (current_profit + self.sell_trail_down_2.value)):
-                return 'signal_profit_t_2'
-
-            elif (last_candle['close'] < last_candle['ema_200']) & (current_profit > self.sell_trail_profit_min_3.value) & (current_profit < self.sell_trail_profit_max_3.value) & (max_profit > (current_profit + self.sell_trail_down_3.value)):
-                return 'signal_profit_u_t_1'
-
-            elif (current_profit > 0.0) & (last_candle['close'] < last_candle['ema_200']) & (((last_candle['ema_200'] - last_candle['close']) / last_candle['close']) < self.sell_custom_profit_under_rel_1.value) & (last_candle['rsi'] > last_candle['rsi_1h'] + self.sell_custom_profit_under_rsi_diff_1.value):
-                return 'signal_profit_u_e_1'
-
-            elif (current_profit < -0.0) & (last_candle['close'] < last_candle['ema_200']) & (((last_candle['ema_200'] - last_candle['close']) / last_candle['close']) < self.sell_custom_stoploss_under_rel_1.value) & (last_candle['rsi'] > last_candle['rsi_1h'] + self.sell_custom_stoploss_under_rsi_diff_1.value):
-                return 'signal_stoploss_u_1'
-
-        return None
+        return self.exit_ladder.evaluate([
+            current_profit, max_profit, last_candle['rsi'], last_candle['close'], last_candle['ema_200'],
+            last_candle['ema_100'], last_candle['sma_200_dec'], last_candle['rsi_1h'], ema_200_rel
+        ])
+
+    def evaluate_custom_sell(self, dataframe: DataFrame, profit, max_profit) -> np.ndarray:
+        """
+        custom_sell for every row of an analyzed dataframe at once, e.g. for a backtest of
+        one trade: profit / max_profit are the trade's profit ratios at each candle.
+        Returns the exit tag per row, None where custom_sell would not sell.
+        """
+        if self.exit_ladder is None:
+            self.exit_ladder = self.build_exit_ladder()
+
+        close = dataframe['close'].to_numpy(dtype=np.float64)
+        ema_200 = dataframe['ema_200'].to_numpy(dtype=np.float64)
+        features = np.column_stack([
+            np.broadcast_to(np.asarray(profit, dtype=np.float64), close.shape),
+            np.broadcast_to(np.asarray(max_profit, dtype=np.float64), close.shape),
+            dataframe['rsi'].to_numpy(dtype=np.float64),
+            close,
+            ema_200,
+            dataframe['ema_100'].to_numpy(dtype=np.float64),
+            dataframe['sma_200_dec'].to_numpy(dtype=np.float64),
+            dataframe['rsi_1h'].to_numpy(dtype=np.float64),
+            (ema_200 - close) / close,
+        ])
+        return self.exit_ladder.evaluate_many(features)
 
     def informative_pairs(self):
         # get access to all pairs available in whitelist.
@@ -543,7 +645,8 @@ class NFI5MOHO_WIP(IStrategy):
         # Get the informative pair
         informative_1h = self.dp.get_pair_dataframe(pair=metadata['pair'], timeframe=self.inf_1h)
         # EMA
-        informative_1h['ema_15'] = ta.EMA(informative_1h, timeperiod=15)
+        if self.column_usage.needs('ema_15'):
+            informative_1h['ema_15'] = ta.EMA(informative_1h, timeperiod=15)
         informative_1h['ema_50'] = ta.EMA(informative_1h, timeperiod=50)
         informative_1h['ema_100'] = ta.EMA(informative_1h, timeperiod=100)
         informative_1h['ema_200'] = ta.EMA(informative_1h, timeperiod=200)
@@ -557,17 +660,13 @@ class NFI5MOHO_WIP(IStrategy):
         informative_1h['bb_middleband'] = bollinger['mid']
         informative_1h['bb_upperband'] = bollinger['upper']
         # Pump protections
-        informative_1h['safe_pump_24'] = ((((informative_1h['open'].rolling(24).max() - informative_1h['close'].rolling(24).min()) / informative_1h['close'].rolling(24).min()) < self.buy_pump_threshold_1.value) | (((informative_1h['open'].rolling(24).max() - informative_1h['close'].rolling(24).min()) / self.buy_pump_pull_threshold_1.value) > (informative_1h['close'] - informative_1h['close'].rolling(24).min())))
-        informative_1h['safe_pump_36'] = ((((informative_1h['open'].rolling(36).max() - informative_1h['close'].rolling(36).min()) / informative_1h['close'].rolling(36).min()) < self.buy_pump_threshold_2.value) | (((informative_1h['open'].rolling(36).max() - informative_1h['close'].rolling(36).min()) / self.buy_pump_pull_threshold_2.value) > (informative_1h['close'] - informative_1h['close'].rolling(36).min())))
-        informative_1h['safe_pump_48'] = ((((informative_1h['open'].rolling(48).max() - informative_1h['close'].rolling(48).min()) / informative_1h['close'].rolling(48).min()) < self.buy_pump_threshold_3.value) | (((informative_1h['open'].rolling(48).max() - informative_1h['close'].rolling(48).min()) / self.buy_pump_pull_threshold_3.value) > (informative_1h['close'] - informative_1h['close'].rolling(48).min())))
-
-        informative_1h['safe_pump_24_strict'] = ((((informative_1h['open'].rolling(24).max() - informative_1h['close'].rolling(24).min()) / informative_1h['close'].rolling(24).min()) < self.buy_pump_threshold_4.value) | (((informative_1h['open'].rolling(24).max() - informative_1h['close'].rolling(24).min()) / self.buy_pump_pull_threshold_4.value) > (informative_1h['close'] - informative_1h['close'].rolling(24).min())))
-        informative_1h['safe_pump_36_strict'] = ((((informative_1h['open'].rolling(36).max() - informative_1h['close'].rolling(36).min()) / informative_1h['close'].rolling(36).min()) < self.buy_pump_threshold_5.value) | (((informative_1h['open'].rolling(36).max() - informative_1h['close'].rolling(36).min()) / self.buy_pump_pull_threshold_5.value) > (informative_1h['close'] - informative_1h['close'].rolling(36).min())))
-        informative_1h['safe_pump_48_strict'] = ((((informative_1h['open'].rolling(48).max() - informative_1h['close'].rolling(48).min()) / informative_1h['close'].rolling(48).min()) < self.buy_pump_threshold_6.value) | (((informative_1h['open'].rolling(48).max() - informative_1h['close'].rolling(48).min()) / self.buy_pump_pull_threshold_6.value) > (informative_1h['close'] - informative_1h['close'].rolling(48).min())))
-
-        informative_1h['safe_pump_24_loose'] = ((((informative_1h['open'].rolling(24).max() - informative_1h['close'].rolling(24).min()) / informative_1h['close'].rolling(24).min()) < self.buy_pump_threshold_7.value) | (((informative_1h['open'].rolling(24).max() - informative_1h['close'].rolling(24).min()) / self.buy_pump_pull_threshold_7.value) > (informative_1h['close'] - informative_1h['close'].rolling(24).min())))
-        informative_1h['safe_pump_36_loose'] = ((((informative_1h['open'].rolling(36).max() - informative_1h['close'].rolling(36).min()) / informative_1h['close'].rolling(36).min()) < self.buy_pump_threshold_8.value) | (((informative_1h['open'].rolling(36).max() - informative_1h['close'].rolling(36).min()) / self.buy_pump_pull_threshold_8.value) > (informative_1h['close'] - informative_1h['close'].rolling(36).min())))
-        informative_1h['safe_pump_48_loose'] = ((((informative_1h['open'].rolling(48).max() - informative_1h['close'].rolling(48).min()) / informative_1h['close'].rolling(48).min()) < self.buy_pump_threshold_9.value) | (((informative_1h['open'].rolling(48).max() - informative_1h['close'].rolling(48).min()) / self.buy_pump_pull_threshold_9.value) > (informative_1h['close'] - informative_1h['close'].rolling(48).min())))
+        rolling = RollingCache(informative_1h)
+        for column, window, index in self.safe_pump_protections:
+            informative_1h[column] = pump_protection(
+                rolling, window,
+                getattr(self, f'buy_pump_threshold_{index}').value,
+                getattr(self, f'buy_pump_pull_threshold_{index}').value
+            )
 
         return informative_1h
 
@@ -595,7 +694,8 @@ class NFI5MOHO_WIP(IStrategy):
         dataframe['ema_200'] = ta.EMA(dataframe, timeperiod=200)
 
         # SMA
-        dataframe['sma_5'] = ta.SMA(dataframe, timeperiod=5)
+        if self.column_usage.needs('sma_5'):
+            dataframe['sma_5'] = ta.SMA(dataframe, timeperiod=5)
         dataframe['sma_30'] = ta.SMA(dataframe, timeperiod=30)
         dataframe['sma_200'] = ta.SMA(dataframe, timeperiod=200)
 
@@ -605,7 +705,7 @@ class NFI5MOHO_WIP(IStrategy):
         dataframe['mfi'] = ta.MFI(dataframe)
 
         # EWO
-        dataframe['ewo'] = EWO(dataframe, self.fast_ewo.value, self.slow_ewo.value)
+        dataframe['ewo'] = ewo(dataframe, self.fast_ewo.value, self.slow_ewo.value)
 
         # RSI
         dataframe['rsi'] = ta.RSI(dataframe, timeperiod=14)
@@ -614,20 +714,12 @@ class NFI5MOHO_WIP(IStrategy):
         dataframe['chop']= qtpylib.chopiness(dataframe, 14)
 
         # Dip protection
-        dataframe['safe_dips'] = ((((dataframe['open'] - dataframe['close']) / dataframe['close']) < self.buy_dip_threshold_1.value) &
-                                  (((dataframe['open'].rolling(2).max() - dataframe['close']) / dataframe['close']) < self.buy_dip_threshold_2.value) &
-                                  (((dataframe['open'].rolling(12).max() - dataframe['close']) / dataframe['close']) < self.buy_dip_threshold_3.value) &
-                                  (((dataframe['open'].rolling(144).max() - dataframe['close']) / dataframe['close']) < self.buy_dip_threshold_4.value))
-
-        dataframe['safe_dips_strict'] = ((((dataframe['open'] - dataframe['close']) / dataframe['close']) < self.buy_dip_threshold_5.value) &
-                                  (((dataframe['open'].rolling(2).max() - dataframe['close']) / dataframe['close']) < self.buy_dip_threshold_6.value) &
-                                  (((dataframe['open'].rolling(12).max() - dataframe['close']) / dataframe['close']) < self.buy_dip_threshold_7.value) &
-                                  (((dataframe['open'].rolling(144).max() - dataframe['close']) / dataframe['close']) < self.buy_dip_threshold_8.value))
-
-        dataframe['safe_dips_loose'] = ((((dataframe['open'] - dataframe['close']) / dataframe['close']) < self.buy_dip_threshold_9.value) &
-                                  (((dataframe['open'].rolling(2).max() - dataframe['close']) / dataframe['close']) < self.buy_dip_threshold_10.value) &
-                                  (((dataframe['open'].rolling(12).max() - dataframe['close']) / dataframe['close']) < self.buy_dip_threshold_11.value) &
-                                  (((dataframe['open'].rolling(144).max() - dataframe['close']) / dataframe['close']) < self.buy_dip_threshold_12.value))
+        safe_dips = dip_protection(dataframe, self.dip_windows, [
+            [getattr(self, f'buy_dip_threshold_{index}').value for index in indexes]
+            for _, indexes in self.safe_dips_protections
+        ])
+        for row, (column, _) in enumerate(self.safe_dips_protections):
+            dataframe[column] = safe_dips[row]
 
         # Volume
         dataframe['volume_mean_4'] = dataframe['volume'].rolling(4).mean().shift(1)
@@ -647,7 +739,7 @@ class NFI5MOHO_WIP(IStrategy):
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         # The indicators for the 1h informative timeframe
         informative_1h = self.informative_1h_indicators(dataframe, metadata)
-        dataframe = merge_informative_pair(dataframe, informative_1h, self.timeframe, self.inf_1h, ffill=True)
+        dataframe = self.informative_1h_join.join(dataframe, informative_1h, metadata['pair'], self.informative_1h_columns)
 
         # The indicators for the normal (5m) timeframe
         dataframe = self.normal_tf_indicators(dataframe, metadata)
@@ -1176,13 +1268,8 @@ class NFI5MOHO_WIP(IStrategy):
                 'sell'
             ] = 1
 
-        return dataframe
+        if self.compact_analyzed_dataframe and self.config['runmode'].value in ('live', 'dry_run'):
+            dataframe = compact_dataframe(dataframe)
 
+        return dataframe
 
-# Elliot Wave Oscillator
-def EWO(dataframe, sma1_length=5, sma2_length=35):
-    df = dataframe.copy()
-    sma1 = ta.EMA(df, timeperiod=sma1_length)
-    sma2 = ta.EMA(df, timeperiod=sma2_length)
-    smadif = (sma1 - sma2) / df['close'] * 100
-    return smadif
@@ -3,9 +3,53 @@ import pandas as pd
 import pandas_ta as ta
 import talib.abstract as talib
 from technical import qtpylib
+from freqtrade.exchange import timeframe_to_minutes
 from freqtrade.strategy import IStrategy, stoploss_from_open, stoploss_from_absolute
-from freqtrade.persistence import Trade
-from datetime import datetime
+from freqtrade.persistence import Order, Trade
+from datetime import datetime, timedelta
+from pathlib import Path
+from strategy_utils.dependencies import ColumnUsage
+from strategy_utils.persistent import PersistentFloatStore, trade_key
+from strategy_utils.store import BoundedStore
+
+
+def VWAP_signal(dataframe: pd.DataFrame, backcandles: int = 15) -> np.ndarray:
+    """
+    Trend of the candle bodies against the VWAP over the last backcandles + 1 candles.
+        2: every body closed completely above VWAP (up trend)
+        1: every body closed completely below VWAP (down trend)
+        3: both (only possible while VWAP is not yet available)
+        0: mixed, or not enough candles yet
+    Rolling window counts over the "body touches VWAP" masks, O(n) instead of the
+    former per-row python loop, with the exact same output.
+    """
+    open_ = dataframe['open'].to_numpy()
+    close = dataframe['close'].to_numpy()
+    vwap = dataframe['VWAP'].to_numpy()
+
+    # comparisons with a NaN VWAP are False, so such candles never break a trend
+    breaks_down = np.maximum(open_, close) >= vwap
+    breaks_up = np.minimum(open_, close) <= vwap
+
+    window = backcandles + 1
+    signal = np.zeros(len(dataframe), dtype=np.int64)
+    if len(dataframe) < window:
+        return signal
+
+    def window_counts(mask: np.ndarray) -> np.ndarray:
+        csum = np.concatenate(([0], np.cumsum(mask, dtype=np.int64)))
+        return csum[window:] - csum[:-window]
+
+    up_trend = window_counts(breaks_up) == 0
+    down_trend = window_counts(breaks_down) == 0
+
+    signal[backcandles:] = np.select(
+        [up_trend & down_trend, up_trend, down_trend],
+        [3, 2, 1],
+        default=0
+    )
+
+    return signal
 
 
 class VWAPStrategy_14(IStrategy):
@@ -22,16 +66,53 @@ class VWAPStrategy_14(IStrategy):
 
     use_custom_stoploss = True
 
-    custom_info = {}
+    # stoploss per open trade, dropped when the trade closes
+    custom_info = BoundedStore('VWAPStrategy_14 custom_info', max_entries=1000, ttl=24 * 3600)
 
-    exit_profit_only = True
+    # custom_info on disk in live / dry-run, so a restart keeps the ratcheted stops (see bot_start)
+    stoploss_store = None
 
+    # indicator columns no condition or callback reads are skipped
+    column_usage = ColumnUsage()
 
-    def custom_stoploss(self, pair: str, trade: 'Trade', current_time: datetime, current_rate: float, current_profit: float, after_fill: bool, **kwargs) -> float:
+    exit_profit_only = True
 
+    def bot_start(self, **kwargs) -> None:
+        runmode = self.config['runmode'].value
+        if runmode in ('live', 'dry_run'):
+            self.stoploss_store = PersistentFloatStore(
+                Path(self.config['user_data_dir']) / f'VWAPStrategy_14_{runmode}_stoploss.bin')
+            # trades closed while the bot was down
+            self.stoploss_store.retain(trade_key(trade) for trade in Trade.get_open_trades())
+
+    def order_filled(self, pair: str, trade: Trade, order: Order, current_time: datetime, **kwargs) -> None:
+        # forget the state of closed trades
+        if not trade.is_open:
+            self.custom_info.pop(trade.id, None)
+            if self.stoploss_store is not None:
+                self.stoploss_store.pop(trade_key(trade), None)
+
+    def set_trade_stoploss(self, trade: Trade, stoploss: float) -> None:
+        self.custom_info[trade.id] = stoploss
+        if self.stoploss_store is not None:
+            self.stoploss_store[trade_key(trade)] = stoploss
+
+    def entry_atr_stoploss(self, pair: str, trade: Trade) -> float:
+        # ATR_stoploss of the last candle closed when the trade was opened
         dataframe, _ = self.dp.get_analyzed_dataframe(pair, self.timeframe)
+        entry_date = trade.open_date_utc - timedelta(minutes=timeframe_to_minutes(self.timeframe))
+        entry_candle = dataframe['date'].searchsorted(entry_date, side='right') - 1
+        if entry_candle < 0:
+            return np.nan
+        return dataframe['ATR_stoploss'].iat[entry_candle]
+
+    def custom_stoploss(self, pair: str, trade: 'Trade', current_time: datetime, current_rate: float, current_profit: float, after_fill: bool, **kwargs) -> float:
 
-        last_candle = dataframe.iloc[-1].squeeze()
+        if trade.id not in self.custom_info and self.stoploss_store is not None:
+            # restarted: continue with the stop ratcheted before
+            stored = self.stoploss_store.get(trade_key(trade))
+            if stored is not None:
+                self.custom_info[trade.id] = stored
 
         if trade.id in self.custom_info:
 
@@ -40,18 +121,20 @@ class VWAPStrategy_14(IStrategy):
                 if current_profit >= 0.01 and divided_current_profit > self.custom_info[trade.id]:
 
 
-                        self.custom_info[trade.id] = divided_current_profit
+                        self.set_trade_stoploss(trade, divided_current_profit)
 
                         return divided_current_profit
                 else:
 
 
                     return self.custom_info[trade.id]            
-        elif pd.notna(last_candle['ATR_stoploss']):
 
-            self.custom_info[trade.id] = last_candle['ATR_stoploss']
+        atr_stoploss = self.entry_atr_stoploss(pair, trade)
+        if pd.notna(atr_stoploss):
+
+            self.set_trade_stoploss(trade, atr_stoploss)
 
-            return last_candle['ATR_stoploss']
+            return atr_stoploss
         else:
 
              return None
@@ -70,7 +153,8 @@ class VWAPStrategy_14(IStrategy):
 
         dataframe['ATR_stoploss'] = dataframe['close'] - dataframe['ATR'] * 3.5
 
-        dataframe['ema200'] = talib.EMA(dataframe, 200)
+        if self.column_usage.needs('ema200'):
+            dataframe['ema200'] = talib.EMA(dataframe, 200)
 
         dataframe['rsi'] = ta.rsi(dataframe['close'], length=16)
 
@@ -82,32 +166,7 @@ class VWAPStrategy_14(IStrategy):
 
         dataframe['lower_band'] = sma - (std_dev * 2.0)
 
-        VWAP_signal = [0] * len(dataframe)
-        backcandles = 15
-
-        for row in range(backcandles, len(dataframe)):
-
-            up_trend = 1
-            down_trend = 1
-
-            for i in range(row - backcandles, row + 1):
-
-                if max(dataframe['open'][i], dataframe['close'][i]) >= dataframe['VWAP'][i]:
-                    down_trend = 0  # Set down_trend to 0
-
-                if min(dataframe['open'][i], dataframe['close'][i]) <= dataframe['VWAP'][i]:
-                    up_trend = 0  # Set up_trend to 0
-
-            if up_trend == 1 and down_trend == 1:
-                VWAP_signal[row] = 3  # Neutral signal
-            elif up_trend == 1:
-
-                VWAP_signal[row] = 2
-            elif down_trend == 1:
-
-                VWAP_signal[row] = 1
-
-        dataframe['VWAP_signal'] = VWAP_signal
+        dataframe['VWAP_signal'] = VWAP_signal(dataframe, backcandles=15)
 
         return dataframe
 
@@ -0,0 +1,6 @@
+"""
+Shared helpers for the strategies in this repository.
+
+Copy this folder next to the strategy files (user_data/strategies/strategy_utils)
+so that `from strategy_utils.indicators import ...` resolves when freqtrade loads them.
+"""
@@ -0,0 +1,45 @@
+"""
+Join columns of another dataframe (other pair or timeframe) on the candle date.
+
+Assigning a Series of another dataframe aligns on the integer index, which is only
+right when both dataframes start on the same candle and have no gaps. These helpers
+look the dates up with searchsorted on int64 timestamps instead, and hand out the
+columns without a copy when both dataframes already have the same dates.
+
+    positions = date_positions(date_keys(btc['date']), date_keys(dataframe['date']))
+    dataframe['btc_close'] = align_column(btc['close'].to_numpy(), positions)
+"""
+from typing import Optional
+
+import numpy as np
+from pandas import Series
+
+
+def date_keys(dates: Series) -> np.ndarray:
+    """int64 nanoseconds (UTC) of a date column."""
+    return dates.to_numpy(dtype='datetime64[ns]').view(np.int64)
+
+
+def date_positions(source: np.ndarray, target: np.ndarray) -> Optional[np.ndarray]:
+    """
+    Row of source (sorted dates) for every date of target, -1 where source has no candle.
+    None when both have the same dates, i.e. the columns can be used as they are.
+    """
+    if len(source) == len(target) and np.array_equal(source, target):
+        return None
+    if len(source) == 0:
+        return np.full(len(target), -1, dtype=np.intp)
+    positions = np.searchsorted(source, target)
+    np.minimum(positions, len(source) - 1, out=positions)
+    return np.where(source[positions] == target, positions, -1)
+
+
+def align_column(values: np.ndarray, positions: Optional[np.ndarray]) -> np.ndarray:
+    """values on the target dates of date_positions(), NaN where the date is missing."""
+    if positions is None:
+        return values
+    if len(values) == 0:
+        return np.full(len(positions), np.nan)
+    column = values.take(positions).astype(np.float64, copy=False)
+    column[positions < 0] = np.nan
+    return column
@@ -0,0 +1,147 @@
+"""
+Candle still forming, built from the rates the callbacks see between two candles.
+
+Live callbacks (custom_exit / custom_stoploss ...) get the current rate every few
+seconds but the analyzed dataframe only up to the last closed candle. FormingCandles
+aggregates those rates per key (pair or trade id) into open / high / low / close,
+stored in preallocated arrays (one slot per key, doubled when full) instead of a dict
+per key. Like BoundedStore, the least recently updated keys are dropped above
+max_entries and keys not updated for ttl seconds (trades closed while the bot was
+down ...), with the counters logged every report_interval seconds.
+
+    forming_candles = FormingCandles('forming candles', max_entries=1000, ttl=24 * 3600)
+    candle = self.forming_candles.update(trade.id, last_candle['date'], last_candle['close'], current_rate)
+    candle['high'], candle['close'], candle['date']
+    self.forming_candles.remove(trade.id)
+
+A candle starts at the close of the last analyzed candle and is restarted when the
+date of the last analyzed candle changes.
+"""
+import logging
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_COLUMNS = {'open': 0, 'high': 1, 'low': 2, 'close': 3}
+
+
+class FormingCandle:
+    """Read-only view on the slot of one key, valid until the key is removed or dropped."""
+    __slots__ = ('_candles', '_slot')
+
+    def __init__(self, candles: 'FormingCandles', slot: int):
+        self._candles = candles
+        self._slot = slot
+
+    def __getitem__(self, column: str):
+        if column == 'date':
+            return self._candles._dates[self._slot]
+        if column == 'volume':
+            return 0
+        return float(self._candles._ohlc[self._slot, _COLUMNS[column]])
+
+
+class FormingCandles:
+
+    def __init__(self, name: str = 'forming candles', capacity: int = 64, max_entries: int = 1000,
+                 ttl: Optional[float] = None, report_interval: Optional[float] = 3600,
+                 clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.report_interval = report_interval
+        self._clock = clock
+        capacity = max(1, min(capacity, max_entries))
+        self._ohlc = np.full((capacity, 4), np.nan)
+        self._dates: List[object] = [None] * capacity
+        self._used = np.zeros(capacity)
+        # key -> slot, least recently updated first
+        self._slots: 'OrderedDict[Hashable, int]' = OrderedDict()
+        self._free: List[int] = list(range(capacity - 1, -1, -1))
+        self._reported = clock()
+        self.evictions = 0
+        self.expirations = 0
+
+    def _expire(self, now: float) -> None:
+        if self.ttl is None:
+            return
+        while self._slots:
+            key, slot = next(iter(self._slots.items()))
+            if now - self._used[slot] <= self.ttl:
+                break
+            self.remove(key)
+            self.expirations += 1
+
+    def _slot(self, key: Hashable, now: float) -> int:
+        slot = self._slots.get(key)
+        if slot is not None:
+            self._slots.move_to_end(key)
+            return slot
+        while len(self._slots) >= self.max_entries:
+            self.remove(next(iter(self._slots)))
+            self.evictions += 1
+        if not self._free:
+            capacity = len(self._ohlc)
+            grown = min(2 * capacity, self.max_entries)
+            self._ohlc = np.concatenate((self._ohlc, np.full((grown - capacity, 4), np.nan)))
+            self._dates.extend([None] * (grown - capacity))
+            self._used = np.concatenate((self._used, np.zeros(grown - capacity)))
+            self._free = list(range(grown - 1, capacity - 1, -1))
+        slot = self._slots[key] = self._free.pop()
+        self._dates[slot] = None
+        return slot
+
+    def update(self, key: Hashable, candle_date, open_rate: float, rate: float) -> FormingCandle:
+        """
+        Add rate to the candle of key. candle_date / open_rate: date and close of the
+        last analyzed candle, a new date starts a new candle at open_rate.
+        """
+        now = self._clock()
+        self._expire(now)
+        slot = self._slot(key, now)
+        self._used[slot] = now
+        ohlc = self._ohlc[slot]
+        if self._dates[slot] != candle_date:
+            self._dates[slot] = candle_date
+            ohlc[:3] = open_rate
+        if rate > ohlc[1]:
+            ohlc[1] = rate
+        if rate < ohlc[2]:
+            ohlc[2] = rate
+        ohlc[3] = rate
+        self._report(now)
+        return FormingCandle(self, slot)
+
+    def get(self, key: Hashable) -> Optional[FormingCandle]:
+        slot = self._slots.get(key)
+        return None if slot is None else FormingCandle(self, slot)
+
+    def remove(self, key: Hashable) -> None:
+        slot = self._slots.pop(key, None)
+        if slot is not None:
+            self._dates[slot] = None
+            self._free.append(slot)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._slots
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'entries': len(self._slots),
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+        }
+
+    def _report(self, now: float) -> None:
+        if self.report_interval is None:
+            return
+        if now - self._reported >= self.report_interval:
+            self._reported = now
+            logger.info(f"{self.name}: " + ', '.join(f"{key} {value}" for key, value in self.stats().items()))
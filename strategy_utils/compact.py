@@ -0,0 +1,94 @@
+"""
+Smaller analyzed dataframes for bots running many pairs.
+
+Freqtrade keeps the analyzed dataframe of every pair in memory, mostly float64
+indicator columns. compact_dataframe() stores the indicators as float32 (when the
+values survive the round trip), 0 / 1 integer columns as int8 and the tag columns as
+categoricals. OHLCV and date are never touched, bool columns already use one byte.
+
+Strategies opt in with `compact_analyzed_dataframe = True` and compact the frame at
+the end of the exit trend, once the signals are set, so only the callbacks see the
+float32 values. validate_compact() checks a strategy before switching it on.
+"""
+from typing import Callable, Dict, Mapping, Sequence
+
+import numpy as np
+from pandas import DataFrame, Series
+
+_PROTECTED = ('date', 'open', 'high', 'low', 'close', 'volume')
+_TAGS = ('buy_tag', 'enter_tag', 'exit_tag')
+_SIGNALS = ('buy', 'sell', 'enter_long', 'exit_long', 'enter_short', 'exit_short') + _TAGS
+
+
+def _float32(values: np.ndarray, rtol: float) -> np.ndarray:
+    with np.errstate(over='ignore', under='ignore'):
+        compact = values.astype(np.float32)
+    restored = compact.astype(np.float64)
+    finite = np.isfinite(values)
+    # overflow to inf or underflow of tiny values: keep the column as it is
+    if not np.array_equal(np.isfinite(restored), finite):
+        return values
+    if np.any(np.abs(restored[finite] - values[finite]) > rtol * np.abs(values[finite])):
+        return values
+    return compact
+
+
+def _int8(values: np.ndarray) -> np.ndarray:
+    if len(values) > 0 and (values.min() < 0 or values.max() > 1):
+        return values
+    return values.astype(np.int8)
+
+
+def compact_dataframe(dataframe: DataFrame, keep: Sequence[str] = (), rtol: float = 1e-6) -> DataFrame:
+    """New dataframe with the compacted columns, columns in keep stay as they are."""
+    columns = {}
+    for name in dataframe.columns:
+        column = dataframe[name]
+        if name in _PROTECTED or name in keep:
+            columns[name] = column
+        elif name in _TAGS:
+            columns[name] = column.astype('category')
+        elif column.dtype == np.float64:
+            columns[name] = _float32(column.to_numpy(), rtol)
+        elif column.dtype == np.int64:
+            columns[name] = _int8(column.to_numpy())
+        else:
+            columns[name] = column
+    return DataFrame(columns, index=dataframe.index)
+
+
+def _mismatches(full: Series, compact: Series) -> int:
+    full = full.astype(object).where(full.notna(), None)
+    compact = compact.astype(object).where(compact.notna(), None)
+    return int((full.to_numpy() != compact.to_numpy()).sum())
+
+
+def validate_compact(strategy, dataframe: DataFrame, metadata: dict, keep: Sequence[str] = (),
+                     checks: Mapping[str, Callable[[DataFrame], Sequence]] = None) -> Dict[str, int]:
+    """
+    Run the entry / exit trend of strategy on its indicators as they are and compacted,
+    and count the candles where a signal column (or the result of a check, e.g. the
+    exit ladder of a callback) differs. An empty dict means compacting is safe.
+
+        validate_compact(strategy, ohlcv, {'pair': 'BTC/USDT'},
+                         checks={'custom_sell': lambda df: strategy.evaluate_custom_sell(df, 0.02, 0.03)})
+    """
+    indicators = strategy.advise_indicators(dataframe.copy(), metadata)
+    advise_entry = getattr(strategy, 'advise_entry', None) or strategy.advise_buy
+    advise_exit = getattr(strategy, 'advise_exit', None) or strategy.advise_sell
+
+    results = {}
+    for mode, frame in (('full', indicators.copy()), ('compact', compact_dataframe(indicators, keep))):
+        frame = advise_exit(advise_entry(frame, metadata), metadata)
+        outputs = {name: frame[name] for name in _SIGNALS if name in frame.columns}
+        for name, check in (checks or {}).items():
+            outputs[name] = Series(check(frame), index=frame.index)
+        results[mode] = outputs
+
+    differences = {}
+    for name, full in results['full'].items():
+        compact = results['compact'].get(name)
+        count = len(full) if compact is None else _mismatches(full, compact)
+        if count:
+            differences[name] = count
+    return differences
@@ -0,0 +1,149 @@
+"""
+Array simulation of the MartingaleSpot DCA ladder on one price path per pair.
+
+MartingaleSpot enters on every candle, adds the current stake again when the profit
+falls to the next add threshold (-2.5 / -5 / -10 / -20%) and exits at the target of
+its number of entries (4 / 2 / 1 / 0.5%). Between two events the trade doesn't
+change, so the next event is the first candle whose rate leaves the band
+[add price, exit price]. simulate_dca_ladder() finds it with the minimum / maximum of
+blocks of candles (skipping blocks entirely inside the band) instead of calling the
+callbacks on every candle.
+
+    trades = simulate_dca_ladder(dataframe['open'].to_numpy(), dataframe['open'].to_numpy(),
+                                 strategy.dca_add_thresholds, strategy.dca_exit_targets)
+    summarize_trades(trades)
+
+Rates: freqtrade's backtesting (freqtrade/optimize/backtesting.py) calls
+adjust_trade_position and custom_exit with the open of each candle and fills the
+order at that open; the next trade is entered at the open of the candle after the
+exit. Passing the opens as rates, as above, assumes exactly this model; with the
+closes the callbacks see the end of each candle instead. Stakes are in units of the
+first stake, the wallet limit of adjust_trade_position is not modelled.
+tests/test_dca_ladder.py replays the strategy's own callbacks candle by candle.
+From an OHLCVStore (see strategy_utils.ohlcv):
+
+    python -m strategy_utils.dca_ladder user_data/ohlcv 1m BTC/USDT ETH/USDT
+"""
+import sys
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+from pandas import DataFrame
+
+# MartingaleSpot's ladder
+ADD_THRESHOLDS = (-0.025, -0.05, -0.10, -0.20)
+EXIT_TARGETS = (0.04, 0.02, 0.01, 0.005)
+
+TRADE = np.dtype([
+    ('entry_index', np.int64),
+    ('exit_index', np.int64),       # -1: still open at the last candle
+    ('entries', np.int64),
+    ('stake', np.float64),          # in first stakes
+    ('profit_ratio', np.float64),
+    ('profit_abs', np.float64),     # in first stakes
+])
+
+
+def block_extrema(values: np.ndarray, block: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Minimum and maximum of values per block of `block` candles."""
+    padding = -len(values) % block
+    padded = np.concatenate((values, np.full(padding, np.nan)))
+    blocks = padded.reshape(-1, block)
+    return np.nanmin(blocks, axis=1), np.nanmax(blocks, axis=1)
+
+
+def first_outside(values: np.ndarray, block_min: np.ndarray, block_max: np.ndarray, block: int,
+                  start: int, low: float, high: float) -> int:
+    """First index >= start with values <= low or >= high, -1 if there is none."""
+    end = min((start // block + 1) * block, len(values))
+    part = values[start:end]
+    hits = np.flatnonzero((part <= low) | (part >= high))
+    if len(hits):
+        return start + int(hits[0])
+
+    first_block = start // block + 1
+    blocks = np.flatnonzero((block_min[first_block:] <= low) | (block_max[first_block:] >= high))
+    if not len(blocks):
+        return -1
+    start = (first_block + int(blocks[0])) * block
+    part = values[start:start + block]
+    return start + int(np.flatnonzero((part <= low) | (part >= high))[0])
+
+
+def simulate_dca_ladder(rates: np.ndarray, open_rate: np.ndarray,
+                        add_thresholds: Sequence[float] = ADD_THRESHOLDS, exit_targets: Sequence[float] = EXIT_TARGETS,
+                        fee: float = 0.001, block: int = 256) -> np.ndarray:
+    """
+    Trades (TRADE records) of the ladder over one pair. rates: the rate the callbacks
+    see and fill at per candle, open_rate: entry rate of a new trade.
+    add_thresholds[n - 1]: profit at which a trade with n entries adds its stake again,
+    exit_targets[n - 1]: profit at which it exits (the last target for more entries).
+    """
+    rates = np.asarray(rates, dtype=np.float64)
+    open_rate = np.asarray(open_rate, dtype=np.float64)
+    block_min, block_max = block_extrema(rates, block)
+    trades = []
+
+    entry_index = 0
+    while entry_index < len(rates):
+        price = open_rate[entry_index]
+        stake = 1.0
+        amount = stake / price
+        entries = 1
+        index = entry_index
+        while True:
+            # profit = amount * rate * (1 - fee) / (stake * (1 + fee)) - 1
+            cost = stake * (1 + fee) / (amount * (1 - fee))
+            target = exit_targets[min(entries, len(exit_targets)) - 1]
+            exit_price = cost * (1 + target)
+            add_price = cost * (1 + add_thresholds[entries - 1]) if entries <= len(add_thresholds) else -np.inf
+            index = first_outside(rates, block_min, block_max, block, index, add_price, exit_price)
+            if index < 0:
+                break
+            if rates[index] >= exit_price:
+                break
+            # add the current stake again at the rate of the candle
+            amount += stake / rates[index]
+            stake *= 2
+            entries += 1
+            index += 1
+            if index >= len(rates):
+                index = -1
+                break
+
+        rate = rates[index] if index >= 0 else rates[-1]
+        profit_ratio = amount * rate * (1 - fee) / (stake * (1 + fee)) - 1
+        trades.append((entry_index, index, entries, stake, profit_ratio, profit_ratio * stake))
+        if index < 0:
+            break
+        entry_index = index + 1
+
+    return np.array(trades, dtype=TRADE)
+
+
+def summarize_trades(trades: np.ndarray) -> Dict[str, float]:
+    closed = trades[trades['exit_index'] >= 0]
+    open_trades = trades[trades['exit_index'] < 0]
+    return {
+        'trades': len(closed),
+        'profit_abs': float(closed['profit_abs'].sum()),
+        'max_entries': int(trades['entries'].max()) if len(trades) else 0,
+        'max_stake': float(trades['stake'].max()) if len(trades) else 0.0,
+        'open_profit_abs': float(open_trades['profit_abs'].sum()),
+    }
+
+
+if __name__ == '__main__':
+    from strategy_utils.ohlcv import OHLCVStore
+
+    if len(sys.argv) < 4:
+        print('usage: python -m strategy_utils.dca_ladder <store directory> <timeframe> <pair> [pair ...]')
+        sys.exit(1)
+    directory, timeframe, *pairs = sys.argv[1:]
+    store = OHLCVStore(directory)
+    rows = []
+    for pair in pairs:
+        arrays = store.arrays(pair, timeframe)
+        trades = simulate_dca_ladder(arrays['open'], arrays['open'])
+        rows.append({'pair': pair, **summarize_trades(trades)})
+    print(DataFrame(rows).to_string(index=False))
@@ -0,0 +1,80 @@
+"""
+Exit ladders (if / elif chains of threshold checks) compiled into flat numpy tables.
+
+Every rule is a conjunction of conditions `lhs op rhs + const`, where lhs and rhs are
+feature names (rhs None means 0). The rules are checked in order and the first one
+that matches gives the exit tag, exactly like the elif chain it replaces.
+
+    ladder = ExitLadder(['profit', 'rsi'], [
+        ('signal_profit_1', [('profit', '>', None, 0.03), ('rsi', '<', None, 38.0)]),
+        ('signal_profit_0', [('profit', '>', None, 0.01), ('rsi', '<', None, 33.0)]),
+    ])
+    ladder.evaluate([0.04, 35.0])            # 'signal_profit_1'
+    ladder.evaluate_many(matrix)             # one tag (or None) per row
+"""
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+Condition = Tuple[str, str, Optional[str], float]
+
+_OPERATORS = {
+    '<': np.less,
+    '<=': np.less_equal,
+    '>': np.greater,
+    '>=': np.greater_equal,
+}
+
+
+class ExitLadder:
+
+    def __init__(self, features: Sequence[str], rules: Sequence[Tuple[str, Sequence[Condition]]]):
+        self.features = list(features)
+        self.names = np.array([name for name, _ in rules] + [None], dtype=object)
+
+        # extra feature column which is always 0, for conditions against a constant
+        zero = len(self.features)
+        position = {name: index for index, name in enumerate(self.features)}
+
+        lhs, rhs, const, starts = [], [], [], []
+        operators = {op: [] for op in _OPERATORS}
+        for name, conditions in rules:
+            if not conditions:
+                raise ValueError(f"Exit rule '{name}' has no conditions")
+            starts.append(len(lhs))
+            for left, op, right, value in conditions:
+                if op not in _OPERATORS:
+                    raise ValueError(f"Unknown operator '{op}' in exit rule '{name}'")
+                operators[op].append(len(lhs))
+                lhs.append(position[left])
+                rhs.append(zero if right is None else position[right])
+                const.append(value)
+
+        self._lhs = np.array(lhs, dtype=np.intp)
+        self._rhs = np.array(rhs, dtype=np.intp)
+        self._const = np.array(const, dtype=np.float64)
+        self._starts = np.array(starts, dtype=np.intp)
+        self._operators = [
+            (_OPERATORS[op], np.array(indexes, dtype=np.intp))
+            for op, indexes in operators.items() if indexes
+        ]
+
+    def _matches(self, values: np.ndarray) -> np.ndarray:
+        """(rows, features) -> (rows, rules) bool."""
+        values = np.concatenate((values, np.zeros((len(values), 1))), axis=1)
+        left = values[:, self._lhs]
+        right = values[:, self._rhs] + self._const
+        conditions = np.empty(left.shape, dtype=bool)
+        for compare, indexes in self._operators:
+            conditions[:, indexes] = compare(left[:, indexes], right[:, indexes])
+        return np.logical_and.reduceat(conditions, self._starts, axis=1)
+
+    def evaluate_many(self, values) -> np.ndarray:
+        """Exit tag of the first matching rule per row (None when no rule matches)."""
+        values = np.asarray(values, dtype=np.float64).reshape(-1, len(self.features))
+        matches = self._matches(values)
+        first = np.where(matches.any(axis=1), matches.argmax(axis=1), len(self.names) - 1)
+        return self.names[first]
+
+    def evaluate(self, values) -> Optional[str]:
+        return self.evaluate_many(values)[0]
@@ -0,0 +1,233 @@
+"""
+Which dataframe columns a strategy actually reads, from its source code.
+
+Every `x[<name>] = ...` (or `x.loc[..., <name>] = ...`) defines the column <name>
+from the string constants on its right hand side, and so does every `<name>: ...` of
+a dict returned by a module level function (column builders, e.g. for
+MarketContextCache). Every other string constant of the module (conditions,
+callbacks, plot_config, class attributes) is a read. A column is needed when it is
+read or when a needed column is defined from it, so indicators that only feed unused
+columns are skipped as well.
+
+The analysis is conservative: f-strings match as patterns, and columns the source
+never defines are always needed. Columns assigned by a variable name
+(`dataframe[name] = values`) are not seen, guard them with needs(name). As a class
+attribute without paths, it analyses the files of the strategy class and its bases,
+so subclasses in other files count too.
+
+    column_usage = ColumnUsage()
+
+    if self.column_usage.needs('chop'):
+        dataframe['chop'] = qtpylib.chopiness(dataframe, 14)
+
+    if self.column_usage.needs('btc_5m', 'btc_1d'):     # any of them
+        ...
+
+    python -m strategy_utils.dependencies NFI5MOHO/NFI5MOHO_WIP.py   # list unused columns
+"""
+import ast
+import logging
+import re
+import sys
+from typing import Dict, List, Optional, Pattern, Set, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+Name = Union[str, Pattern]
+
+# read by freqtrade itself
+_FREQTRADE_COLUMNS = (
+    'date', 'open', 'high', 'low', 'close', 'volume',
+    'buy', 'sell', 'buy_tag', 'exit_tag', 'enter_long', 'exit_long', 'enter_short', 'exit_short', 'enter_tag',
+)
+
+
+def _name(node: ast.AST) -> Optional[Name]:
+    """Column name of a subscript key: str constant or f-string pattern."""
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    if isinstance(node, ast.JoinedStr):
+        parts = [re.escape(value.value) if isinstance(value, ast.Constant) else '.*' for value in node.values]
+        return re.compile(''.join(parts))
+    return None
+
+
+def _literal(name: Optional[Name]) -> bool:
+    # f'{i}' says nothing about the column (and is mostly a dict key, e.g. ma_map[f'{i}'])
+    return name is not None and (isinstance(name, str) or name.pattern.replace('.*', '') != '')
+
+
+def _defined_column(target: ast.AST) -> Optional[Name]:
+    if not isinstance(target, ast.Subscript):
+        return None
+    key = target.slice
+    if isinstance(key, ast.Index):  # python < 3.9
+        key = key.value
+    if isinstance(key, ast.Tuple) and len(key.elts) == 2:
+        key = key.elts[1]  # dataframe.loc[rows, 'column'] = ...
+    return _name(key)
+
+
+def _names(node: ast.AST) -> List[Name]:
+    names = []
+    for child in ast.walk(node):
+        if isinstance(child, ast.JoinedStr):
+            names.append(_name(child))
+        elif isinstance(child, ast.Constant) and isinstance(child.value, str):
+            names.append(child.value)
+    return [name for name in names if _literal(name)]
+
+
+class _Collector(ast.NodeVisitor):
+
+    def __init__(self):
+        self.edges: List[Tuple[Name, List[Name]]] = []
+        self.reads: List[Name] = []
+        self._classes = 0
+
+    def _assign(self, targets: List[ast.AST], value: Optional[ast.AST]) -> None:
+        defined = [_defined_column(target) for target in targets]
+        if value is None or not all(_literal(column) for column in defined):
+            self.generic_visit_nodes(targets + ([value] if value is not None else []))
+            return
+        sources = _names(value)
+        for target, column in zip(targets, defined):
+            # names inside the target besides the column (e.g. the .loc condition) are reads
+            self.reads.extend(name for name in _names(target) if name != column)
+            self.edges.append((column, sources))
+
+    def generic_visit_nodes(self, nodes: List[ast.AST]) -> None:
+        for node in nodes:
+            self.visit(node)
+
+    def visit_Assign(self, node: ast.Assign) -> None:
+        self._assign(node.targets, node.value)
+
+    def visit_AugAssign(self, node: ast.AugAssign) -> None:
+        self._assign([node.target], node.value)
+
+    def visit_AnnAssign(self, node: ast.AnnAssign) -> None:
+        self._assign([node.target], node.value)
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        self._classes += 1
+        self.generic_visit(node)
+        self._classes -= 1
+
+    def visit_Return(self, node: ast.Return) -> None:
+        # {'btc_5m': btc_5m, ...} of a column builder, not of a method (plot_config, ...)
+        value = node.value
+        if (self._classes or not isinstance(value, ast.Dict)
+                or not all(isinstance(key, ast.Constant) and isinstance(key.value, str) for key in value.keys)):
+            self.generic_visit(node)
+            return
+        for key, item in zip(value.keys, value.values):
+            self.edges.append((key.value, _names(item)))
+
+    def visit_Call(self, node: ast.Call) -> None:
+        # the column names of the needs() guards themselves are no reads
+        if isinstance(node.func, ast.Attribute) and node.func.attr == 'needs':
+            self.visit(node.func)
+            return
+        self.generic_visit(node)
+
+    def visit_Constant(self, node: ast.Constant) -> None:
+        if isinstance(node.value, str):
+            self.reads.append(node.value)
+
+    def visit_JoinedStr(self, node: ast.JoinedStr) -> None:
+        name = _name(node)
+        if _literal(name):
+            self.reads.append(name)
+
+
+def _source_files(cls) -> List[str]:
+    files = []
+    for klass in cls.__mro__:
+        if klass is object or klass.__module__.startswith('freqtrade'):
+            continue
+        for attribute in vars(klass).values():
+            code = getattr(attribute, '__code__', None)
+            if code is not None:
+                if code.co_filename not in files:
+                    files.append(code.co_filename)
+                break
+    return files
+
+
+class ColumnUsage:
+
+    def __init__(self, *paths: str):
+        self.paths = paths
+        self._classes: Dict[type, 'ColumnUsage'] = {}
+        self._needed: Optional[Set[str]] = None
+        self._patterns: List[Pattern] = []
+        self._defined: Set[str] = set()
+        self.skipped: Set[str] = set()
+
+    def __get__(self, instance, owner) -> 'ColumnUsage':
+        if self.paths:
+            return self
+        usage = self._classes.get(owner)
+        if usage is None:
+            usage = self._classes[owner] = ColumnUsage(*_source_files(owner))
+        return usage
+
+    def _analyze(self) -> None:
+        collector = _Collector()
+        for path in self.paths:
+            with open(path, encoding='utf-8') as source:
+                collector.visit(ast.parse(source.read(), filename=path))
+
+        definitions: Dict[str, List[Name]] = {}
+        roots: List[Name] = list(collector.reads) + list(_FREQTRADE_COLUMNS)
+        for column, sources in collector.edges:
+            if isinstance(column, str):
+                definitions.setdefault(column, []).extend(sources)
+                self._defined.add(column)
+            else:
+                # can't tell which columns a pattern defines, keep its sources
+                roots.extend(sources)
+
+        needed: Set[str] = set()
+        pending = roots
+        while pending:
+            name = pending.pop()
+            if isinstance(name, str):
+                if name in needed:
+                    continue
+                needed.add(name)
+                pending.extend(definitions.get(name, ()))
+            elif name not in self._patterns:
+                self._patterns.append(name)
+                for column in [column for column in definitions if column not in needed and name.fullmatch(column)]:
+                    needed.add(column)
+                    pending.extend(definitions[column])
+        self._needed = needed
+
+    def _is_needed(self, column: str) -> bool:
+        if self._needed is None:
+            self._analyze()
+        return (column in self._needed or column not in self._defined
+                or any(pattern.fullmatch(column) for pattern in self._patterns))
+
+    def needs(self, *columns: str) -> bool:
+        """False when nothing reads any of columns, their computation can be skipped."""
+        if any(self._is_needed(column) for column in columns):
+            return True
+        for column in columns:
+            if column not in self.skipped:
+                self.skipped.add(column)
+                logger.info(f"Skipping unused column '{column}'")
+        return False
+
+    def unused(self) -> List[str]:
+        """Columns defined in the source which nothing reads."""
+        if self._needed is None:
+            self._analyze()
+        return sorted(column for column in self._defined if not self._is_needed(column))
+
+
+if __name__ == '__main__':
+    for path in sys.argv[1:]:
+        print(f"{path}: {', '.join(ColumnUsage(path).unused()) or '-'}")
@@ -0,0 +1,107 @@
+"""
+Indicator arrays cached per (pair, timeframe, indicator, parameters, data).
+
+Hyperopt evaluates the signal logic with new parameter values on the same candles
+every epoch; an indicator whose length is a parameter (SMA 5..30, EMA 5..80) is
+computed again for every value it comes back to, in every hyperopt worker and every
+run. IndicatorCache keeps the arrays in memory (least recently used dropped above
+max_entries) and, with a directory, as .npy files shared between the workers and
+later runs on the same data.
+
+Live candles never come back (every new candle changes the data), so strategies
+only create the cache for hyperopt / backtest and compute directly otherwise:
+
+    indicator_cache = None
+
+    def bot_start(self, **kwargs):
+        if self.config['runmode'].value in ('hyperopt', 'backtest'):
+            self.indicator_cache = IndicatorCache(Path(self.config['user_data_dir']) / 'indicator_cache')
+
+    dataframe['fast_sma'] = self.indicator_cache.get(
+        dataframe, metadata['pair'], self.timeframe, 'sma', ta.SMA, timeperiod=10)
+
+The data fingerprint is a blake2b hash of the dates and OHLCV, computed once per
+pair and data (length, first and last date). The returned arrays are read-only.
+"""
+import hashlib
+import os
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple, Union
+
+import numpy as np
+from pandas import DataFrame
+
+from strategy_utils.align import date_keys
+from strategy_utils.store import BoundedStore
+
+_OHLCV = ('open', 'high', 'low', 'close', 'volume')
+
+
+def data_fingerprint(dataframe: DataFrame) -> str:
+    """blake2b of the dates and OHLCV of dataframe."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.ascontiguousarray(date_keys(dataframe['date'])).tobytes())
+    for column in _OHLCV:
+        if column in dataframe.columns:
+            digest.update(np.ascontiguousarray(dataframe[column].to_numpy(dtype=np.float64)).tobytes())
+    return digest.hexdigest()
+
+
+def _slug(value: str) -> str:
+    return ''.join(c if c.isalnum() or c in '-_.=' else '_' for c in value)
+
+
+class IndicatorCache:
+
+    def __init__(self, directory: Optional[Union[str, Path]] = None, max_entries: int = 1024):
+        self.directory = directory
+        self._arrays = BoundedStore('indicator cache', max_entries=max_entries)
+        # pair -> ((length, first date, last date), fingerprint)
+        self._fingerprints: Dict[str, Tuple[Tuple, str]] = {}
+
+    def fingerprint(self, dataframe: DataFrame, pair: str) -> str:
+        dates = dataframe['date']
+        shape = (len(dataframe), dates.iat[0], dates.iat[-1]) if len(dataframe) else (0, None, None)
+        cached = self._fingerprints.get(pair)
+        if cached is None or cached[0] != shape:
+            cached = self._fingerprints[pair] = (shape, data_fingerprint(dataframe))
+        return cached[1]
+
+    def _file(self, pair: str, timeframe: str, name: str, params: str, fingerprint: str) -> Path:
+        directory = Path(self.directory) / _slug(f'{pair}-{timeframe}')
+        return directory / f'{_slug(name)}-{_slug(params)}-{fingerprint}.npy'
+
+    def get(self, dataframe: DataFrame, pair: str, timeframe: str, name: str, compute: Callable,
+            **params) -> np.ndarray:
+        """compute(dataframe, **params), unless cached for the same pair, timeframe and data."""
+        fingerprint = self.fingerprint(dataframe, pair)
+        params_key = ','.join(f'{key}={value}' for key, value in sorted(params.items()))
+        key = (pair, timeframe, name, params_key, fingerprint)
+        values = self._arrays.get(key)
+        if values is not None:
+            return values
+
+        path = self._file(pair, timeframe, name, params_key, fingerprint) if self.directory is not None else None
+        if path is not None and path.exists():
+            values = np.load(path, mmap_mode='r')
+        else:
+            values = np.array(compute(dataframe, **params))
+            values.setflags(write=False)
+            if path is not None:
+                self._save(path, values)
+        self._arrays[key] = values
+        return values
+
+    @staticmethod
+    def _save(path: Path, values: np.ndarray) -> None:
+        # several hyperopt workers may write the same file: write aside, then rename
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+        with open(temporary, 'wb') as file:
+            np.save(file, values)
+        os.replace(temporary, path)
+
+    def clear(self) -> None:
+        """Forget the arrays in memory, the files stay."""
+        self._arrays.clear()
+        self._fingerprints.clear()
@@ -0,0 +1,87 @@
+"""
+Indicators shared between the strategies.
+
+All functions read the needed columns as numpy arrays and never copy the dataframe.
+"""
+from typing import Sequence
+
+import numpy as np
+import talib
+from pandas import DataFrame, Series
+
+from strategy_utils.rolling import RollingCache, rolling_max_multi, rolling_min_multi
+
+
+_MOVING_AVERAGES = {
+    'ema': talib.EMA,
+    'sma': talib.SMA,
+}
+
+
+def _column(dataframe: DataFrame, name: str) -> np.ndarray:
+    # zero-copy for the usual float64 ohlcv columns
+    return dataframe[name].to_numpy(dtype=np.float64)
+
+
+def ewo(dataframe: DataFrame, fast_length: int = 5, slow_length: int = 35,
+        ma_type: str = 'ema', normalize_by: str = 'close', scale: float = 100) -> Series:
+    """
+    Elliot Wave Oscillator: (MA(fast) - MA(slow)) / price * scale, both MAs over close.
+
+    The strategies historically disagree on the variant, so it is explicit here:
+        ma_type:      'ema' or 'sma'
+        normalize_by: dataframe column used as divisor ('close' or 'low')
+        scale:        100, or 120 in the NASOSv5 family
+    """
+    if ma_type not in _MOVING_AVERAGES:
+        raise ValueError(f"Unknown EWO moving average '{ma_type}', use one of {list(_MOVING_AVERAGES)}")
+
+    moving_average = _MOVING_AVERAGES[ma_type]
+    close = _column(dataframe, 'close')
+    ma_fast = moving_average(close, timeperiod=fast_length)
+    ma_slow = moving_average(close, timeperiod=slow_length)
+
+    return Series((ma_fast - ma_slow) / _column(dataframe, normalize_by) * scale, index=dataframe.index)
+
+
+def williams_r(dataframe: DataFrame, period: int = 14) -> Series:
+    """Williams %R, or just %R, is a technical analysis oscillator showing the current closing price in relation to the high and low
+        of the past N days (for a given N). It was developed by a publisher and promoter of trading materials, Larry Williams.
+        Its purpose is to tell whether a stock or commodity market is trading near the high or the low, or somewhere in between,
+        of its recent trading range.
+        The oscillator is on a negative scale, from −100 (lowest) up to 0 (highest).
+    """
+    highest_high = rolling_max_multi(_column(dataframe, 'high'), (period,))[0]
+    lowest_low = rolling_min_multi(_column(dataframe, 'low'), (period,))[0]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        wr = (highest_high - _column(dataframe, 'close')) / (highest_high - lowest_low)
+
+    return Series(wr * -100, index=dataframe.index, name=f"{period} Williams %R")
+
+
+def pump_protection(rolling: RollingCache, window: int, threshold: float, pull_threshold: float) -> Series:
+    """
+    NFI pump protection: True while the range of the last window candles stays below
+    threshold, or price has pulled back far enough (range / pull_threshold) from the top.
+    The rolling passes come from the cache, so variants of the same window are free.
+    """
+    close_min = rolling.min('close', window)
+    pump_range = rolling.max('open', window) - close_min
+
+    return ((pump_range / close_min) < threshold) | ((pump_range / pull_threshold) > (rolling.dataframe['close'] - close_min))
+
+
+def dip_protection(dataframe: DataFrame, windows: Sequence[int], thresholds) -> np.ndarray:
+    """
+    NFI dip protection for several threshold sets at once, one bool row per set.
+
+    A row is True while, for every window, the drop from the highest open of the last
+    window candles to the close, (open.rolling(window).max() - close) / close, stays
+    below the threshold of that window. thresholds has shape (sets, len(windows)).
+    """
+    thresholds = np.asarray(thresholds, dtype=np.float64)
+    close = _column(dataframe, 'close')
+    drops = (rolling_max_multi(_column(dataframe, 'open'), windows) - close) / close
+
+    return (drops[np.newaxis, :, :] < thresholds[:, :, np.newaxis]).all(axis=1)
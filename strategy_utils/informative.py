@@ -0,0 +1,135 @@
+"""
+Informative timeframe columns joined onto the strategy timeframe without a merge.
+
+merge_informative_pair() merges the whole informative dataframe, renames every column
+and forward fills the result on every call. InformativeJoin keeps, per pair, the row
+of the informative candle matching each candle of the dataframe (updated for the new
+candles only) and gathers just the columns the strategy reads, with the same values:
+
+    the informative candle is joined on the last candle of the strategy timeframe it
+    covers (date + informative minutes - timeframe minutes), then forward filled; the
+    candles before the first joined one get the informative candle before it.
+
+    informative_join = InformativeJoin('5m', '1h')
+    dataframe = informative_join.join(dataframe, informative_1h, metadata['pair'], ['rsi', 'ema_50'])
+    dataframe['rsi_1h'], dataframe['ema_50_1h']
+"""
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+from freqtrade.exchange import timeframe_to_minutes
+from pandas import DataFrame
+
+from strategy_utils.align import date_keys
+
+_NANOSECONDS_PER_MINUTE = 60 * 1_000_000_000
+
+
+def _matches(source: np.ndarray, target: np.ndarray) -> np.ndarray:
+    """Row of source equal to each target key, -1 for none."""
+    if len(source) == 0:
+        return np.full(len(target), -1, dtype=np.intp)
+    positions = np.searchsorted(source, target)
+    np.minimum(positions, len(source) - 1, out=positions)
+    return np.where(source[positions] == target, positions, -1)
+
+
+def _forward_fill(values: np.ndarray) -> np.ndarray:
+    """DataFrame.ffill() of a float array."""
+    rows = np.where(np.isnan(values), -1, np.arange(len(values)))
+    np.maximum.accumulate(rows, out=rows)
+    filled = values[rows]
+    filled[rows < 0] = np.nan
+    return filled
+
+
+class InformativeJoin:
+    """
+    Bool columns stay bool, candles without any informative candle are False
+    (merge_informative_pair gives NaN there, which the & conditions treat as False).
+    """
+
+    def __init__(self, timeframe: str, timeframe_inf: str):
+        minutes = timeframe_to_minutes(timeframe)
+        minutes_inf = timeframe_to_minutes(timeframe_inf)
+        if minutes_inf < minutes:
+            raise ValueError("Tried to merge a faster timeframe to a slower timeframe.")
+        self.timeframe_inf = timeframe_inf
+        self._offset = (minutes_inf - minutes) * _NANOSECONDS_PER_MINUTE
+        self._pairs: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+
+    def matches(self, pair: str, dataframe: DataFrame, informative: DataFrame) -> np.ndarray:
+        """Row of informative joined on each candle of dataframe, -1 where none is."""
+        target = date_keys(dataframe['date'])
+        source = date_keys(informative['date']) + self._offset
+
+        matches = self._update(self._pairs.get(pair), source, target)
+        if matches is None:
+            matches = _matches(source, target)
+        self._pairs[pair] = (target, source, matches)
+        return matches
+
+    @staticmethod
+    def _update(cached, source: np.ndarray, target: np.ndarray):
+        """Shift the cached matches to the new window and match the new candles only."""
+        if cached is None or len(source) == 0 or len(target) == 0:
+            return None
+        old_target, old_source, old_matches = cached
+
+        target_start = np.searchsorted(old_target, target[0])
+        source_start = np.searchsorted(old_source, source[0])
+        target_overlap = min(len(old_target) - target_start, len(target))
+        source_overlap = len(old_source) - source_start
+        if (target_overlap <= 0 or source_overlap <= 0 or source_overlap > len(source)
+                or not np.array_equal(old_target[target_start:target_start + target_overlap], target[:target_overlap])
+                or not np.array_equal(old_source[source_start:], source[:source_overlap])):
+            return None
+
+        matches = np.empty(len(target), dtype=np.intp)
+        head = old_matches[target_start:target_start + target_overlap] - source_start
+        head[head < 0] = -1
+        matches[:target_overlap] = head
+        matches[target_overlap:] = _matches(source, target[target_overlap:])
+
+        # informative candles which arrived after the candle they are joined on
+        new_sources = np.arange(source_overlap, len(source))
+        rows = _matches(target[:target_overlap], source[source_overlap:])
+        matches[rows[rows >= 0]] = new_sources[rows >= 0]
+        return matches
+
+    def join(self, dataframe: DataFrame, informative: DataFrame, pair: str, columns: Sequence[str]) -> DataFrame:
+        """Add `{column}_{timeframe_inf}` for columns of informative to dataframe."""
+        matches = self.matches(pair, dataframe, informative)
+        matched = matches >= 0
+        last_match = np.where(matched, np.arange(len(matches)), -1)
+        np.maximum.accumulate(last_match, out=last_match)
+        before_first = last_match < 0
+
+        # like merge_informative_pair: when the first candle isn't joined, the candles before
+        # the first joined one get the informative candle before that one (dates are increasing)
+        fill_row = -1
+        if len(matches) > 1 and before_first[0] and not before_first[-1]:
+            fill_row = matches[np.argmax(matched)] - 1
+
+        for column in columns:
+            values = informative[column].to_numpy()
+            if len(values) == 0:
+                joined = np.full(len(matches), np.nan)
+            elif values.dtype == np.bool_:
+                joined = values.take(matches[last_match])
+                joined[before_first] = values[fill_row] if fill_row >= 0 else False
+            else:
+                values = values.astype(np.float64)
+                joined = values.take(matches)
+                joined[~matched] = np.nan
+                joined = _forward_fill(joined)
+                if fill_row >= 0:
+                    joined[before_first] = values[fill_row]
+            dataframe[f'{column}_{self.timeframe_inf}'] = joined
+        return dataframe
+
+    def clear(self, pair: str = None) -> None:
+        if pair is None:
+            self._pairs.clear()
+        else:
+            self._pairs.pop(pair, None)
@@ -0,0 +1,70 @@
+"""
+Hyperoptable indicator columns computed on demand.
+
+Strategies used to loop over `parameter.range` in populate_indicators and build a
+column for every possible value. LazyColumns only builds the column for the value in
+use, when a populate_* method asks for it, and remembers it per pair, so hyperopt
+epochs trying the same value on the same data reuse the column. With an
+IndicatorCache the columns are also shared between hyperopt workers and runs.
+
+Hyperopt runs populate_indicators once on the whole history, but the entry / exit
+trends of every epoch on the candles without the startup candles: a column built
+there would miss its warmup (NaN or unconverged EMA at the start of the window) and
+the epoch would not score like a backtest of the same values. populate_indicators
+therefore still ensures every value of parameter.range, which is only [value]
+outside hyperopt; the trend methods then find the column of their epoch in the
+dataframe.
+"""
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+from pandas import DataFrame
+
+from strategy_utils.indicator_cache import IndicatorCache
+
+
+def _fingerprint(dataframe: DataFrame) -> Tuple:
+    if len(dataframe) == 0:
+        return (0, None, None)
+    dates = dataframe['date']
+    return (len(dataframe), dates.iat[0], dates.iat[-1])
+
+
+class LazyColumns:
+    """
+        lazy = LazyColumns()
+        lazy.ensure(dataframe, pair, f'ma_buy_{val}', ta.EMA, timeperiod=val)
+
+    compute(dataframe, **kwargs) is only called when the column is neither in the
+    dataframe nor cached for this pair and data (length, first and last date), nor in
+    cache (for timeframe) when given.
+    """
+
+    def __init__(self, cache: Optional[IndicatorCache] = None, timeframe: str = ''):
+        self.cache = cache
+        self.timeframe = timeframe
+        self._pairs: Dict[str, Tuple[Tuple, Dict[str, np.ndarray]]] = {}
+
+    def ensure(self, dataframe: DataFrame, pair: str, name: str, compute: Callable, **kwargs) -> None:
+        if name in dataframe.columns:
+            return
+
+        fingerprint = _fingerprint(dataframe)
+        cached = self._pairs.get(pair)
+        if cached is None or cached[0] != fingerprint:
+            cached = (fingerprint, {})
+            self._pairs[pair] = cached
+
+        columns = cached[1]
+        if name not in columns:
+            if self.cache is not None:
+                columns[name] = self.cache.get(dataframe, pair, self.timeframe, name, compute, **kwargs)
+            else:
+                columns[name] = np.asarray(compute(dataframe, **kwargs))
+        dataframe[name] = columns[name]
+
+    def clear(self, pair: str = None) -> None:
+        if pair is None:
+            self._pairs.clear()
+        else:
+            self._pairs.pop(pair, None)
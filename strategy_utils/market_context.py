@@ -0,0 +1,106 @@
+"""
+Market wide columns (e.g. BTC dump protection) computed once per candle for all pairs.
+
+Strategies protecting against BTC dumps used to fetch, copy and shift the BTC dataframe
+inside populate_indicators of every pair. MarketContextCache builds the columns once
+per (pair, timeframe, builder, parameters) and candle, and aligns them on the date of
+each pair dataframe.
+
+In backtests and hyperopt the informative candles can come from an OHLCVStore
+(strategy_utils.ohlcv) instead of the data provider, which hands out a copy of the
+whole history to every pair: the prices are then read-only views on the store files.
+The store is used only when it covers the candles being analysed, from the first
+(first=dataframe['date'].iat[0]) to the last (candle=): a store imported from a later
+start date, or not updated up to the candle, falls back to the data provider.
+"""
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+from pandas import DataFrame
+
+from strategy_utils.align import align_column, date_keys, date_positions
+from strategy_utils.ohlcv import OHLCVStore
+
+
+class MarketContext:
+    """Read-only columns of one informative dataframe, keyed by its dates."""
+
+    def __init__(self, dates: np.ndarray, columns: Dict[str, np.ndarray]):
+        self.dates = dates
+        self.columns = {}
+        for name, values in columns.items():
+            values = np.asarray(values, dtype=np.float64)
+            values.flags.writeable = False
+            self.columns[name] = values
+
+    def align(self, dataframe: DataFrame) -> Dict[str, np.ndarray]:
+        """
+        The columns on the dates of dataframe, NaN where the informative has no candle.
+        Read-only views of the cached columns when the dates are the same.
+        """
+        positions = date_positions(self.dates, date_keys(dataframe['date']))
+        return {name: align_column(values, positions) for name, values in self.columns.items()}
+
+
+class _Entry:
+    __slots__ = ('candle', 'last_date', 'length', 'context')
+
+    def __init__(self, candle, last_date, length, context):
+        self.candle = candle
+        self.last_date = last_date
+        self.length = length
+        self.context = context
+
+
+class MarketContextCache:
+    """
+        market = MarketContextCache()
+        context = market.get(self.dp, 'BTC/USDT', '5m', btc_dump_protection, threshold,
+                             candle=dataframe['date'].iat[-1], first=dataframe['date'].iat[0])
+        for name, values in context.align(dataframe).items():
+            dataframe[name] = values
+
+    build(informative, *params) returns a dict of column arrays. Pairs analysed on the
+    same candle get the cached context without fetching the informative again.
+    """
+
+    def __init__(self, store: Optional[OHLCVStore] = None):
+        self.store = store
+        self._entries: Dict[Tuple, _Entry] = {}
+
+    def informative(self, dp, pair: str, timeframe: str, candle=None, first=None) -> DataFrame:
+        """The candles of the store when it has them from first up to candle, else those of dp."""
+        if self.store is not None and candle is not None and first is not None:
+            first_date = self.store.first_date(pair, timeframe)
+            last_date = self.store.last_date(pair, timeframe)
+            if first_date is not None and first_date <= first and last_date >= candle:
+                return self.store.dataframe(pair, timeframe)
+        return dp.get_pair_dataframe(pair=pair, timeframe=timeframe)
+
+    def get(self, dp, pair: str, timeframe: str, build: Callable[..., Dict[str, np.ndarray]],
+            *params: Hashable, candle=None, first=None) -> MarketContext:
+        key = (pair, timeframe, build, params)
+        entry = self._entries.get(key)
+        if entry is not None and candle is not None and entry.candle == candle:
+            return entry.context
+
+        informative = self.informative(dp, pair, timeframe, candle, first)
+        last_date = informative['date'].iat[-1] if len(informative) > 0 else None
+        if entry is not None and entry.last_date == last_date and entry.length == len(informative):
+            entry.candle = candle
+            return entry.context
+
+        context = MarketContext(date_keys(informative['date']), build(informative, *params))
+        self._entries[key] = _Entry(candle, last_date, len(informative), context)
+        return context
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+def shift(values: np.ndarray, periods: int) -> np.ndarray:
+    """Series.shift(periods) for a float array."""
+    result = np.full(len(values), np.nan)
+    if periods < len(values):
+        result[periods:] = values[:len(values) - periods]
+    return result
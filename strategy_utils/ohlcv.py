@@ -0,0 +1,128 @@
+"""
+Columnar OHLCV store: one append-only file per field, pair and timeframe.
+
+Reading the candle history again (json / feather) for every tool run or backtest
+parses and copies the whole file. The store keeps date (int64 ns) and open, high,
+low, close, volume (float64) as raw little endian arrays, read back through
+np.memmap: open / high / low / close / volume of dataframe() are read-only views on
+the files, only the date column is converted (UTC).
+
+    store = OHLCVStore('user_data/ohlcv')
+    store.append('BTC/USDT', '5m', dataframe)     # candles after the last stored one
+    store.dataframe('BTC/USDT', '5m')             # zero-copy prices
+
+MarketContextCache (strategy_utils.market_context) reads backtest / hyperopt
+informative candles from it. A candle history is imported with
+
+    python -m strategy_utils.ohlcv user_data/data/binance user_data/ohlcv 5m BTC/USDT ETH/USDT
+
+Appending writes the fields first and the dates last: the length of the date file
+is the number of complete candles, longer fields (crash while appending) are
+truncated on the next append.
+"""
+import sys
+from pathlib import Path
+from typing import Dict, Union
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from strategy_utils.align import date_keys
+
+FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+_DATE = np.dtype('<i8')
+_PRICE = np.dtype('<f8')
+
+
+class OHLCVStore:
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+
+    def _path(self, pair: str, timeframe: str) -> Path:
+        return self.directory / f"{pair.replace('/', '_').replace(':', '_')}-{timeframe}"
+
+    def length(self, pair: str, timeframe: str) -> int:
+        """Number of complete candles stored."""
+        path = self._path(pair, timeframe) / 'date'
+        return path.stat().st_size // _DATE.itemsize if path.exists() else 0
+
+    def _date(self, pair: str, timeframe: str, index: int):
+        length = self.length(pair, timeframe)
+        if length == 0:
+            return None
+        dates = np.memmap(self._path(pair, timeframe) / 'date', dtype=_DATE, mode='r', shape=(length,))
+        return pd.Timestamp(int(dates[index]), tz='UTC')
+
+    def first_date(self, pair: str, timeframe: str):
+        return self._date(pair, timeframe, 0)
+
+    def last_date(self, pair: str, timeframe: str):
+        return self._date(pair, timeframe, -1)
+
+    def append(self, pair: str, timeframe: str, dataframe: DataFrame) -> int:
+        """Append the candles of dataframe after the last stored one, returns their number."""
+        dates = date_keys(dataframe['date'])
+        if len(dates) > 1 and np.any(np.diff(dates) <= 0):
+            raise ValueError(f"{pair} {timeframe}: candle dates are not increasing")
+
+        path = self._path(pair, timeframe)
+        length = self.length(pair, timeframe)
+        start = 0
+        if length > 0:
+            last = self.last_date(pair, timeframe).value
+            start = int(np.searchsorted(dates, last, side='right'))
+        if start >= len(dates):
+            return 0
+
+        path.mkdir(parents=True, exist_ok=True)
+        for field in FIELDS:
+            values = dataframe[field].to_numpy(dtype=_PRICE)[start:]
+            with open(path / field, 'ab') as file:
+                file.truncate(length * _PRICE.itemsize)
+                file.write(np.ascontiguousarray(values).tobytes())
+        with open(path / 'date', 'ab') as file:
+            file.write(np.ascontiguousarray(dates[start:]).tobytes())
+        return len(dates) - start
+
+    def arrays(self, pair: str, timeframe: str) -> Dict[str, np.ndarray]:
+        """Read-only memmaps of date (int64 ns) and the OHLCV fields."""
+        length = self.length(pair, timeframe)
+        if length == 0:
+            arrays = {'date': np.empty(0, dtype=_DATE)}
+            arrays.update((field, np.empty(0, dtype=_PRICE)) for field in FIELDS)
+            return arrays
+        path = self._path(pair, timeframe)
+        arrays = {'date': np.memmap(path / 'date', dtype=_DATE, mode='r', shape=(length,))}
+        for field in FIELDS:
+            arrays[field] = np.memmap(path / field, dtype=_PRICE, mode='r', shape=(length,))
+        return arrays
+
+    def dataframe(self, pair: str, timeframe: str) -> DataFrame:
+        """Freqtrade style OHLCV dataframe, the price columns are views on the files."""
+        arrays = self.arrays(pair, timeframe)
+        columns = {'date': pd.Series(arrays.pop('date').view('M8[ns]')).dt.tz_localize('UTC')}
+        columns.update(arrays)
+        return DataFrame(columns, copy=False)
+
+
+def import_history(store: OHLCVStore, datadir: Union[str, Path], timeframe: str, pairs) -> Dict[str, int]:
+    """Append the freqtrade candle history of pairs to store, returns the candles added per pair."""
+    from freqtrade.data.history import load_pair_history
+
+    added = {}
+    for pair in pairs:
+        history = load_pair_history(pair=pair, timeframe=timeframe, datadir=Path(datadir))
+        added[pair] = store.append(pair, timeframe, history) if len(history) else 0
+    return added
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 5:
+        print('usage: python -m strategy_utils.ohlcv <datadir> <store directory> <timeframe> <pair> [pair ...]')
+        sys.exit(1)
+    datadir, directory, timeframe, *pairs = sys.argv[1:]
+    for pair, count in import_history(OHLCVStore(directory), datadir, timeframe, pairs).items():
+        print(f'{pair} {timeframe}: {count} candles added')
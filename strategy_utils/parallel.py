@@ -0,0 +1,262 @@
+"""
+Analyse the pairs of a new candle on several cores.
+
+Freqtrade analyses the whitelist pair after pair (populate_indicators, buy and sell
+trend) in IStrategy.analyze(). With ParallelAnalysisMixin and
+parallel_analysis_workers > 1, the pairs with a new candle are first analysed by a
+pool of worker processes, started once (forkserver, not a fork of the threaded bot)
+with their own instance of the strategy. Each job carries the candles of its pair and
+the informative candles the strategy asks for (informative_pairs()), served to the
+worker's strategy by SnapshotDataProvider. The numeric columns come back through one
+shared memory block per pair, the rest (date, tags) pickled. The serial loop of
+freqtrade then picks the finished frames up instead of analysing again.
+
+Only for strategies whose populate_* methods depend on the candles alone: state
+changed in the workers (caches, trailing buy states, ...) is not seen by the bot.
+Pairs not finished within parallel_analysis_timeout seconds, or anything going wrong,
+fall back to the serial analysis; the pool is disabled after
+parallel_analysis_max_failures failures in a row.
+
+    class NFI5MOHO_WIP(ParallelAnalysisMixin, IStrategy):
+        parallel_analysis_workers = 4
+"""
+import atexit
+import logging
+import multiprocessing
+import pickle
+import secrets
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from pandas import DataFrame
+
+logger = logging.getLogger(__name__)
+
+# strategy of a worker process, created by _init_worker
+_strategy = None
+
+# numpy kinds that go through shared memory: bool, int, uint, float
+_SHARED_KINDS = 'biuf'
+
+
+def export_dataframe(dataframe: DataFrame, block_name: str) -> bytes:
+    """
+    Numeric columns to a new shared memory block called block_name (none without
+    numeric columns), returns the pickled layout for import_dataframe().
+    """
+    layout: List[Tuple] = []
+    shared: List[np.ndarray] = []
+    size = 0
+    for name in dataframe.columns:
+        column = dataframe[name]
+        if isinstance(column.dtype, np.dtype) and column.dtype.kind in _SHARED_KINDS:
+            values = np.ascontiguousarray(column.to_numpy())
+            layout.append((name, 'shared', values.dtype.str, size))
+            shared.append(values)
+            size += values.nbytes
+        else:
+            layout.append((name, 'pickled', column, None))
+
+    if size > 0:
+        block = shared_memory.SharedMemory(name=block_name, create=True, size=size)
+        offset = 0
+        for values in shared:
+            block.buf[offset:offset + values.nbytes] = values.tobytes()
+            offset += values.nbytes
+        # the importing process unlinks the block, the tracker of this one must not
+        resource_tracker.unregister(block._name, 'shared_memory')
+        block.close()
+    return pickle.dumps((dataframe.index, len(dataframe), size > 0, layout), protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def import_dataframe(block_name: str, payload: bytes) -> DataFrame:
+    """DataFrame of export_dataframe(), the shared memory block is released."""
+    index, length, has_block, layout = pickle.loads(payload)
+    block = shared_memory.SharedMemory(name=block_name) if has_block else None
+    try:
+        columns = {}
+        for name, kind, value, offset in layout:
+            if kind == 'shared':
+                dtype = np.dtype(value)
+                columns[name] = np.frombuffer(block.buf, dtype=dtype, count=length, offset=offset).copy()
+            else:
+                columns[name] = value
+        return DataFrame(columns, index=index)
+    finally:
+        if block is not None:
+            block.close()
+            block.unlink()
+
+
+def release_block(block_name: str) -> None:
+    """Unlink a block which was never imported, if it was created."""
+    try:
+        block = shared_memory.SharedMemory(name=block_name)
+    except FileNotFoundError:
+        return
+    block.close()
+    block.unlink()
+
+
+class SnapshotDataProvider:
+    """The candles of one analysis, the data provider of the strategy in a worker."""
+
+    def __init__(self, frames: Dict[Tuple[str, str], DataFrame], timeframe: str,
+                 whitelist: Sequence[str], runmode):
+        self._frames = frames
+        self._timeframe = timeframe
+        self._whitelist = list(whitelist)
+        self.runmode = runmode
+
+    def ohlcv(self, pair: str, timeframe: Optional[str] = None, copy: bool = True, candle_type: str = '') -> DataFrame:
+        frame = self._frames.get((pair, timeframe or self._timeframe))
+        if frame is None:
+            return DataFrame()
+        return frame.copy() if copy else frame
+
+    def get_pair_dataframe(self, pair: str, timeframe: Optional[str] = None, candle_type: str = '') -> DataFrame:
+        return self.ohlcv(pair, timeframe)
+
+    def current_whitelist(self) -> List[str]:
+        return list(self._whitelist)
+
+
+def load_strategy(config: dict):
+    """The strategy of config, as freqtrade loads it, without a pool of its own."""
+    from freqtrade.resolvers import StrategyResolver
+
+    strategy = StrategyResolver.load_strategy(config)
+    strategy.parallel_analysis_workers = 0
+    strategy.ft_bot_start()
+    return strategy
+
+
+def _init_worker(loader: Callable[[dict], object], config: dict) -> None:
+    global _strategy
+    _strategy = loader(config)
+
+
+def _analyze_in_worker(pair: str, block_name: str, frames: Dict[Tuple[str, str], DataFrame],
+                       whitelist: List[str], timeframe: str, runmode) -> Tuple[str, bytes]:
+    strategy = _strategy
+    strategy.dp = SnapshotDataProvider(frames, timeframe, whitelist, runmode)
+    analyzed = strategy.serial_analyze_ticker(frames[(pair, timeframe)].copy(), {'pair': pair})
+    return pair, export_dataframe(analyzed, block_name)
+
+
+class ParallelAnalysisMixin:
+
+    # > 1: analyse the pairs of a new candle in that many processes (live / dry-run)
+    parallel_analysis_workers = 0
+    # seconds to wait for the workers, the pairs not finished are analysed one by one
+    parallel_analysis_timeout = 60.0
+    parallel_analysis_max_failures = 3
+
+    _parallel_frames: Dict[str, DataFrame] = {}
+    _parallel_pool = None
+    _parallel_failures = 0
+    # pair -> last candle analysed (IStrategy keeps its own map name-mangled)
+    _parallel_last_candle: Optional[Dict[str, object]] = None
+
+    def parallel_worker_config(self) -> Tuple[Callable[[dict], object], dict]:
+        """(loader, config): the workers create their strategy with loader(config)."""
+        return load_strategy, self.config
+
+    def parallel_ohlcv(self, pair: str) -> DataFrame:
+        candle_type = self.config.get('candle_type_def')
+        if candle_type is None:
+            return self.dp.ohlcv(pair, self.timeframe)
+        return self.dp.ohlcv(pair, self.timeframe, candle_type=candle_type)
+
+    def _pairs_to_analyze(self, pairs: List[str]) -> List[str]:
+        last_seen = self._parallel_last_candle or {}
+        pending = []
+        for pair in pairs:
+            dataframe = self.parallel_ohlcv(pair)
+            if len(dataframe) == 0:
+                continue
+            if not self.process_only_new_candles or last_seen.get(pair) != dataframe['date'].iat[-1]:
+                pending.append(pair)
+        return pending
+
+    def analyze(self, pairs: List[str]) -> None:
+        if (self.parallel_analysis_workers > 1 and self._parallel_failures < self.parallel_analysis_max_failures
+                and self.config['runmode'].value in ('live', 'dry_run')):
+            pending = self._pairs_to_analyze(pairs)
+            if len(pending) > 1:
+                self._parallel_frames = self._analyze_parallel(pending)
+        try:
+            super().analyze(pairs)
+        finally:
+            self._parallel_frames = {}
+
+    def _pool(self):
+        if self._parallel_pool is None:
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+            loader, config = self.parallel_worker_config()
+            self._parallel_pool = context.Pool(self.parallel_analysis_workers,
+                                               initializer=_init_worker, initargs=(loader, config))
+            atexit.register(self._parallel_pool.terminate)
+        return self._parallel_pool
+
+    def close_parallel_pool(self) -> None:
+        if self._parallel_pool is not None:
+            self._parallel_pool.terminate()
+            atexit.unregister(self._parallel_pool.terminate)
+            self._parallel_pool = None
+
+    def _analysis_jobs(self, pairs: List[str]) -> List[Tuple]:
+        whitelist = self.dp.current_whitelist()
+        analysed = set(pairs)
+        informative = [tuple(entry[:2]) for entry in self.informative_pairs()]
+        prefix = f'ftpa_{secrets.token_hex(4)}_'
+        jobs = []
+        for number, pair in enumerate(pairs):
+            frames = {(pair, self.timeframe): self.parallel_ohlcv(pair)}
+            for informative_pair, timeframe in informative:
+                # the informative candles of this pair and of pairs not analysed (BTC/USDT, ...)
+                if informative_pair == pair or informative_pair not in analysed:
+                    frames[(informative_pair, timeframe)] = self.dp.get_pair_dataframe(
+                        pair=informative_pair, timeframe=timeframe)
+            jobs.append((pair, f'{prefix}{number}', frames, whitelist, self.timeframe, self.config['runmode']))
+        return jobs
+
+    def _analyze_parallel(self, pairs: List[str]) -> Dict[str, DataFrame]:
+        frames = {}
+        pending: Dict[str, object] = {}
+        try:
+            jobs = self._analysis_jobs(pairs)
+            pool = self._pool()
+            pending = {job[1]: pool.apply_async(_analyze_in_worker, job) for job in jobs}
+            deadline = time.monotonic() + self.parallel_analysis_timeout
+            for block_name, result in list(pending.items()):
+                pair, payload = result.get(timeout=max(0.0, deadline - time.monotonic()))
+                frames[pair] = import_dataframe(block_name, payload)
+                del pending[block_name]
+            self._parallel_failures = 0
+        except Exception as e:
+            self._parallel_failures += 1
+            logger.warning(f"Parallel analysis failed ({self._parallel_failures} in a row), "
+                           f"analysing the remaining pairs one by one: {e!r}")
+            # no worker may still be writing a block when the rest are released
+            self.close_parallel_pool()
+        finally:
+            for block_name in pending:
+                release_block(block_name)
+        return frames
+
+    def serial_analyze_ticker(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+        return super().analyze_ticker(dataframe, metadata)
+
+    def analyze_ticker(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+        frame = self._parallel_frames.pop(metadata['pair'], None)
+        if (frame is None or len(frame) != len(dataframe)
+                or len(frame) == 0 or frame['date'].iat[-1] != dataframe['date'].iat[-1]):
+            frame = self.serial_analyze_ticker(dataframe, metadata)
+        if self._parallel_last_candle is None:
+            self._parallel_last_candle = {}
+        self._parallel_last_candle[metadata['pair']] = dataframe['date'].iat[-1]
+        return frame
@@ -0,0 +1,126 @@
+"""
+Float value per trade which survives a restart of the bot.
+
+A trade is known by its id and its open date (trade_key()): the ids of a dry-run
+database start at 1 again after a reset, an old record must not be taken for the new
+trade with the same id. The values are appended to a file as 24 byte records (trade
+id, open date, value), a deleted trade is a record with the negated id. The file is
+read through mmap on first use (the last record of a trade wins) and rewritten with
+the live trades only once the dead records outnumber them.
+
+    store = PersistentFloatStore(user_data_dir / 'stoploss.bin')
+    store.retain(trade_key(trade) for trade in Trade.get_open_trades())   # bot_start
+    store[trade_key(trade)] = stop
+    store.get(trade_key(trade))
+    store.pop(trade_key(trade), None)      # trade closed
+"""
+import mmap
+import os
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+import numpy as np
+
+_RECORD = np.dtype([('id', '<i8'), ('opened', '<i8'), ('value', '<f8')])
+
+# (trade id, open date in milliseconds)
+TradeKey = Tuple[int, int]
+
+
+def trade_key(trade) -> TradeKey:
+    return trade.id, int(trade.open_date_utc.timestamp() * 1000)
+
+
+class PersistentFloatStore:
+
+    def __init__(self, path: Union[str, Path], compact_ratio: int = 4, min_records: int = 1024):
+        self.path = Path(path)
+        self.compact_ratio = compact_ratio
+        self.min_records = min_records
+        # trade id -> (open date, value)
+        self._values: Optional[Dict[int, Tuple[int, float]]] = None
+        self._records = 0
+
+    def _load(self) -> Dict[int, Tuple[int, float]]:
+        if self._values is not None:
+            return self._values
+
+        values: Dict[int, Tuple[int, float]] = {}
+        self._records = 0
+        if self.path.exists() and self.path.stat().st_size >= _RECORD.itemsize:
+            with open(self.path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                # a partly written last record (crash while appending) is ignored
+                count = len(view) // _RECORD.itemsize
+                records = np.frombuffer(view, dtype=_RECORD, count=count)
+                for trade_id, opened, value in zip(records['id'].tolist(), records['opened'].tolist(),
+                                                   records['value'].tolist()):
+                    if trade_id < 0:
+                        values.pop(-trade_id, None)
+                    else:
+                        values[trade_id] = (opened, value)
+                del records
+                self._records = count
+        self._values = values
+        return values
+
+    def _append(self, trade_id: int, opened: int, value: float) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'ab') as file:
+            file.truncate(self._records * _RECORD.itemsize)
+            file.write(np.array([(trade_id, opened, value)], dtype=_RECORD).tobytes())
+        self._records += 1
+        if self._records > max(self.min_records, self.compact_ratio * len(self._values)):
+            self.compact()
+
+    def compact(self) -> None:
+        """Rewrite the file with one record per live trade."""
+        values = self._load()
+        records = np.array([(trade_id, opened, value) for trade_id, (opened, value) in values.items()],
+                           dtype=_RECORD)
+        temporary = self.path.with_name(self.path.name + '.tmp')
+        with open(temporary, 'wb') as file:
+            file.write(records.tobytes())
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, self.path)
+        self._records = len(records)
+
+    def retain(self, keys: Iterable[TradeKey]) -> None:
+        """Forget every trade but keys (the open trades, e.g. closed while the bot was down)."""
+        values = self._load()
+        keep = set(keys)
+        stale = [trade_id for trade_id, (opened, _) in values.items() if (trade_id, opened) not in keep]
+        if stale:
+            for trade_id in stale:
+                del values[trade_id]
+            self.compact()
+
+    def get(self, key: TradeKey, default: Optional[float] = None) -> Optional[float]:
+        trade_id, opened = key
+        entry = self._load().get(trade_id)
+        return entry[1] if entry is not None and entry[0] == opened else default
+
+    def __contains__(self, key: TradeKey) -> bool:
+        return self.get(key) is not None
+
+    def __setitem__(self, key: TradeKey, value: float) -> None:
+        trade_id, opened = key
+        values = self._load()
+        entry = (opened, float(value))
+        if values.get(trade_id) == entry:
+            return
+        values[trade_id] = entry
+        self._append(trade_id, opened, entry[1])
+
+    def pop(self, key: TradeKey, default: Optional[float] = None) -> Optional[float]:
+        """The value of key, default if not stored; any record of the trade id is dropped."""
+        value = self.get(key, default)
+        trade_id, _ = key
+        values = self._load()
+        if trade_id in values:
+            del values[trade_id]
+            self._append(-trade_id, 0, 0.0)
+        return value
+
+    def __len__(self) -> int:
+        return len(self._load())
@@ -0,0 +1,100 @@
+"""
+Rolling window results shared between the indicators built on one dataframe.
+"""
+from typing import Callable, Dict, Sequence, Tuple
+
+import numpy as np
+from pandas import DataFrame, Series
+
+
+class RollingCache:
+    """
+    Computes every (column, window, reducer) rolling pass of a dataframe once.
+
+        rolling = RollingCache(dataframe)
+        rolling.max('open', 24)   # computed
+        rolling.max('open', 24)   # reused
+
+    Only valid while the referenced columns are not modified, create one per
+    populate_* call.
+    """
+
+    def __init__(self, dataframe: DataFrame):
+        self.dataframe = dataframe
+        self._results: Dict[Tuple[str, int, str], Series] = {}
+
+    def get(self, column: str, window: int, reducer: str) -> Series:
+        key = (column, window, reducer)
+        result = self._results.get(key)
+        if result is None:
+            result = getattr(self.dataframe[column].rolling(window), reducer)()
+            self._results[key] = result
+        return result
+
+    def max(self, column: str, window: int) -> Series:
+        return self.get(column, window, 'max')
+
+    def min(self, column: str, window: int) -> Series:
+        return self.get(column, window, 'min')
+
+    def mean(self, column: str, window: int) -> Series:
+        return self.get(column, window, 'mean')
+
+
+def _rolling_extreme_multi(values: np.ndarray, windows: Sequence[int], reduce: Callable) -> np.ndarray:
+    """
+    Sparse table over power of two windows: level j holds the extreme of the last 2**j
+    values, any window w is the extreme of two overlapping level log2(w) entries.
+    O(n log(max window)) for all windows together.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    result = np.full((len(windows), n), np.nan)
+    levels = [values]
+
+    for row, window in enumerate(windows):
+        if window < 1:
+            raise ValueError(f"Rolling window must be >= 1, got {window}")
+        level = window.bit_length() - 1
+        while len(levels) <= level:
+            span = 1 << (len(levels) - 1)
+            previous = levels[-1]
+            current = np.full(n, np.nan)
+            current[span:] = reduce(previous[span:], previous[:-span])
+            levels.append(current)
+        if n < window:
+            continue
+        table = levels[level]
+        offset = window - (1 << level)
+        result[row, window - 1:] = reduce(table[window - 1:], table[window - 1 - offset:n - offset])
+
+    return result
+
+
+def rolling_max_multi(values: np.ndarray, windows: Sequence[int]) -> np.ndarray:
+    """
+    Rolling max for several windows at once, one row per window.
+    Same values as Series.rolling(window).max(): NaN until the window is full or while it holds a NaN.
+    """
+    return _rolling_extreme_multi(values, windows, np.maximum)
+
+
+def rolling_min_multi(values: np.ndarray, windows: Sequence[int]) -> np.ndarray:
+    """Rolling min for several windows at once, see rolling_max_multi."""
+    return _rolling_extreme_multi(values, windows, np.minimum)
+
+
+def running_min_since(values: Series, starts: Series) -> Series:
+    """
+    Running min of values since the last start row, O(n).
+
+    A start row takes its own value, the following rows the min of the values after
+    it: row r of a segment starting at s gets min(values[s + 1 .. r]). Rows before the
+    first start behave as if row 0 was a start.
+    """
+    starts = starts.astype(bool)
+    starts.iloc[:1] = True
+    segments = starts.cumsum()
+    result = values.where(~starts, np.inf).groupby(segments).cummin()
+
+    return result.where(~starts, values)
@@ -0,0 +1,154 @@
+"""
+Entry signals for many parameter candidates at once, scored without a backtest each.
+
+Most buy parameters are thresholds on columns populate_indicators already computed
+(macd > macdv_threshold, EWO > ewo_high, close < ma_buy * low_offset). A SignalGrid
+holds those comparisons; signals(candidates) broadcasts them against k candidate
+values per parameter into a (k, candles) boolean array, and score_signals() sums the
+forward return of every entry per candidate, over all pairs, in chunks of candidates.
+
+    grid = strategy.entry_signal_grid(dataframe, {'pair': pair})
+    candidates = sample_candidates(strategy, grid.parameters, 5000)
+    scores = score_signals([(grid, forward_returns(dataframe, horizon=12))], candidates)
+    scores.sort_values('profit_total', ascending=False).head()
+
+The score is a screen: trades exit after a fixed number of candles, ignoring roi,
+stoploss, exit signals and open trade limits. Confirm the best candidates with a
+regular backtest / hyperopt restricted to them.
+"""
+import operator
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from pandas import DataFrame
+
+_OPERATORS = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+}
+
+# (values, operator, parameter) or (values, operator, parameter, factor)
+Condition = Tuple
+
+
+class SignalGrid:
+    """
+    Entry where base and any branch hold. A branch is a fixed mask and conditions
+    (values, operator, parameter name), e.g. (dataframe['EWO'], '>', 'ewo_high'), or
+    with a factor column the threshold is scaled by, written as in the strategy:
+    (dataframe['close'], '<', 'low_offset', dataframe['ma_buy']) is
+    close < ma_buy * low_offset, with the same rounding as populate_entry_trend.
+    """
+
+    def __init__(self, base=None):
+        self.base = None if base is None else np.asarray(base, dtype=bool)
+        self.branches: List[Tuple[Optional[np.ndarray], List[Tuple[np.ndarray, str, str, Optional[np.ndarray]]]]] = []
+
+    def branch(self, *conditions: Condition, mask=None) -> 'SignalGrid':
+        checked = []
+        for values, op, parameter, *factor in conditions:
+            if op not in _OPERATORS:
+                raise ValueError(f"Unknown operator '{op}', use one of {', '.join(_OPERATORS)}")
+            factor = np.asarray(factor[0], dtype=np.float64) if factor else None
+            checked.append((np.asarray(values, dtype=np.float64), op, parameter, factor))
+        self.branches.append((None if mask is None else np.asarray(mask, dtype=bool), checked))
+        return self
+
+    @property
+    def parameters(self) -> Tuple[str, ...]:
+        names = []
+        for _, conditions in self.branches:
+            for _, _, parameter, _ in conditions:
+                if parameter not in names:
+                    names.append(parameter)
+        return tuple(names)
+
+    def signals(self, candidates: Mapping[str, np.ndarray]) -> np.ndarray:
+        """(candidates, candles) entries, candidates: one array of values per parameter."""
+        count = len(next(iter(candidates.values())))
+        length = len(self.base) if self.base is not None else len(self.branches[0][1][0][0])
+        signals = np.zeros((count, length), dtype=bool)
+        for mask, conditions in self.branches:
+            branch = np.ones((count, length), dtype=bool)
+            if mask is not None:
+                branch &= mask
+            for values, op, parameter, factor in conditions:
+                thresholds = np.asarray(candidates[parameter], dtype=np.float64)[:, None]
+                if factor is not None:
+                    thresholds = factor[None, :] * thresholds
+                branch &= _OPERATORS[op](values[None, :], thresholds)
+            signals |= branch
+        if self.base is not None:
+            signals &= self.base
+        return signals
+
+
+def forward_returns(dataframe: DataFrame, horizon: int, fee: float = 0.001) -> np.ndarray:
+    """Return of entering at the next open and leaving at the close `horizon` candles later."""
+    open_rate = dataframe['open'].to_numpy(dtype=np.float64)
+    close = dataframe['close'].to_numpy(dtype=np.float64)
+    returns = np.full(len(dataframe), np.nan)
+    if len(dataframe) > horizon:
+        entry = open_rate[1:len(dataframe) - horizon + 1]
+        exit_rate = close[horizon:]
+        returns[:len(entry)] = exit_rate * (1 - fee) / (entry * (1 + fee)) - 1
+    return returns
+
+
+def score_signals(pairs: Sequence[Tuple[SignalGrid, np.ndarray]], candidates: Mapping[str, np.ndarray],
+                  chunk: int = 256, only_new: bool = True) -> DataFrame:
+    """
+    Trades, wins, profit_total and profit_mean per candidate over (grid, forward returns)
+    of every pair. only_new: a signal right after a signal isn't a new trade.
+    """
+    candidates = {name: np.asarray(values) for name, values in candidates.items()}
+    count = len(next(iter(candidates.values())))
+    trades = np.zeros(count, dtype=np.int64)
+    wins = np.zeros(count, dtype=np.int64)
+    profit = np.zeros(count)
+    for start in range(0, count, chunk):
+        part = {name: values[start:start + chunk] for name, values in candidates.items()}
+        rows = slice(start, start + chunk)
+        for grid, returns in pairs:
+            signals = grid.signals(part)
+            if only_new:
+                signals[:, 1:] &= ~signals[:, :-1]
+            signals &= ~np.isnan(returns)
+            gains = np.where(signals, np.nan_to_num(returns), 0.0)
+            trades[rows] += signals.sum(axis=1)
+            wins[rows] += (signals & (returns > 0)).sum(axis=1)
+            profit[rows] += gains.sum(axis=1)
+
+    scores = DataFrame(candidates)
+    scores['trades'] = trades
+    scores['wins'] = wins
+    scores['profit_total'] = profit
+    scores['profit_mean'] = np.divide(profit, trades, out=np.full(count, np.nan), where=trades > 0)
+    return scores
+
+
+def candidate_grid(**values: Sequence) -> Dict[str, np.ndarray]:
+    """Every combination of the given parameter values."""
+    names = list(values)
+    mesh = np.meshgrid(*(np.asarray(values[name]) for name in names), indexing='ij')
+    return {name: axis.ravel() for name, axis in zip(names, mesh)}
+
+
+def sample_candidates(strategy, names: Sequence[str], count: int, seed: int = 0) -> Dict[str, np.ndarray]:
+    """count random values per hyperopt parameter of strategy (IntParameter / DecimalParameter)."""
+    rng = np.random.default_rng(seed)
+    candidates = {}
+    for name in names:
+        parameter = getattr(strategy, name)
+        if isinstance(parameter.low, (int, np.integer)) and isinstance(parameter.high, (int, np.integer)):
+            candidates[name] = rng.integers(parameter.low, parameter.high + 1, size=count)
+        else:
+            values = rng.uniform(parameter.low, parameter.high, size=count)
+            candidates[name] = np.round(values, getattr(parameter, 'decimals', 3))
+    return candidates
+
+
+def best_candidates(scores: DataFrame, by: str = 'profit_total', min_trades: int = 1, top: int = 10) -> DataFrame:
+    return scores[scores['trades'] >= min_trades].sort_values(by, ascending=False).head(top)
@@ -0,0 +1,47 @@
+"""
+Last analyzed candle of a pair as a read-only mapping, for the trade callbacks.
+
+custom_stoploss / custom_exit / confirm_trade_* run every few seconds per open trade,
+while the analyzed dataframe only changes once per candle. LastCandleCache builds the
+row once per candle and pair instead of a new `dataframe.iloc[-1].squeeze()` Series
+on every call.
+"""
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
+
+
+class LastCandleCache:
+    """
+        last_candles = LastCandleCache()
+        last_candle = self.last_candles.get(self.dp, pair, self.timeframe)
+        if last_candle is not None:
+            last_candle['close']
+
+    The snapshot is rebuilt when the last candle date or the analysis time of the
+    dataframe changes. Returns None for an empty dataframe.
+    """
+
+    def __init__(self):
+        self._snapshots: Dict[Tuple[str, str], Tuple[object, object, Mapping]] = {}
+
+    def get(self, dp, pair: str, timeframe: str) -> Optional[Mapping]:
+        dataframe, analyzed = dp.get_analyzed_dataframe(pair, timeframe)
+        if len(dataframe) < 1:
+            return None
+
+        key = (pair, timeframe)
+        last_date = dataframe['date'].iat[-1]
+        cached = self._snapshots.get(key)
+        if cached is not None and cached[0] == last_date and cached[1] == analyzed:
+            return cached[2]
+
+        snapshot = MappingProxyType({column: dataframe[column].iat[-1] for column in dataframe.columns})
+        self._snapshots[key] = (last_date, analyzed, snapshot)
+        return snapshot
+
+    def clear(self, pair: Optional[str] = None) -> None:
+        if pair is None:
+            self._snapshots.clear()
+        else:
+            for key in [key for key in self._snapshots if key[0] == pair]:
+                del self._snapshots[key]
@@ -0,0 +1,106 @@
+"""
+Per-trade / per-pair state which doesn't grow for the lifetime of the bot.
+
+Strategies kept callback state in class level dicts keyed by trade id or pair, which
+are never cleaned up for closed trades or pairs leaving the whitelist. BoundedStore is
+a dict which drops the least recently used entries above max_entries and the entries
+not used for ttl seconds, and logs its counters every report_interval seconds.
+
+    custom_info = BoundedStore('custom_info', max_entries=1000, ttl=24 * 3600)
+
+    def order_filled(self, pair, trade, order, current_time, **kwargs):
+        if not trade.is_open:
+            self.custom_info.pop(trade.id, None)
+"""
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class BoundedStore(MutableMapping):
+
+    def __init__(self, name: str, max_entries: int = 1000, ttl: Optional[float] = None,
+                 report_interval: Optional[float] = 3600, clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.report_interval = report_interval
+        self._clock = clock
+        self._entries: 'OrderedDict[Hashable, list]' = OrderedDict()  # key -> [value, last use]
+        self._reported = clock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _expire(self, now: float) -> None:
+        if self.ttl is None:
+            return
+        while self._entries:
+            key, (_, used) = next(iter(self._entries.items()))
+            if now - used <= self.ttl:
+                break
+            del self._entries[key]
+            self.expirations += 1
+
+    def _touch(self, key: Hashable) -> Optional[list]:
+        now = self._clock()
+        self._expire(now)
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry[1] = now
+            self._entries.move_to_end(key)
+        return entry
+
+    def __getitem__(self, key: Hashable) -> Any:
+        entry = self._touch(key)
+        if entry is None:
+            self.misses += 1
+            raise KeyError(key)
+        self.hits += 1
+        return entry[0]
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        entry = self._touch(key)
+        if entry is not None:
+            entry[0] = value
+        else:
+            self._entries[key] = [value, self._clock()]
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        self._report()
+
+    def __delitem__(self, key: Hashable) -> None:
+        del self._entries[key]
+
+    def __contains__(self, key: object) -> bool:
+        return self._touch(key) is not None
+
+    def __iter__(self) -> Iterator[Hashable]:
+        self._expire(self._clock())
+        return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+        }
+
+    def _report(self) -> None:
+        if self.report_interval is None:
+            return
+        now = self._clock()
+        if now - self._reported >= self.report_interval:
+            self._reported = now
+            logger.info(f"{self.name}: " + ', '.join(f"{key} {value}" for key, value in self.stats().items()))
@@ -0,0 +1,430 @@
+"""
+Incremental (streaming) indicators for strategies running with process_only_new_candles.
+
+Every indicator keeps O(1) state per pair and consumes one candle per update() call,
+following the seeding and smoothing of the talib C code, so a full pass over a
+dataframe gives the talib values for that dataframe: SMA and RollingMax/Min (pandas
+rolling) exactly, EMA, RSI, ATR and BollingerBands (qtpylib) within a relative 1e-9
+of float rounding, the talib build may fuse multiply-adds (tests/test_streaming.py).
+
+IncrementalIndicators drives a set of these per pair: on a new candle only the new
+rows are pushed through the states, anything unexpected (first call, gap in the
+dates, more new candles than max_new_candles) falls back to a full recompute.
+
+Note: once streaming, the states keep the history from the first full recompute,
+while talib re-seeds on the (shifting) start of the dataframe every call. Seeded
+indicators (EMA, RSI, ATR) therefore converge to, but are not bit-identical with,
+a talib recompute of the same window. Windowed ones (SMA, rolling max/min) are.
+"""
+import math
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Callable, Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import talib
+from pandas import DataFrame
+
+nan = float('nan')
+
+
+class EMA:
+    """talib.EMA: seeded with the SMA of the first period values, k = 2 / (period + 1)."""
+    __slots__ = ('period', 'k', 'count', 'total', 'value')
+
+    def __init__(self, period: int):
+        self.period = period
+        self.k = 2.0 / (period + 1)
+        self.count = 0
+        self.total = 0.0
+        self.value = nan
+
+    def update(self, x: float) -> float:
+        if self.count < self.period:
+            if self.count == 0 and math.isnan(x):
+                # talib skips leading NaN
+                return nan
+            self.total += x
+            self.count += 1
+            if self.count == self.period:
+                self.value = self.total / self.period
+            return self.value
+        self.value = ((x - self.value) * self.k) + self.value
+        return self.value
+
+
+class SMA:
+    """talib.SMA, with the same running-sum order of operations."""
+    __slots__ = ('period', 'window', 'total')
+
+    def __init__(self, period: int):
+        self.period = period
+        self.window = deque()
+        self.total = 0.0
+
+    def update(self, x: float) -> float:
+        if not self.window and math.isnan(x):
+            return nan
+        self.window.append(x)
+        self.total += x
+        if len(self.window) < self.period:
+            return nan
+        value = self.total
+        self.total -= self.window.popleft()
+        return value / self.period
+
+
+class RSI:
+    """talib.RSI: Wilder smoothing of the average gain and loss."""
+    __slots__ = ('period', 'prev', 'count', 'gain', 'loss')
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.prev = None
+        self.count = 0
+        self.gain = 0.0
+        self.loss = 0.0
+
+    def _value(self) -> float:
+        total = self.gain + self.loss
+        if -1e-14 < total < 1e-14:
+            return 0.0
+        return 100.0 * (self.gain / total)
+
+    def update(self, x: float) -> float:
+        if self.prev is None:
+            if not math.isnan(x):
+                self.prev = x
+            return nan
+        diff = x - self.prev
+        self.prev = x
+        if self.count < self.period:
+            if diff < 0:
+                self.loss -= diff
+            else:
+                self.gain += diff
+            self.count += 1
+            if self.count < self.period:
+                return nan
+        else:
+            self.loss *= (self.period - 1)
+            self.gain *= (self.period - 1)
+            if diff < 0:
+                self.loss -= diff
+            else:
+                self.gain += diff
+        self.loss /= self.period
+        self.gain /= self.period
+        return self._value()
+
+
+class ATR:
+    """talib.ATR: SMA of the first period true ranges, then Wilder smoothing."""
+    __slots__ = ('period', 'prev_close', 'count', 'total', 'value')
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.prev_close = None
+        self.count = 0
+        self.total = 0.0
+        self.value = nan
+
+    def update(self, high: float, low: float, close: float) -> float:
+        if self.prev_close is None:
+            if not (math.isnan(high) or math.isnan(low) or math.isnan(close)):
+                self.prev_close = close
+            return nan
+        true_range = high - low
+        range_high = abs(self.prev_close - high)
+        if range_high > true_range:
+            true_range = range_high
+        range_low = abs(low - self.prev_close)
+        if range_low > true_range:
+            true_range = range_low
+        self.prev_close = close
+
+        if self.count < self.period:
+            self.total += true_range
+            self.count += 1
+            if self.count == self.period:
+                self.value = self.total / self.period
+            return self.value
+        self.value = ((self.value * (self.period - 1)) + true_range) / self.period
+        return self.value
+
+
+class _RollingExtreme(ABC):
+    """Monotonic deque, same output as Series.rolling(window).max() / .min()."""
+    __slots__ = ('window', 'index', 'last_nan', 'candidates')
+
+    def __init__(self, window: int):
+        self.window = window
+        self.index = -1
+        self.last_nan = -window
+        self.candidates = deque()
+
+    @abstractmethod
+    def _dominates(self, new: float, old: float) -> bool:
+        """Whether new replaces old as a candidate for the extreme."""
+
+    def update(self, x: float) -> float:
+        self.index += 1
+        candidates = self.candidates
+        if math.isnan(x):
+            self.last_nan = self.index
+        else:
+            while candidates and self._dominates(x, candidates[-1][1]):
+                candidates.pop()
+            candidates.append((self.index, x))
+        while candidates and candidates[0][0] <= self.index - self.window:
+            candidates.popleft()
+        if self.index < self.window - 1 or self.last_nan > self.index - self.window:
+            return nan
+        return candidates[0][1]
+
+
+class RollingMax(_RollingExtreme):
+    __slots__ = ()
+
+    def _dominates(self, new: float, old: float) -> bool:
+        return new >= old
+
+
+class RollingMin(_RollingExtreme):
+    __slots__ = ()
+
+    def _dominates(self, new: float, old: float) -> bool:
+        return new <= old
+
+
+class BollingerBands:
+    """
+    qtpylib.bollinger_bands (min_periods=1, ddof=1), returns (lower, mid, upper).
+    Running mean / sum of squared deviations, equal to pandas up to float rounding.
+    """
+    __slots__ = ('window', 'stds', 'values', 'nobs', 'mean', 'ssqdm')
+
+    def __init__(self, window: int = 20, stds: float = 2):
+        self.window = window
+        self.stds = stds
+        self.values = deque()
+        self.nobs = 0
+        self.mean = 0.0
+        self.ssqdm = 0.0
+
+    def update(self, x: float) -> Tuple[float, float, float]:
+        values = self.values
+        values.append(x)
+        if not math.isnan(x):
+            self._add(x)
+        if len(values) > self.window:
+            old = values.popleft()
+            if not math.isnan(old):
+                self._remove(old)
+        if self.nobs == 0:
+            return nan, nan, nan
+        if self.nobs < 2:
+            return nan, self.mean, nan
+        std = math.sqrt(max(self.ssqdm, 0.0) / (self.nobs - 1)) * self.stds
+        return self.mean - std, self.mean, self.mean + std
+
+    def _add(self, x: float) -> None:
+        self.nobs += 1
+        delta = x - self.mean
+        self.mean += delta / self.nobs
+        self.ssqdm += delta * (x - self.mean)
+
+    def _remove(self, x: float) -> None:
+        self.nobs -= 1
+        if self.nobs == 0:
+            self.mean = 0.0
+            self.ssqdm = 0.0
+            return
+        delta = x - self.mean
+        self.mean -= delta / self.nobs
+        self.ssqdm -= delta * (x - self.mean)
+
+
+class Formula:
+    """Stateless combination of other values of the same candle, e.g. the MACD-V ratio."""
+    __slots__ = ('func',)
+
+    def __init__(self, func: Callable[..., float]):
+        self.func = func
+
+    def update(self, *values: float) -> float:
+        return self.func(*values)
+
+
+class Indicator:
+    """
+    One output (or a tuple of outputs) of the engine.
+        Indicator('ema_200', EMA, 'close', 200)
+        Indicator(('bb_lower', 'bb_mid', 'bb_upper'), BollingerBands, 'close', 20, 2)
+        Indicator('ratio', Formula, ('ema_fast', 'atr'), lambda ema, atr: ema / atr)
+    Inputs are dataframe columns or outputs of indicators defined before this one.
+    """
+    __slots__ = ('outputs', 'kind', 'inputs', 'args')
+
+    def __init__(self, outputs: Union[str, Sequence[str]], kind: type, inputs: Union[str, Sequence[str]], *args):
+        self.outputs = (outputs,) if isinstance(outputs, str) else tuple(outputs)
+        self.kind = kind
+        self.inputs = (inputs,) if isinstance(inputs, str) else tuple(inputs)
+        self.args = args
+
+
+class _PairState:
+    __slots__ = ('states', 'last_date', 'candle_delta', 'outputs')
+
+    def __init__(self, states, last_date, candle_delta, outputs):
+        self.states = states
+        self.last_date = last_date
+        self.candle_delta = candle_delta
+        self.outputs = outputs
+
+
+class IncrementalIndicators:
+    """
+    Per pair incremental evaluation of a list of Indicators.
+
+        engine = IncrementalIndicators([Indicator('rsi', RSI, 'close', 14)])
+        for name, values in engine.update(metadata['pair'], dataframe).items():
+            dataframe[name] = values
+    """
+
+    def __init__(self, indicators: Sequence[Indicator], max_new_candles: int = 10):
+        self.indicators = list(indicators)
+        self.max_new_candles = max_new_candles
+        self.outputs = [name for indicator in self.indicators for name in indicator.outputs]
+        self.columns = []
+        for indicator in self.indicators:
+            for name in indicator.inputs:
+                if name not in self.outputs and name not in self.columns:
+                    self.columns.append(name)
+        self._pairs: Dict[str, _PairState] = {}
+
+    def reset(self, pair: Optional[str] = None) -> None:
+        if pair is None:
+            self._pairs.clear()
+        else:
+            self._pairs.pop(pair, None)
+
+    def update(self, pair: str, dataframe: DataFrame) -> Dict[str, np.ndarray]:
+        n = len(dataframe)
+        if n == 0:
+            return {name: np.empty(0) for name in self.outputs}
+
+        dates = dataframe['date']
+        cached = self._pairs.get(pair)
+        new_candles = self._new_candles(cached, dates)
+
+        if new_candles is None:
+            states = [indicator.kind(*indicator.args) for indicator in self.indicators]
+            outputs = self._advance(states, dataframe, 0)
+            candle_delta = dates.iat[-1] - dates.iat[-2] if n > 1 else None
+            self._pairs[pair] = _PairState(states, dates.iat[-1], candle_delta, outputs)
+            return outputs
+
+        keep = n - new_candles
+        if new_candles == 0:
+            return {name: values[-n:] for name, values in cached.outputs.items()}
+
+        new = self._advance(cached.states, dataframe, keep)
+        cached.outputs = {
+            name: np.concatenate((cached.outputs[name][len(cached.outputs[name]) - keep:], new[name]))
+            for name in self.outputs
+        }
+        cached.last_date = dates.iat[-1]
+        return cached.outputs
+
+    def _new_candles(self, cached: Optional[_PairState], dates) -> Optional[int]:
+        """Number of candles after the last processed one, None when a full recompute is needed."""
+        if cached is None or cached.candle_delta is None:
+            return None
+        n = len(dates)
+        stored = len(next(iter(cached.outputs.values()))) if cached.outputs else 0
+        for new_candles in range(min(self.max_new_candles, n - 1) + 1):
+            if dates.iat[n - 1 - new_candles] != cached.last_date:
+                continue
+            if n - new_candles > stored:
+                return None
+            # gap in the new candles: the states would skip candles
+            for i in range(n - new_candles, n):
+                if dates.iat[i] - dates.iat[i - 1] != cached.candle_delta:
+                    return None
+            return new_candles
+        return None
+
+    def _advance(self, states: list, dataframe: DataFrame, start: int) -> Dict[str, np.ndarray]:
+        """Push rows start.. of the dataframe through the states, return the new output rows."""
+        columns = {name: dataframe[name].to_numpy(dtype=np.float64)[start:] for name in self.columns}
+        size = len(dataframe) - start
+        outputs = {name: np.empty(size) for name in self.outputs}
+        plan = [
+            (state, indicator.inputs, indicator.outputs, len(indicator.outputs) == 1)
+            for state, indicator in zip(states, self.indicators)
+        ]
+
+        for i in range(size):
+            row = {name: values[i] for name, values in columns.items()}
+            for state, inputs, names, single in plan:
+                value = state.update(*[row[name] for name in inputs])
+                if single:
+                    row[names[0]] = value
+                else:
+                    row.update(zip(names, value))
+            for name, values in outputs.items():
+                values[i] = row[name]
+
+        return outputs
+
+
+class FormingFastK:
+    """
+    talib.STOCHF fastk of the candle still forming, as if appended to the analyzed
+    dataframe of the pair:
+
+        df = dataframe._append(forming_candle)
+        ta.STOCHF(df, fastk_period, fastd_period)['fastk'].iat[-1]
+
+    fastk only looks at the last fastk_period candles, so talib runs on the last
+    candles needed for its lookback plus the forming one. Those are kept per pair and
+    refreshed once per candle: every call is O(fastk_period) instead of a copy and a
+    full recompute of the dataframe, with the exact value of the talib build in use.
+    """
+
+    def __init__(self, fastk_period: int = 5, fastd_period: int = 3):
+        self.fastk_period = fastk_period
+        self.fastd_period = fastd_period
+        self.lookback = fastk_period - 1 + fastd_period - 1
+        self._pairs: Dict[Tuple[str, str], Tuple[object, object, np.ndarray]] = {}
+
+    def get(self, dp, pair: str, timeframe: str, high: float, low: float, close: float) -> float:
+        dataframe, analyzed = dp.get_analyzed_dataframe(pair, timeframe)
+        if len(dataframe) < 1:
+            return nan
+
+        key = (pair, timeframe)
+        last_date = dataframe['date'].iat[-1]
+        cached = self._pairs.get(key)
+        if cached is None or cached[0] != last_date or cached[1] != analyzed:
+            # one extra column for the forming candle
+            width = min(len(dataframe), self.lookback)
+            candles = np.empty((3, width + 1))
+            for row, column in enumerate(('high', 'low', 'close')):
+                candles[row, :-1] = dataframe[column].to_numpy(dtype=np.float64)[len(dataframe) - width:]
+            cached = (last_date, analyzed, candles)
+            self._pairs[key] = cached
+
+        candles = cached[2]
+        candles[:, -1] = (high, low, close)
+        fastk, _ = talib.STOCHF(candles[0], candles[1], candles[2], fastk_period=self.fastk_period,
+                                fastd_period=self.fastd_period, fastd_matype=0)
+        return float(fastk[-1])
+
+    def clear(self, pair: Optional[str] = None) -> None:
+        if pair is None:
+            self._pairs.clear()
+        else:
+            for key in [key for key in self._pairs if key[0] == pair]:
+                del self._pairs[key]
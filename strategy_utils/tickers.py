@@ -0,0 +1,102 @@
+"""
+One fetch_tickers per bot loop instead of one ticker request per pair.
+
+dp.ticker(pair) is a request to the exchange for every pair analysed, which adds up
+on exchanges with a strict rate limit (kucoin). TickerSnapshot fetches the tickers
+of all pairs at once and serves them for ttl seconds. Pairs missing from the
+snapshot fall back to dp.ticker(pair). An exchange without fetchTickers switches
+to dp.ticker(pair) for good; any other error (network, rate limit) keeps the last
+snapshot and fetches again after ttl seconds. A snapshot older than max_age seconds
+(default 5 * ttl) is dropped, every pair then asks dp.ticker(pair) until a fetch
+succeeds again, so a rate-limited exchange doesn't serve minutes old prices.
+
+    tickers = TickerSnapshot(ttl=3)
+    price = self.tickers.last(self.dp, pair)
+
+fetch_tickers(dp) can be replaced, e.g. by a fake exchange in a test.
+"""
+import logging
+import time
+from typing import Callable, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TickersNotSupported(Exception):
+    """The exchange can't fetch all tickers at once."""
+
+
+def exchange_tickers(dp) -> Mapping[str, Mapping]:
+    # the DataProvider has no public call for all tickers, ask its exchange
+    exchange = dp._exchange
+    if not exchange.exchange_has('fetchTickers'):
+        raise TickersNotSupported(f"{exchange.name} has no fetchTickers")
+    return exchange.get_tickers(cached=False)
+
+
+def _not_supported(error: BaseException) -> bool:
+    """TickersNotSupported or ccxt.NotSupported, also as cause of a freqtrade exception."""
+    try:
+        from ccxt import NotSupported
+    except ImportError:
+        NotSupported = TickersNotSupported
+    while error is not None:
+        if isinstance(error, (TickersNotSupported, NotSupported)):
+            return True
+        error = error.__cause__
+    return False
+
+
+class TickerSnapshot:
+
+    def __init__(self, ttl: float = 3.0, fetch_tickers: Callable[..., Mapping[str, Mapping]] = exchange_tickers,
+                 clock: Callable[[], float] = time.monotonic, max_age: Optional[float] = None):
+        self.ttl = ttl
+        self.max_age = 5 * ttl if max_age is None else max_age
+        self.fetch_tickers = fetch_tickers
+        self._clock = clock
+        self._tickers: Mapping[str, Mapping] = {}
+        self._fetched: Optional[float] = None
+        # time of the last successful fetch
+        self._updated: Optional[float] = None
+        self._batched = True
+        self.failures = 0
+
+    def _snapshot(self, dp) -> Mapping[str, Mapping]:
+        now = self._clock()
+        if self._batched and (self._fetched is None or now - self._fetched > self.ttl):
+            try:
+                self._tickers = self.fetch_tickers(dp)
+                self._updated = now
+                self.failures = 0
+            except Exception as e:
+                if _not_supported(e):
+                    logger.warning(f"Exchange can't fetch all tickers, one ticker per pair from now on: {e}")
+                    self._batched = False
+                    self._tickers = {}
+                else:
+                    # transient (network, rate limit): keep the last snapshot, try again after ttl
+                    self.failures += 1
+                    if self._tickers and (self._updated is None or now - self._updated > self.max_age):
+                        logger.warning(f"Could not fetch all tickers ({self.failures} in a row), "
+                                       f"snapshot older than {self.max_age}s, one ticker per pair: {e}")
+                        self._tickers = {}
+                    else:
+                        logger.warning(f"Could not fetch all tickers ({self.failures} in a row), "
+                                       f"keeping the last snapshot: {e}")
+            self._fetched = now
+        return self._tickers
+
+    def get(self, dp, pair: str) -> Mapping:
+        ticker = self._snapshot(dp).get(pair)
+        if ticker is None:
+            ticker = dp.ticker(pair)
+        return ticker
+
+    def last(self, dp, pair: str) -> Optional[float]:
+        return self.get(dp, pair)['last']
+
+    def clear(self) -> None:
+        self._tickers = {}
+        self._fetched = None
+        self._updated = None
@@ -0,0 +1,126 @@
+"""
+Trailing buy state machine shared by the TrailingBuyStrat variants.
+
+Live / dry-run drive it price by price through TrailingBuyBook, backtests can replay
+the same machine over the candle closes with replay_trailing_buy().
+
+    start:  buy signal, uplimit = start_price = price
+    update: price < uplimit           -> uplimit = min(price * (1 + offset), uplimit)
+    buy:    uplimit <= price < start_price * (1 + max_buy)
+    stop:   price > start_price * (1 + max_stop)   (only with max_stop set)
+    wait:   anything else, keep trailing
+"""
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+
+from strategy_utils.store import BoundedStore
+
+UPDATE = 'update'
+BUY = 'buy'
+STOP = 'stop'
+WAIT = 'wait'
+
+
+class TrailingBuyState:
+    __slots__ = ('started', 'uplimit', 'start_price', 'buy_tag', 'start_time', 'offset', 'allow_trailing')
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.started = False
+        self.uplimit = 0
+        self.start_price = 0
+        self.buy_tag = None
+        self.start_time = None
+        self.offset = 0
+        self.allow_trailing = False
+
+    def start(self, price: float, buy_tag: Optional[str] = None, start_time: Optional[datetime] = None) -> None:
+        self.started = True
+        self.uplimit = price
+        self.start_price = price
+        self.buy_tag = buy_tag
+        self.start_time = start_time
+        self.offset = 0
+
+    def profit_ratio(self, current_price: float) -> float:
+        # how far the price went down since the start of the trailing
+        if not self.started:
+            return 0
+        return (self.start_price - current_price) / self.start_price
+
+    def step(self, current_price: float, offset: float, max_buy: float = 0.0, max_stop: Optional[float] = None) -> str:
+        """Apply one price of a started trailing buy, returns UPDATE, BUY, STOP or WAIT."""
+        if current_price < self.uplimit:
+            self.uplimit = min(current_price * (1 + offset), self.uplimit)
+            self.offset = offset
+            return UPDATE
+        if current_price < self.start_price * (1 + max_buy):
+            return BUY
+        if max_stop is not None and current_price > self.start_price * (1 + max_stop):
+            return STOP
+        return WAIT
+
+
+class TrailingBuyBook:
+    """
+    TrailingBuyState per pair, created on first use and reset in place afterwards.
+    Pairs not seen for ttl seconds (e.g. removed from the whitelist) are dropped.
+    """
+
+    def __init__(self, max_pairs: int = 1000, ttl: Optional[float] = 24 * 3600):
+        self._states = BoundedStore('trailing buy states', max_entries=max_pairs, ttl=ttl)
+
+    def __getitem__(self, pair: str) -> TrailingBuyState:
+        state = self._states.get(pair)
+        if state is None:
+            state = self._states[pair] = TrailingBuyState()
+        return state
+
+    def __contains__(self, pair: str) -> bool:
+        return pair in self._states
+
+    def reset(self, pair: str) -> TrailingBuyState:
+        state = self[pair]
+        state.reset()
+        return state
+
+
+def replay_trailing_buy(signal: np.ndarray, close: np.ndarray, offset: float, max_buy: float = 0.0,
+                        max_stop: Optional[float] = None, max_candles: Optional[int] = None) -> np.ndarray:
+    """
+    Run the live state machine over historical candles, with the close as price.
+
+    signal: 1 where the strategy wants to start a trailing buy.
+    max_candles: give up the trailing after that many candles (like trailing_expire_seconds).
+    Returns 1 on the candles where the trailing buy would have bought.
+    """
+    signal = np.asarray(signal)
+    close = np.asarray(close, dtype=np.float64)
+    buy = np.zeros(len(close), dtype=np.int64)
+    state = TrailingBuyState()
+    started_at = 0
+
+    for i in range(len(close)):
+        if not state.started:
+            if signal[i] == 1:
+                state.start(close[i])
+                started_at = i
+            continue
+        if max_candles is not None and i - started_at > max_candles:
+            state.reset()
+            if signal[i] == 1:
+                state.start(close[i])
+                started_at = i
+            continue
+        action = state.step(close[i], offset, max_buy, max_stop)
+        if action == BUY:
+            buy[i] = 1
+            state.reset()
+        elif action == STOP:
+            state.reset()
+
+    return buy
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# strategy_utils is copied next to the strategies, not installed
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from strategy_utils.align import align_column, date_keys, date_positions
+
+
+def candles(start, length, drop=(), seed=0):
+    dates = pd.date_range(start, periods=length, freq='5min', tz='UTC')
+    frame = pd.DataFrame({'date': dates, 'close': np.random.default_rng(seed).uniform(1, 2, length)})
+    return frame.drop(index=list(drop)).reset_index(drop=True)
+
+
+def merged(source, target):
+    """What the helpers replace: a left merge on the date."""
+    joined = target[['date']].merge(source[['date', 'close']], on='date', how='left')
+    return joined['close'].to_numpy()
+
+
+def aligned(source, target):
+    positions = date_positions(date_keys(source['date']), date_keys(target['date']))
+    return align_column(source['close'].to_numpy(), positions)
+
+
+@pytest.mark.parametrize('source, target', [
+    # gaps in the source
+    (candles('2024-01-01', 500, drop=range(100, 130), seed=1), candles('2024-01-01', 500)),
+    # gaps in the target
+    (candles('2024-01-01', 500, seed=1), candles('2024-01-01', 500, drop=[0, 7, 250, 499])),
+    # source starts later
+    (candles('2024-01-01 05:00', 400, seed=1), candles('2024-01-01', 500)),
+    # source starts earlier and ends earlier
+    (candles('2023-12-31', 300, seed=1), candles('2024-01-01', 500)),
+    # source ends later
+    (candles('2024-01-01', 900, seed=1), candles('2024-01-01 10:00', 200)),
+    # no common candle
+    (candles('2023-01-01', 100, seed=1), candles('2024-01-01', 100)),
+    # empty source
+    (candles('2024-01-01', 0, seed=1), candles('2024-01-01', 100)),
+    # empty target
+    (candles('2024-01-01', 100, seed=1), candles('2024-01-01', 0)),
+])
+def test_matches_left_merge(source, target):
+    np.testing.assert_array_equal(aligned(source, target), merged(source, target))
+
+
+def test_same_dates_are_not_copied():
+    source = candles('2024-01-01', 100, seed=1)
+    target = candles('2024-01-01', 100)
+    positions = date_positions(date_keys(source['date']), date_keys(target['date']))
+    assert positions is None
+    values = source['close'].to_numpy()
+    assert align_column(values, positions) is values
+
+
+def test_date_keys_ignore_the_timezone_representation():
+    utc = pd.Series(pd.date_range('2024-01-01', periods=3, freq='1h', tz='UTC'))
+    other = utc.dt.tz_convert('Asia/Shanghai')
+    np.testing.assert_array_equal(date_keys(utc), date_keys(other))
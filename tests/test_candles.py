@@ -0,0 +1,59 @@
+import pandas as pd
+
+from strategy_utils.candles import FormingCandles
+
+
+class Clock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_aggregates_the_rates_of_a_candle():
+    candles = FormingCandles()
+    date = pd.Timestamp('2024-01-01', tz='UTC')
+    candles.update(1, date, 100.0, 101.0)
+    candles.update(1, date, 100.0, 98.0)
+    candle = candles.update(1, date, 100.0, 99.5)
+    assert (candle['open'], candle['high'], candle['low'], candle['close']) == (100.0, 101.0, 98.0, 99.5)
+    assert candle['date'] == date and candle['volume'] == 0
+
+    candle = candles.update(1, date + pd.Timedelta('5min'), 99.0, 99.2)
+    assert (candle['open'], candle['high'], candle['low'], candle['close']) == (99.0, 99.2, 99.0, 99.2)
+
+
+def test_grows_and_reuses_slots():
+    candles = FormingCandles(capacity=2)
+    for key in range(10):
+        candles.update(key, 0, 1.0, float(key))
+    assert len(candles) == 10
+    candles.remove(3)
+    assert 3 not in candles and candles.get(3) is None
+    candles.update(42, 0, 1.0, 2.0)
+    assert candles.get(4)['close'] == 4.0 and candles.get(42)['close'] == 2.0
+
+
+def test_drops_least_recently_updated_above_max_entries():
+    candles = FormingCandles(max_entries=3)
+    for key in range(3):
+        candles.update(key, 0, 1.0, 1.0)
+    candles.update(0, 0, 1.0, 1.5)
+    candles.update(3, 0, 1.0, 1.0)
+    assert 1 not in candles
+    assert {0, 2, 3} == {key for key in range(4) if key in candles}
+    assert candles.stats() == {'entries': 3, 'evictions': 1, 'expirations': 0}
+
+
+def test_drops_keys_not_updated_for_ttl():
+    clock = Clock()
+    candles = FormingCandles(ttl=60, clock=clock)
+    candles.update('closed while down', 0, 1.0, 1.0)
+    clock.now = 30
+    candles.update('open', 0, 1.0, 1.0)
+    clock.now = 70
+    candles.update('open', 0, 1.0, 1.1)
+    assert 'closed while down' not in candles and 'open' in candles
+    assert candles.stats()['expirations'] == 1
@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from strategy_utils.compact import compact_dataframe, validate_compact
+
+
+def ohlcv(length, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, length)))
+    open_rate = np.concatenate((close[:1], close[:-1]))
+    return pd.DataFrame({
+        'date': pd.date_range('2024-01-01', periods=length, freq='5min', tz='UTC'),
+        'open': open_rate,
+        'high': np.maximum(open_rate, close) * 1.002,
+        'low': np.minimum(open_rate, close) * 0.998,
+        'close': close,
+        'volume': rng.uniform(100, 1000, length),
+    })
+
+
+class Strategy:
+    """advise_* of a strategy with float, 0 / 1, bool and tag columns."""
+
+    def __init__(self, threshold=None):
+        # None: compare the float column to another float column, else to close * threshold
+        self.threshold = threshold
+
+    def advise_indicators(self, dataframe, metadata):
+        dataframe['sma'] = dataframe['close'].rolling(10).mean()
+        dataframe['sma_slow'] = dataframe['close'].rolling(30).mean()
+        dataframe['rising'] = (dataframe['close'] > dataframe['open']).astype('int64')
+        dataframe['pumping'] = dataframe['close'].pct_change(8).abs() > 0.03
+        return dataframe
+
+    def advise_entry(self, dataframe, metadata):
+        if self.threshold is None:
+            below = dataframe['sma'] < dataframe['sma_slow']
+        else:
+            below = dataframe['sma'] < dataframe['close'] * self.threshold
+        condition = below & (dataframe['rising'] == 1) & ~dataframe['pumping']
+        dataframe.loc[condition, ['enter_long', 'enter_tag']] = (1, 'below')
+        return dataframe
+
+    def advise_exit(self, dataframe, metadata):
+        dataframe.loc[dataframe['sma'] > dataframe['sma_slow'] * 1.01, ['exit_long', 'exit_tag']] = (1, 'above')
+        return dataframe
+
+
+def test_compact_dtypes():
+    frame = Strategy().advise_indicators(ohlcv(100), {})
+    frame['enter_tag'] = 'tag'
+    compact = compact_dataframe(frame)
+    assert compact['sma'].dtype == np.float32
+    assert compact['rising'].dtype == np.int8
+    assert compact['pumping'].dtype == bool
+    assert compact['enter_tag'].dtype == 'category'
+    for column in ('date', 'open', 'high', 'low', 'close', 'volume'):
+        assert compact[column].dtype == frame[column].dtype
+    assert compact_dataframe(frame, keep=['sma'])['sma'].dtype == np.float64
+
+
+def test_validate_compact_safe_strategy():
+    assert validate_compact(Strategy(), ohlcv(2000), {'pair': 'BTC/USDT'}) == {}
+
+
+def test_validate_compact_reports_float32_flips():
+    # sma / close sit right at the threshold: float32 rounding moves some candles across it
+    candles = ohlcv(2000)
+    candles['close'] = 100.0 + np.arange(len(candles)) * 1e-7
+    candles['open'] = candles['close'] - 1e-3
+    strategy = Strategy(threshold=1.0)
+
+    differences = validate_compact(strategy, candles, {'pair': 'BTC/USDT'})
+    assert differences['enter_long'] > 0
+    assert differences['enter_tag'] == differences['enter_long']
+    assert validate_compact(strategy, candles, {'pair': 'BTC/USDT'}, keep=['sma']) == {}
+
+
+def test_validate_compact_runs_checks():
+    checks = {'sma_rounded': lambda frame: frame['sma'].to_numpy(dtype=np.float64)}
+    differences = validate_compact(Strategy(), ohlcv(500), {'pair': 'BTC/USDT'}, checks=checks)
+    assert differences == {'sma_rounded': 500 - 9}
+
+
+def test_validate_compact_kamafama():
+    pytest.importorskip('freqtrade')
+    from freqtrade.enums import RunMode
+    from KamaFama.KamaFama_2 import KamaFama_2
+
+    strategy = KamaFama_2({'runmode': RunMode.BACKTEST})
+    strategy.ft_load_hyper_params()
+    assert validate_compact(strategy, ohlcv(1500, seed=3), {'pair': 'BTC/USDT'}) == {}
@@ -0,0 +1,110 @@
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from strategy_utils.dca_ladder import simulate_dca_ladder, summarize_trades
+
+FEE = 0.001
+
+
+class FakeWallets:
+
+    def get_total_stake_amount(self):
+        return 1e12
+
+
+class FakeTrade:
+    """The fields of Trade the callbacks read, profit as Trade.calc_profit_ratio (spot, long)."""
+
+    pair = 'BTC/USDT'
+    stake_currency = 'USDT'
+    trade_direction = 'long'
+
+    def __init__(self, rate):
+        self.stake_amount = 1.0
+        self.amount = 1.0 / rate
+        self.nr_of_successful_entries = 1
+
+    def profit_ratio(self, rate):
+        return self.amount * rate * (1 - FEE) / (self.stake_amount * (1 + FEE)) - 1
+
+    def add(self, stake, rate):
+        self.amount += stake / rate
+        self.stake_amount += stake
+        self.nr_of_successful_entries += 1
+
+
+def replay(strategy, rates, open_rate):
+    """The ladder candle by candle through the strategy's adjust_trade_position and custom_exit."""
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    trades = []
+    entry_index = 0
+    while entry_index < len(rates):
+        trade = FakeTrade(open_rate[entry_index])
+        exit_index = -1
+        for index in range(entry_index, len(rates)):
+            rate = rates[index]
+            profit = trade.profit_ratio(rate)
+            if strategy.custom_exit(trade.pair, trade, now, rate, profit):
+                exit_index = index
+                break
+            stake = strategy.adjust_trade_position(trade, now, rate, profit, 0.0, np.inf)
+            if stake:
+                trade.add(stake, rate)
+        rate = rates[exit_index]
+        trades.append((entry_index, exit_index, trade.nr_of_successful_entries, trade.stake_amount,
+                       trade.profit_ratio(rate)))
+        if exit_index < 0:
+            break
+        entry_index = exit_index + 1
+    return trades
+
+
+@pytest.fixture(scope='module')
+def strategy():
+    pytest.importorskip('freqtrade')
+    import MartingaleSpotStrategy
+
+    # the callbacks read only these, no need for a configured IStrategy
+    strategy = MartingaleSpotStrategy.MartingaleSpot.__new__(MartingaleSpotStrategy.MartingaleSpot)
+    strategy.wallets = FakeWallets()
+    MartingaleSpotStrategy.vervose = False
+    return strategy
+
+
+def path(length, seed, volatility):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, volatility, length)))
+    open_rate = np.concatenate((close[:1], close[:-1])) * (1 + rng.normal(0, volatility / 10, length))
+    return open_rate, close
+
+
+@pytest.mark.parametrize('seed, volatility, block', [(0, 0.002, 256), (1, 0.004, 256), (2, 0.004, 7), (3, 0.01, 64)])
+def test_matches_callbacks(strategy, seed, volatility, block):
+    open_rate, close = path(20000, seed, volatility)
+    for rates in (open_rate, close):
+        expected = replay(strategy, rates, open_rate)
+        trades = simulate_dca_ladder(rates, open_rate, strategy.dca_add_thresholds, strategy.dca_exit_targets,
+                                     fee=FEE, block=block)
+        assert len(trades) == len(expected) > 10
+        expected = np.array(expected)
+        np.testing.assert_array_equal(trades['entry_index'], expected[:, 0])
+        np.testing.assert_array_equal(trades['exit_index'], expected[:, 1])
+        np.testing.assert_array_equal(trades['entries'], expected[:, 2])
+        np.testing.assert_allclose(trades['stake'], expected[:, 3])
+        np.testing.assert_allclose(trades['profit_ratio'], expected[:, 4])
+    # the stake is added again, on the volatile paths up to the last threshold
+    max_entries = summarize_trades(trades)['max_entries']
+    if volatility > 0.002:
+        assert max_entries == len(strategy.dca_add_thresholds) + 1
+    else:
+        assert max_entries > 1
+
+
+def test_open_at_the_end():
+    rates = np.array([100.0, 99.0, 98.0])
+    trades = simulate_dca_ladder(rates, rates)
+    assert len(trades) == 1
+    assert trades['exit_index'][0] == -1
+    assert summarize_trades(trades)['trades'] == 0
@@ -0,0 +1,150 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from strategy_utils.decision_table import ExitLadder
+
+
+def test_first_matching_rule_wins():
+    ladder = ExitLadder(['profit', 'rsi', 'max_profit'], [
+        ('signal_profit_1', [('profit', '>', None, 0.03), ('rsi', '<', None, 38.0)]),
+        ('signal_profit_0', [('profit', '>', None, 0.01), ('rsi', '<', None, 33.0)]),
+        ('trail', [('max_profit', '>', 'profit', 0.02)]),
+    ])
+    assert ladder.evaluate([0.04, 35.0, 0.04]) == 'signal_profit_1'
+    assert ladder.evaluate([0.04, 30.0, 0.04]) == 'signal_profit_1'
+    assert ladder.evaluate([0.02, 30.0, 0.02]) == 'signal_profit_0'
+    assert ladder.evaluate([0.02, 35.0, 0.05]) == 'trail'
+    assert ladder.evaluate([0.02, np.nan, 0.02]) is None
+    assert list(ladder.evaluate_many([[0.04, 35.0, 0.0], [0.0, 50.0, 0.0]])) == ['signal_profit_1', None]
+
+
+def test_rule_without_conditions_is_rejected():
+    with pytest.raises(ValueError):
+        ExitLadder(['profit'], [('empty', [])])
+
+
+# NFI5MOHO_WIP.custom_sell before it was compiled into the ladder
+def baseline_custom_sell(self, last_candle, current_profit, max_profit):
+    if (last_candle is not None):
+        if (current_profit > self.sell_custom_profit_4.value) & (last_candle['rsi'] < self.sell_custom_rsi_4.value):
+            return 'signal_profit_4'
+        elif (current_profit > self.sell_custom_profit_3.value) & (last_candle['rsi'] < self.sell_custom_rsi_3.value):
+            return 'signal_profit_3'
+        elif (current_profit > self.sell_custom_profit_2.value) & (last_candle['rsi'] < self.sell_custom_rsi_2.value):
+            return 'signal_profit_2'
+        elif (current_profit > self.sell_custom_profit_1.value) & (last_candle['rsi'] < self.sell_custom_rsi_1.value):
+            return 'signal_profit_1'
+        elif (current_profit > self.sell_custom_profit_0.value) & (last_candle['rsi'] < self.sell_custom_rsi_0.value):
+            return 'signal_profit_0'
+
+        elif (current_profit > self.sell_custom_under_profit_1.value) & (last_candle['rsi'] < self.sell_custom_under_rsi_1.value) & (last_candle['close'] < last_candle['ema_200']):
+            return 'signal_profit_u_1'
+        elif (current_profit > self.sell_custom_under_profit_2.value) & (last_candle['rsi'] < self.sell_custom_under_rsi_2.value) & (last_candle['close'] < last_candle['ema_200']):
+            return 'signal_profit_u_2'
+        elif (current_profit > self.sell_custom_under_profit_3.value) & (last_candle['rsi'] < self.sell_custom_under_rsi_3.value) & (last_candle['close'] < last_candle['ema_200']):
+            return 'signal_profit_u_3'
+
+        elif (current_profit > self.sell_custom_dec_profit_1.value) & (last_candle['sma_200_dec']):
+            return 'signal_profit_d_1'
+        elif (current_profit > self.sell_custom_dec_profit_2.value) & (last_candle['close'] < last_candle['ema_100']):
+            return 'signal_profit_d_2'
+
+        elif (current_profit > self.sell_trail_profit_min_1.value) & (current_profit < self.sell_trail_profit_max_1.value) & (max_profit > (current_profit + self.sell_trail_down_1.value)):
+            return 'signal_profit_t_1'
+        elif (current_profit > self.sell_trail_profit_min_2.value) & (current_profit < self.sell_trail_profit_max_2.value) & (max_profit > (current_profit + self.sell_trail_down_2.value)):
+            return 'signal_profit_t_2'
+
+        elif (last_candle['close'] < last_candle['ema_200']) & (current_profit > self.sell_trail_profit_min_3.value) & (current_profit < self.sell_trail_profit_max_3.value) & (max_profit > (current_profit + self.sell_trail_down_3.value)):
+            return 'signal_profit_u_t_1'
+
+        elif (current_profit > 0.0) & (last_candle['close'] < last_candle['ema_200']) & (((last_candle['ema_200'] - last_candle['close']) / last_candle['close']) < self.sell_custom_profit_under_rel_1.value) & (last_candle['rsi'] > last_candle['rsi_1h'] + self.sell_custom_profit_under_rsi_diff_1.value):
+            return 'signal_profit_u_e_1'
+
+        elif (current_profit < -0.0) & (last_candle['close'] < last_candle['ema_200']) & (((last_candle['ema_200'] - last_candle['close']) / last_candle['close']) < self.sell_custom_stoploss_under_rel_1.value) & (last_candle['rsi'] > last_candle['rsi_1h'] + self.sell_custom_stoploss_under_rsi_diff_1.value):
+            return 'signal_stoploss_u_1'
+
+    return None
+
+    return None
+
+
+def random_candles(count, seed=0):
+    rng = np.random.default_rng(seed)
+    close = rng.uniform(90, 110, count)
+    candles = pd.DataFrame({
+        'close': close,
+        'ema_200': close * rng.uniform(0.97, 1.03, count),
+        'ema_100': close * rng.uniform(0.97, 1.03, count),
+        'rsi': rng.uniform(20, 80, count),
+        'rsi_1h': rng.uniform(20, 80, count),
+        'sma_200_dec': rng.random(count) < 0.3,
+    })
+    candles.loc[rng.random(count) < 0.02, 'rsi'] = np.nan
+    profit = np.where(rng.random(count) < 0.5, rng.uniform(-0.2, 0.8, count), rng.uniform(-0.01, 0.12, count))
+    max_profit = profit + rng.exponential(0.1, count)
+    return candles, profit, max_profit
+
+
+class LastCandle:
+
+    def __init__(self, candle):
+        self.candle = candle
+
+    def get(self, dp, pair, timeframe):
+        return self.candle
+
+
+class Trade:
+
+    def __init__(self, max_profit):
+        self.open_rate = 1.0
+        self.max_rate = 1.0 + max_profit
+
+
+def test_nfi5moho_ladder_equals_custom_sell():
+    pytest.importorskip('freqtrade')
+    from freqtrade.enums import RunMode
+    from NFI5MOHO.NFI5MOHO_WIP import NFI5MOHO_WIP
+
+    strategy = NFI5MOHO_WIP({'runmode': RunMode.BACKTEST})
+    strategy.ft_load_hyper_params()
+    strategy.bot_start()
+    strategy.dp = None
+    strategy.last_candles = LastCandle(None)
+
+    candles, profit, max_profit = random_candles(5000)
+    tags = strategy.evaluate_custom_sell(candles, profit, max_profit)
+    expected = []
+    for row in range(len(candles)):
+        candle = candles.iloc[row]
+        # max_profit as custom_sell derives it from the trade
+        trade = Trade(max_profit[row])
+        trade_max_profit = (trade.max_rate - trade.open_rate) / trade.open_rate
+        expected.append(baseline_custom_sell(strategy, candle, profit[row], trade_max_profit))
+
+        strategy.last_candles.candle = candle
+        assert strategy.custom_sell('BTC/USDT', trade, None, 0.0, profit[row]) == expected[-1], row
+
+    # vectorised over the same candles, with max_profit as given
+    baseline = [baseline_custom_sell(strategy, candles.iloc[row], profit[row], max_profit[row])
+                for row in range(len(candles))]
+    assert list(tags) == baseline
+    # every rule fires at least once
+    assert set(expected) - {None} == set(strategy.exit_ladder.names[:-1])
+
+
+def test_nfi5moho_ladder_parameters_cannot_be_optimized():
+    pytest.importorskip('freqtrade')
+    from freqtrade.enums import RunMode
+    from NFI5MOHO.NFI5MOHO_WIP import NFI5MOHO_WIP
+
+    strategy = NFI5MOHO_WIP({'runmode': RunMode.BACKTEST})
+    strategy.ft_load_hyper_params()
+    parameter = strategy.sell_custom_rsi_1
+    parameter.optimize = True
+    try:
+        with pytest.raises(ValueError, match='sell_custom_rsi_1'):
+            strategy.build_exit_ladder()
+    finally:
+        parameter.optimize = False
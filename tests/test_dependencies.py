@@ -0,0 +1,67 @@
+import textwrap
+from pathlib import Path
+
+from strategy_utils.dependencies import ColumnUsage
+
+SOURCE = '''
+def market_columns(informative):
+    close = informative['close'].to_numpy()
+    return {
+        'btc_close': close,
+        'btc_rsi': rsi(informative['btc_source']),
+    }
+
+
+class Strategy:
+
+    @property
+    def plot_config(self):
+        return {'main_plot': {'ema_50': {}}}
+
+    def populate_indicators(self, dataframe, metadata):
+        dataframe['ema_50'] = ta.EMA(dataframe, timeperiod=50)
+        dataframe['ema_200'] = ta.EMA(dataframe, timeperiod=200)
+        dataframe['btc_source'] = dataframe['close']
+        for name, values in context.align(dataframe).items():
+            if self.column_usage.needs(name):
+                dataframe[name] = values
+        return dataframe
+
+    def populate_entry_trend(self, dataframe, metadata):
+        dataframe.loc[dataframe['btc_close'] > 0, 'enter_long'] = 1
+        return dataframe
+'''
+
+
+def usage(tmp_path):
+    path = tmp_path / 'strategy.py'
+    path.write_text(textwrap.dedent(SOURCE))
+    return ColumnUsage(str(path))
+
+
+def test_builder_keys_are_definitions(tmp_path):
+    column_usage = usage(tmp_path)
+    assert column_usage.needs('btc_close')
+    assert not column_usage.needs('btc_rsi')
+    # only read by the unused builder column
+    assert not column_usage.needs('btc_source')
+    assert column_usage.unused() == ['btc_rsi', 'btc_source', 'ema_200']
+
+
+def test_method_dicts_are_reads(tmp_path):
+    # the columns of plot_config stay needed
+    assert usage(tmp_path).needs('ema_50')
+
+
+def test_needs_any_of_several(tmp_path):
+    column_usage = usage(tmp_path)
+    assert column_usage.needs('btc_rsi', 'btc_close')
+    assert not column_usage.needs('btc_rsi', 'ema_200')
+    assert column_usage.skipped == {'btc_rsi', 'ema_200'}
+
+
+def test_bb_rpb_skips_the_btc_protection():
+    # only read by the commented out is_btc_safe condition
+    column_usage = ColumnUsage(str(Path(__file__).resolve().parent.parent / 'BB_RPB_TSL_RNG_TBS_GOLD.py'))
+    assert not column_usage.needs('btc_threshold', 'btc_diff', 'btc_5m', 'btc_1d')
+    assert column_usage.needs('bb_lowerband2')
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+ta = pytest.importorskip('talib.abstract')
+
+from strategy_utils.indicator_cache import IndicatorCache  # noqa: E402
+
+
+def ohlcv(length, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, length)))
+    return pd.DataFrame({
+        'date': pd.date_range('2024-01-01', periods=length, freq='5min', tz='UTC'),
+        'open': close,
+        'high': close * 1.01,
+        'low': close * 0.99,
+        'close': close,
+        'volume': rng.uniform(100, 1000, length),
+    })
+
+
+class Counted:
+
+    def __init__(self, compute):
+        self.compute = compute
+        self.calls = 0
+
+    def __call__(self, dataframe, **params):
+        self.calls += 1
+        return self.compute(dataframe, **params)
+
+
+def test_arrays_shared_through_the_directory(tmp_path):
+    candles = ohlcv(500)
+    sma = Counted(ta.SMA)
+    first = IndicatorCache(tmp_path).get(candles, 'BTC/USDT', '5m', 'sma', sma, timeperiod=10)
+    again = IndicatorCache(tmp_path).get(candles.copy(), 'BTC/USDT', '5m', 'sma', sma, timeperiod=10)
+    assert sma.calls == 1
+    np.testing.assert_array_equal(again, ta.SMA(candles, timeperiod=10))
+    assert not first.flags.writeable
+
+    # other data, other parameters
+    IndicatorCache(tmp_path).get(candles.iloc[1:], 'BTC/USDT', '5m', 'sma', sma, timeperiod=10)
+    IndicatorCache(tmp_path).get(candles, 'BTC/USDT', '5m', 'sma', sma, timeperiod=11)
+    assert sma.calls == 3
+
+
+@pytest.mark.parametrize('runmode, cached', [('BACKTEST', True), ('HYPEROPT', True), ('DRY_RUN', False), ('LIVE', False)])
+def test_best5m_caches_only_in_backtest_and_hyperopt(tmp_path, runmode, cached):
+    pytest.importorskip('freqtrade')
+    from freqtrade.enums import RunMode
+    from Best5m.Best5m import Best5m
+
+    strategy = Best5m({'runmode': RunMode[runmode], 'user_data_dir': tmp_path})
+    strategy.ft_load_hyper_params()
+    strategy.bot_start()
+    assert (strategy.indicator_cache is not None) == cached
+    assert Best5m.indicator_cache is None
+
+    candles = ohlcv(500)
+    dataframe = strategy.populate_indicators(candles.copy(), {'pair': 'BTC/USDT'})
+    np.testing.assert_array_equal(dataframe['fast_sma'], ta.SMA(candles, timeperiod=strategy.fast_ma_length.value))
+    np.testing.assert_array_equal(dataframe['rsi'], ta.RSI(candles, timeperiod=strategy.rsi_length.value))
+    assert (tmp_path / 'indicator_cache').exists() == cached
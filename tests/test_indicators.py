@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+ta = pytest.importorskip('talib.abstract')
+
+from strategy_utils.indicators import ewo, williams_r  # noqa: E402
+
+
+def ohlcv(length, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, length)))
+    return pd.DataFrame({
+        'date': pd.date_range('2024-01-01', periods=length, freq='5min', tz='UTC'),
+        'open': close * (1 + rng.normal(0, 0.001, length)),
+        'high': close * (1 + rng.uniform(0, 0.01, length)),
+        'low': close * (1 - rng.uniform(0, 0.01, length)),
+        'close': close,
+        'volume': rng.uniform(0, 1000, length),
+    }, index=pd.RangeIndex(10, 10 + length))
+
+
+# the per-strategy EWO functions ewo() replaced: (ma, divisor column, scale)
+def baseline_ewo(dataframe, fast, slow, ma, divisor, scale):
+    df = dataframe.copy()
+    ma1 = ma(df, timeperiod=fast)
+    ma2 = ma(df, timeperiod=slow)
+    return (ma1 - ma2) / df[divisor] * scale
+
+
+def baseline_williams_r(dataframe, period=14):
+    highest_high = dataframe["high"].rolling(center=False, window=period).max()
+    lowest_low = dataframe["low"].rolling(center=False, window=period).min()
+    return pd.Series((highest_high - dataframe["close"]) / (highest_high - lowest_low),
+                     name=f"{period} Williams %R") * -100
+
+
+@pytest.mark.parametrize('fast, slow, ma_type, normalize_by, scale', [
+    (5, 50, 'ema', 'low', 120),       # NASOSv5_mod3 / mod4
+    (5, 35, 'ema', 'close', 100),     # NFI5MOHO_WIP
+    (5, 3, 'ema', 'close', 100),      # ElliotV8
+    (5, 35, 'sma', 'close', 100),     # ElliotV5_SMA
+    (50, 200, 'ema', 'low', 100),     # BB_RPB_TSL_RNG_TBS_GOLD
+])
+def test_ewo_equals_the_strategy_formulas(fast, slow, ma_type, normalize_by, scale):
+    dataframe = ohlcv(1000)
+    ma = {'ema': ta.EMA, 'sma': ta.SMA}[ma_type]
+    expected = baseline_ewo(dataframe, fast, slow, ma, normalize_by, scale)
+    actual = ewo(dataframe, fast, slow, ma_type=ma_type, normalize_by=normalize_by, scale=scale)
+    pd.testing.assert_series_equal(actual, expected, check_names=False, check_exact=True)
+
+
+def test_ewo_rejects_unknown_moving_average():
+    with pytest.raises(ValueError):
+        ewo(ohlcv(50), ma_type='wma')
+
+
+@pytest.mark.parametrize('length', [0, 5, 14, 1000])
+def test_williams_r_equals_the_strategy_formula(length):
+    dataframe = ohlcv(length, seed=1)
+    if length > 100:
+        dataframe.loc[50:52, 'high'] = np.nan
+        # flat candles: 0 / 0
+        dataframe.loc[200:220, ['high', 'low', 'close']] = 100.0
+    pd.testing.assert_series_equal(williams_r(dataframe, 14), baseline_williams_r(dataframe, 14), check_exact=True)
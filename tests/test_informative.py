@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('freqtrade')
+from freqtrade.exchange import timeframe_to_minutes  # noqa: E402
+from freqtrade.strategy import merge_informative_pair  # noqa: E402
+
+from strategy_utils.informative import InformativeJoin  # noqa: E402
+
+
+def duration(timeframe):
+    return pd.Timedelta(minutes=timeframe_to_minutes(timeframe))
+
+
+def candles(timeframe, length, seed, gaps=0.0):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2024-01-01', periods=length, freq=duration(timeframe), tz='UTC')
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, length)))
+    frame = pd.DataFrame({'date': dates, 'open': close, 'high': close, 'low': close, 'close': close,
+                          'volume': rng.uniform(1, 10, length)})
+    # missing candles
+    return frame[rng.uniform(size=length) >= gaps].reset_index(drop=True)
+
+
+def with_indicators(informative):
+    informative = informative.copy()
+    informative['sma'] = informative['close'].rolling(5).mean()
+    informative['up'] = informative['close'] > informative['sma']
+    return informative
+
+
+def expected_join(dataframe, informative, timeframe, timeframe_inf):
+    merged = merge_informative_pair(dataframe.copy(), informative.copy(), timeframe, timeframe_inf, ffill=True)
+    sma = merged[f'sma_{timeframe_inf}'].to_numpy(dtype=np.float64)
+    # merge_informative_pair leaves NaN in bool columns without an informative candle
+    up = merged[f'up_{timeframe_inf}'].astype(object).where(merged[f'up_{timeframe_inf}'].notna(), False)
+    return sma, up.to_numpy(dtype=bool)
+
+
+@pytest.mark.parametrize('timeframe, timeframe_inf, gaps', [('5m', '1h', 0.0), ('5m', '1h', 0.05), ('15m', '4h', 0.1)])
+def test_matches_merge_informative_pair(timeframe, timeframe_inf, gaps):
+    base = candles(timeframe, 4000, 1, gaps)
+    factor = duration(timeframe_inf) // duration(timeframe)
+    informative = with_indicators(candles(timeframe_inf, 4000 // factor + 2, 2, gaps))
+    rng = np.random.default_rng(3)
+    join = InformativeJoin(timeframe, timeframe_inf)
+    checked = 0
+
+    # sliding windows, as live candles come in; the informative window starts before or after the base one
+    for start in range(0, len(base) - 500, 37):
+        window = base.iloc[start:start + 500].reset_index(drop=True)
+        offset = duration(timeframe_inf) * int(rng.integers(-3, 4))
+        informative_start = window['date'].iat[0] + offset
+        informative_window = informative[(informative['date'] >= informative_start)
+                                         & (informative['date'] <= window['date'].iat[-1])].reset_index(drop=True)
+        sma, up = expected_join(window, informative_window, timeframe, timeframe_inf)
+        joined = join.join(window.copy(), informative_window, 'ETH/USDT', ['sma', 'up'])
+        np.testing.assert_array_equal(joined[f'sma_{timeframe_inf}'].to_numpy(), sma)
+        np.testing.assert_array_equal(joined[f'up_{timeframe_inf}'].to_numpy(), up)
+        checked += 1
+    assert checked > 50
+
+
+@pytest.mark.parametrize('length', [0, 1, 2])
+def test_short_frames(length):
+    base = candles('5m', 40, 1).iloc[20:20 + length].reset_index(drop=True)
+    informative = with_indicators(candles('1h', 4, 2))
+    sma, up = expected_join(base, informative, '5m', '1h')
+    joined = InformativeJoin('5m', '1h').join(base.copy(), informative, 'ETH/USDT', ['sma', 'up'])
+    np.testing.assert_array_equal(joined['sma_1h'].to_numpy(), sma)
+    np.testing.assert_array_equal(joined['up_1h'].to_numpy(), up)
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_series_equal
+
+
+def ohlcv(length, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, length)))
+    open_rate = np.concatenate((close[:1], close[:-1]))
+    return pd.DataFrame({
+        'date': pd.date_range('2024-01-01', periods=length, freq='5min', tz='UTC'),
+        'open': open_rate,
+        'high': np.maximum(open_rate, close) * 1.002,
+        'low': np.minimum(open_rate, close) * 0.998,
+        'close': close,
+        'volume': rng.uniform(100, 1000, length),
+    })
+
+
+def set_hyperopt(strategy, hyperopt):
+    # what Hyperopt changes on the (class level) parameters
+    for _, parameter in strategy.enumerate_parameters():
+        parameter.in_space = hyperopt and parameter.optimize
+
+
+def trends(strategy, dataframe, metadata):
+    return strategy.populate_sell_trend(strategy.populate_buy_trend(dataframe, metadata), metadata)
+
+
+def test_hyperopt_epoch_scores_like_a_backtest():
+    pytest.importorskip('freqtrade')
+    from freqtrade.enums import HyperoptState, RunMode
+    from freqtrade.optimize.hyperopt_tools import HyperoptStateContainer
+    from ElliotV8.ElliotV8_original_ichiv3 import ElliotV8_original_ichiv3 as Strategy
+
+    candles = ohlcv(1500)
+    startup = Strategy.startup_candle_count
+    strategy = Strategy({'runmode': RunMode.HYPEROPT, 'spaces': ['buy', 'sell']})
+    strategy.ft_load_hyper_params(hyperopt=True)
+    state = HyperoptStateContainer.state
+    try:
+        # hyperopt: indicators once on the whole history, every epoch on the candles after the startup
+        set_hyperopt(strategy, True)
+        HyperoptStateContainer.set_state(HyperoptState.INDICATORS)
+        assert len(strategy.base_nb_candles_buy.range) > 1
+        analyzed = strategy.populate_indicators(candles.copy(), {'pair': 'ETH/USDT'})
+        HyperoptStateContainer.set_state(HyperoptState.OPTIMIZE)
+
+        for buy, sell in [(8, 12), (80, 5), (strategy.base_nb_candles_buy.value, strategy.base_nb_candles_sell.value)]:
+            strategy.base_nb_candles_buy.value = buy
+            strategy.base_nb_candles_sell.value = sell
+            epoch = trends(strategy, analyzed.iloc[startup:].copy(), {'pair': 'ETH/USDT'})
+
+            # a backtest of the same values
+            set_hyperopt(strategy, False)
+            metadata = {'pair': f'BACKTEST-{buy}-{sell}'}
+            expected = trends(strategy, strategy.populate_indicators(candles.copy(), metadata), metadata)
+            expected = expected.iloc[startup:]
+            set_hyperopt(strategy, True)
+
+            assert not epoch[f'ma_buy_{buy}'].isna().any()
+            assert_series_equal(epoch[f'ma_buy_{buy}'], expected[f'ma_buy_{buy}'])
+            assert_series_equal(epoch[f'ma_sell_{sell}'], expected[f'ma_sell_{sell}'])
+            assert_series_equal(epoch['buy'], expected['buy'])
+            assert_series_equal(epoch['sell'], expected['sell'])
+    finally:
+        set_hyperopt(strategy, False)
+        HyperoptStateContainer.set_state(state)
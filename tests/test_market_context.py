@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+
+from strategy_utils.market_context import MarketContextCache
+from strategy_utils.ohlcv import OHLCVStore
+
+
+def ohlcv(length, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, length)))
+    return pd.DataFrame({
+        'date': pd.date_range('2024-01-01', periods=length, freq='5min', tz='UTC'),
+        'open': close * (1 + rng.normal(0, 0.001, length)),
+        'high': close * 1.01,
+        'low': close * 0.99,
+        'close': close,
+        'volume': rng.uniform(0, 1000, length),
+    })
+
+
+class FakeDataProvider:
+
+    def __init__(self, frame):
+        self.frame = frame
+        self.calls = 0
+
+    def get_pair_dataframe(self, pair, timeframe):
+        self.calls += 1
+        return self.frame.copy()
+
+
+def mid_price(informative, offset):
+    source = ((informative['open'] + informative['close']) / 2).to_numpy()
+    return {'mid': source + offset}
+
+
+def test_store_gives_the_same_columns(tmp_path):
+    btc = ohlcv(500)
+    store = OHLCVStore(tmp_path)
+    store.append('BTC/USDT', '5m', btc)
+    pair = ohlcv(300, seed=1)
+    pair['date'] = btc['date'].iloc[100:400].to_numpy()
+
+    span = {'candle': pair['date'].iat[-1], 'first': pair['date'].iat[0]}
+    from_dp = MarketContextCache().get(FakeDataProvider(btc), 'BTC/USDT', '5m', mid_price, 1.0, **span)
+    dp = FakeDataProvider(btc)
+    from_store = MarketContextCache(store).get(dp, 'BTC/USDT', '5m', mid_price, 1.0, **span)
+    assert dp.calls == 0
+    np.testing.assert_array_equal(from_store.align(pair)['mid'], from_dp.align(pair)['mid'])
+
+
+def test_stale_store_falls_back_to_the_data_provider(tmp_path):
+    btc = ohlcv(500)
+    store = OHLCVStore(tmp_path)
+    store.append('BTC/USDT', '5m', btc.iloc[:400])
+    dp = FakeDataProvider(btc)
+    context = MarketContextCache(store).get(dp, 'BTC/USDT', '5m', mid_price, 0.0, candle=btc['date'].iat[-1],
+                                            first=btc['date'].iat[0])
+    assert dp.calls == 1
+    assert len(context.dates) == 500
+
+    # nothing stored for the pair
+    context = MarketContextCache(store).get(dp, 'ETH/USDT', '5m', mid_price, 0.0, candle=btc['date'].iat[-1],
+                                            first=btc['date'].iat[0])
+    assert dp.calls == 2
+
+
+def test_store_starting_after_the_first_candle_falls_back(tmp_path):
+    btc = ohlcv(500)
+    store = OHLCVStore(tmp_path)
+    store.append('BTC/USDT', '5m', btc.iloc[200:])
+    pair = btc.iloc[100:]
+    dp = FakeDataProvider(btc)
+
+    context = MarketContextCache(store).get(dp, 'BTC/USDT', '5m', mid_price, 0.0, candle=pair['date'].iat[-1],
+                                            first=pair['date'].iat[0])
+    assert dp.calls == 1
+    assert not np.isnan(context.align(pair)['mid']).any()
+
+    # covered from the first candle on
+    pair = btc.iloc[200:]
+    context = MarketContextCache(store).get(dp, 'BTC/USDT', '5m', mid_price, 0.0, candle=pair['date'].iat[-1],
+                                            first=pair['date'].iat[0])
+    assert dp.calls == 1
+    assert len(context.dates) == 300
@@ -0,0 +1,233 @@
+from enum import Enum
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from strategy_utils.parallel import ParallelAnalysisMixin, export_dataframe, import_dataframe, release_block
+
+
+class RunMode(Enum):
+    DRY_RUN = 'dry_run'
+
+
+def ohlcv(length, seed, freq='5min'):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, length)))
+    return pd.DataFrame({
+        'date': pd.date_range('2024-01-01', periods=length, freq=freq, tz='UTC'),
+        'open': close * (1 + rng.normal(0, 0.001, length)),
+        'high': close * 1.01,
+        'low': close * 0.99,
+        'close': close,
+        'volume': rng.uniform(0, 1000, length),
+    })
+
+
+class FakeDataProvider:
+
+    def __init__(self, pairs):
+        self.frames = {}
+        for seed, pair in enumerate(pairs):
+            self.frames[(pair, '5m')] = ohlcv(600, seed)
+            self.frames[(pair, '1h')] = ohlcv(60, seed + 100, '1h')
+        self.frames[('BTC/USDT', '1h')] = ohlcv(60, 999, '1h')
+        self.pairs = list(pairs)
+
+    def ohlcv(self, pair, timeframe=None, copy=True, candle_type=''):
+        return self.frames[(pair, timeframe)].copy()
+
+    def get_pair_dataframe(self, pair, timeframe=None, candle_type=''):
+        return self.frames[(pair, timeframe)].copy()
+
+    def current_whitelist(self):
+        return list(self.pairs)
+
+
+class FakeIStrategy:
+    """The part of IStrategy the mixin relies on."""
+    timeframe = '5m'
+    process_only_new_candles = True
+
+    def __init__(self, config):
+        self.config = config
+        self.dp = None
+        self.analyzed = {}
+
+    def informative_pairs(self):
+        return [(pair, '1h') for pair in self.dp.current_whitelist()] + [('BTC/USDT', '1h')]
+
+    def analyze_ticker(self, dataframe, metadata):
+        informative = self.dp.get_pair_dataframe(metadata['pair'], '1h')
+        btc = self.dp.get_pair_dataframe('BTC/USDT', '1h')
+        dataframe['sma'] = dataframe['close'].rolling(20).mean()
+        dataframe['rsi_like'] = (dataframe['close'].diff() > 0).rolling(14).mean() * 100
+        dataframe['close_1h'] = informative['close'].iat[-1]
+        dataframe['btc_1h'] = btc['close'].iat[-1]
+        dataframe['above'] = dataframe['close'] > dataframe['sma']
+        dataframe['buy'] = (dataframe['above'] & (dataframe['rsi_like'] < 50)).astype(int)
+        dataframe['buy_tag'] = np.where(dataframe['buy'] == 1, 'sma', None)
+        dataframe['regime'] = pd.Categorical(np.where(dataframe['above'], 'up', 'down'))
+        return dataframe
+
+    def analyze(self, pairs):
+        for pair in pairs:
+            self.analyzed[pair] = self.analyze_ticker(self.dp.ohlcv(pair, self.timeframe), {'pair': pair})
+
+
+class FakeStrategy(ParallelAnalysisMixin, FakeIStrategy):
+    parallel_analysis_workers = 2
+    parallel_analysis_timeout = 120.0
+
+    def parallel_worker_config(self):
+        return make_worker_strategy, self.config
+
+
+def make_worker_strategy(config):
+    strategy = FakeStrategy(config)
+    strategy.parallel_analysis_workers = 0
+    return strategy
+
+
+def failing_worker_strategy(config):
+    raise RuntimeError('no strategy')
+
+
+def shm_blocks(prefix='ftpa_'):
+    import os
+    return {name for name in os.listdir('/dev/shm') if name.startswith(prefix)} if os.path.isdir('/dev/shm') else set()
+
+
+def test_export_import_round_trip():
+    dataframe = ohlcv(300, 1)
+    dataframe['flag'] = dataframe['close'] > 100
+    dataframe['count'] = np.arange(len(dataframe), dtype=np.int64)
+    dataframe['small'] = dataframe['count'].astype(np.int8)
+    dataframe['ratio'] = (dataframe['close'] / dataframe['open']).astype(np.float32)
+    dataframe['regime'] = pd.Categorical(np.where(dataframe['flag'], 'up', 'down'))
+    dataframe['tag'] = np.where(dataframe['flag'], 'x', None)
+
+    payload = export_dataframe(dataframe, 'ftpa_test_round_trip')
+    assert_frame_equal(import_dataframe('ftpa_test_round_trip', payload), dataframe)
+    assert 'ftpa_test_round_trip' not in shm_blocks()
+
+
+def test_export_without_numeric_columns():
+    dataframe = pd.DataFrame({'tag': ['a', 'b']})
+    payload = export_dataframe(dataframe, 'ftpa_test_no_block')
+    assert_frame_equal(import_dataframe('ftpa_test_no_block', payload), dataframe)
+
+
+def test_release_block_ignores_missing():
+    release_block('ftpa_test_never_created')
+
+
+def test_parallel_matches_serial():
+    pairs = ['ETH/USDT', 'XRP/USDT', 'ADA/USDT', 'SOL/USDT']
+    config = {'runmode': RunMode.DRY_RUN}
+
+    serial = FakeIStrategy(config)
+    serial.dp = FakeDataProvider(pairs)
+    serial.analyze(pairs)
+
+    parallel = FakeStrategy(config)
+    parallel.dp = FakeDataProvider(pairs)
+    serial_calls = []
+    original = FakeIStrategy.analyze_ticker
+
+    def counted(self, dataframe, metadata):
+        serial_calls.append(metadata['pair'])
+        return original(self, dataframe, metadata)
+
+    FakeIStrategy.analyze_ticker = counted
+    try:
+        parallel.analyze(pairs)
+    finally:
+        FakeIStrategy.analyze_ticker = original
+        parallel.close_parallel_pool()
+
+    # every pair came from the workers
+    assert serial_calls == []
+    assert parallel._parallel_failures == 0
+    for pair in pairs:
+        assert_frame_equal(parallel.analyzed[pair], serial.analyzed[pair])
+    assert shm_blocks() == set()
+
+
+def test_failure_falls_back_to_serial():
+    pairs = ['ETH/USDT', 'XRP/USDT']
+    config = {'runmode': RunMode.DRY_RUN}
+
+    serial = FakeIStrategy(config)
+    serial.dp = FakeDataProvider(pairs)
+    serial.analyze(pairs)
+
+    parallel = FakeStrategy(config)
+    parallel.dp = FakeDataProvider(pairs)
+    # the workers can't create their strategy: the jobs never finish
+    parallel.parallel_worker_config = lambda: (failing_worker_strategy, config)
+    parallel.parallel_analysis_timeout = 3.0
+    parallel.analyze(pairs)
+
+    assert parallel._parallel_failures == 1
+    assert parallel._parallel_pool is None
+    for pair in pairs:
+        assert_frame_equal(parallel.analyzed[pair], serial.analyzed[pair])
+    assert shm_blocks() == set()
+
+
+class FreqtradeDataProvider(FakeDataProvider):
+    """FakeDataProvider plus what IStrategy.analyze_pair calls on it."""
+
+    def _set_cached_df(self, pair, timeframe, dataframe, candle_type):
+        pass
+
+    def _emit_df(self, pair_key, dataframe, new_candle):
+        pass
+
+
+def test_only_new_candles_go_to_the_pool():
+    pytest.importorskip('freqtrade')
+    from freqtrade.enums import RunMode as FreqtradeRunMode
+    from freqtrade.strategy import IStrategy
+
+    class Strategy(ParallelAnalysisMixin, IStrategy):
+        INTERFACE_VERSION = 3
+        timeframe = '5m'
+        minimal_roi = {'0': 0.1}
+        stoploss = -0.1
+        process_only_new_candles = True
+        parallel_analysis_workers = 2
+
+        def populate_indicators(self, dataframe, metadata):
+            dataframe['sma'] = dataframe['close'].rolling(20).mean()
+            return dataframe
+
+        def populate_entry_trend(self, dataframe, metadata):
+            dataframe['enter_long'] = (dataframe['close'] > dataframe['sma']).astype(int)
+            return dataframe
+
+        def populate_exit_trend(self, dataframe, metadata):
+            dataframe['exit_long'] = 0
+            return dataframe
+
+    pairs = ['ETH/USDT', 'XRP/USDT', 'ADA/USDT']
+    strategy = Strategy({'runmode': FreqtradeRunMode.DRY_RUN})
+    strategy.dp = FreqtradeDataProvider(pairs)
+    sent = []
+
+    def analyze_parallel(pairs):
+        sent.append(list(pairs))
+        return {}
+
+    strategy._analyze_parallel = analyze_parallel
+    strategy.analyze(pairs)
+    # same candles: freqtrade skips the analysis, so must the pool
+    strategy.analyze(pairs)
+    # a new candle for one pair only: a single pair isn't worth the pool
+    frame = strategy.dp.frames[('ETH/USDT', '5m')]
+    strategy.dp.frames[('ETH/USDT', '5m')] = pd.concat([frame.iloc[1:], ohlcv(1, 7).assign(
+        date=frame['date'].iat[-1] + pd.Timedelta('5min'))], ignore_index=True)
+    strategy.analyze(pairs)
+    assert sent == [pairs]
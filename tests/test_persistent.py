@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from strategy_utils.persistent import _RECORD, PersistentFloatStore, trade_key
+
+OPENED = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def key(trade_id, hours=0):
+    return trade_key(SimpleNamespace(id=trade_id, open_date_utc=OPENED + timedelta(hours=hours)))
+
+
+def test_survives_a_restart(tmp_path):
+    path = tmp_path / 'stoploss.bin'
+    store = PersistentFloatStore(path)
+    store[key(1)] = -0.05
+    store[key(2)] = -0.04
+    store[key(1)] = 0.01
+    store.pop(key(2))
+
+    # a new instance reads the file through mmap
+    store = PersistentFloatStore(path)
+    assert store.get(key(1)) == 0.01
+    assert key(2) not in store
+    assert len(store) == 1
+
+
+def test_same_id_other_trade(tmp_path):
+    # ids start at 1 again after a database reset
+    store = PersistentFloatStore(tmp_path / 'stoploss.bin')
+    store[key(1)] = 0.02
+    assert store.get(key(1, hours=5)) is None
+    assert key(1, hours=5) not in store
+    assert store.pop(key(1, hours=5), -1.0) == -1.0
+    assert len(store) == 0
+
+
+def test_partial_record_is_ignored_and_truncated(tmp_path):
+    path = tmp_path / 'stoploss.bin'
+    store = PersistentFloatStore(path)
+    store[key(1)] = 0.02
+    # crash while appending
+    with open(path, 'ab') as file:
+        file.write(b'\x01' * (_RECORD.itemsize - 5))
+
+    store = PersistentFloatStore(path)
+    assert store.get(key(1)) == 0.02
+    store[key(3)] = 0.03
+    assert path.stat().st_size == 2 * _RECORD.itemsize
+    assert PersistentFloatStore(path).get(key(3)) == 0.03
+
+
+def test_compaction(tmp_path):
+    path = tmp_path / 'stoploss.bin'
+    store = PersistentFloatStore(path, compact_ratio=4, min_records=8)
+    for step in range(100):
+        store[key(1)] = step / 1000
+        store[key(2)] = -step / 1000
+    store[key(3)] = 0.5
+    store.pop(key(3))
+    assert path.stat().st_size <= 9 * _RECORD.itemsize
+
+    store = PersistentFloatStore(path)
+    assert store.get(key(1)) == 0.099
+    assert store.get(key(2)) == -0.099
+    assert len(store) == 2
+
+
+def test_retain_open_trades(tmp_path):
+    path = tmp_path / 'stoploss.bin'
+    store = PersistentFloatStore(path)
+    store[key(1)] = 0.01
+    store[key(2)] = 0.02
+    store[key(3)] = 0.03
+    # trade 2 closed while the bot was down, trade 3 is another trade after a database reset
+    store.retain([key(1), key(3, hours=2)])
+    assert path.stat().st_size == _RECORD.itemsize
+
+    store = PersistentFloatStore(path)
+    assert store.get(key(1)) == 0.01
+    assert len(store) == 1
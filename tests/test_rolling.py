@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from strategy_utils.rolling import running_min_since
+
+
+def expanding_local_min(close, barssince_last_buy):
+    """TrailingBuyStrat's close_lower before running_min_since: expanding().apply(get_local_min)."""
+    def get_local_min(x):
+        win = barssince_last_buy.iloc[x.shape[0] - 1].astype('int')
+        win = max(win, 0)
+        return pd.Series(x).rolling(window=win).min().iloc[-1]
+
+    close_lower = close.expanding().apply(get_local_min)
+    return pd.Series(np.where(close_lower.isna() == True, close, close_lower), index=close.index)  # noqa: E712
+
+
+def barssince(switch):
+    return switch.groupby(switch.cumsum()).cumcount()
+
+
+@pytest.mark.parametrize('length, seed', [(1, 0), (2, 1), (5, 2), (19, 3), (600, 4), (600, 5)])
+def test_running_min_since_equals_expanding_apply(length, seed):
+    rng = np.random.default_rng(seed)
+    close = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.01, length))), index=pd.RangeIndex(3, 3 + length))
+    switch = pd.Series((rng.random(length) < 0.05).astype(int), index=close.index)
+    barssince_last_buy = barssince(switch)
+
+    expected = expanding_local_min(close, barssince_last_buy)
+    actual = running_min_since(close, barssince_last_buy == 0)
+    pd.testing.assert_series_equal(actual, expected, check_names=False, check_exact=True)
+
+
+def test_running_min_since_without_start():
+    close = pd.Series([5.0, 3.0, 4.0, 2.0, 6.0])
+    starts = pd.Series([False] * 5)
+    np.testing.assert_array_equal(running_min_since(close, starts), [5.0, 3.0, 3.0, 2.0, 2.0])
+    # the mask of the caller is left as it is
+    assert not starts.any()
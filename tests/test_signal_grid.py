@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from strategy_utils.signal_grid import SignalGrid, sample_candidates
+
+
+def ohlcv(length, seed=0, freq='5min'):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, length)))
+    open_rate = np.concatenate((close[:1], close[:-1]))
+    return pd.DataFrame({
+        'date': pd.date_range('2024-01-01', periods=length, freq=freq, tz='UTC'),
+        'open': open_rate,
+        'high': np.maximum(open_rate, close) * 1.002,
+        'low': np.minimum(open_rate, close) * 0.998,
+        'close': close,
+        'volume': rng.uniform(100, 1000, length),
+    })
+
+
+def resample(candles, timeframe):
+    frame = candles.set_index('date').resample(timeframe, label='left', closed='left').agg(
+        {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'})
+    return frame.reset_index()
+
+
+class FakeDataProvider:
+
+    def __init__(self, candles):
+        self.candles = candles
+
+    def get_pair_dataframe(self, pair, timeframe=None, candle_type=''):
+        return resample(self.candles, {'15m': '15min', '1h': '1h'}[timeframe])
+
+
+def test_factor_scales_the_threshold():
+    close = np.array([98.0, 99.0, 100.0])
+    ma = np.array([100.0, 100.0, 100.0])
+    grid = SignalGrid().branch((close, '<', 'offset', ma))
+    np.testing.assert_array_equal(grid.signals({'offset': [0.99, 1.0]}),
+                                  [[True, False, False], [True, True, False]])
+
+
+def assert_grid_matches(strategy, populate, signal_column, candles, count=20):
+    """grid.signals for sampled and the current values == the signal column of populate."""
+    metadata = {'pair': 'ETH/USDT'}
+    dataframe = strategy.populate_indicators(candles.copy(), metadata)
+    grid = strategy.entry_signal_grid(dataframe, metadata)
+    candidates = sample_candidates(strategy, grid.parameters, count)
+    for name in grid.parameters:
+        candidates[name] = np.append(candidates[name], getattr(strategy, name).value)
+    signals = grid.signals(candidates)
+
+    saved = {name: getattr(strategy, name).value for name in grid.parameters}
+    try:
+        for row in range(count + 1):
+            for name in grid.parameters:
+                getattr(strategy, name).value = candidates[name][row].item()
+            expected = populate(dataframe.copy(), metadata)[signal_column] == 1
+            np.testing.assert_array_equal(signals[row], expected.to_numpy(), err_msg=f"candidate {row}")
+    finally:
+        for name, value in saved.items():
+            getattr(strategy, name).value = value
+    # not only candidates without any entry
+    assert signals.any()
+
+
+@pytest.mark.parametrize('name', ['NASOSv5_mod3', 'NASOSv5PD'])
+def test_nasos_grid_matches_populate_buy_trend(name):
+    pytest.importorskip('freqtrade')
+    from freqtrade.enums import RunMode
+    from NASOSv5 import NASOSv5_mod3 as module
+
+    candles = ohlcv(3000, seed=1)
+    strategy = getattr(module, name)({'runmode': RunMode.BACKTEST})
+    strategy.ft_load_hyper_params()
+    strategy.dp = FakeDataProvider(candles)
+    assert_grid_matches(strategy, strategy.populate_buy_trend, 'buy', candles)
+
+
+def test_macdv_grid_matches_populate_entry_trend():
+    pytest.importorskip('freqtrade')
+    from freqtrade.enums import RunMode
+    from MACDVStrategy import MACDVStrategy
+
+    candles = ohlcv(1500, seed=2, freq='1D')
+    strategy = MACDVStrategy({'runmode': RunMode.BACKTEST})
+    strategy.ft_load_hyper_params()
+    assert_grid_matches(strategy, strategy.populate_entry_trend, 'enter_long', candles)
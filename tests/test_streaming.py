@@ -0,0 +1,157 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+talib = pytest.importorskip('talib')
+
+from strategy_utils.streaming import (ATR, EMA, RSI, SMA, BollingerBands, FormingFastK,  # noqa: E402
+                                      IncrementalIndicators, Indicator, RollingMax, RollingMin)
+
+# relative tolerance of the smoothed / running variance indicators (float rounding)
+RTOL = 1e-9
+
+
+def candles(length, seed=0, leading_nan=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, length)))
+    high = close * (1 + rng.uniform(0, 0.01, length))
+    low = close * (1 - rng.uniform(0, 0.01, length))
+    for values in (close, high, low):
+        values[:leading_nan] = np.nan
+    return high, low, close
+
+
+def stream(state, *inputs):
+    return np.array([state.update(*values) for values in zip(*inputs)], dtype=np.float64)
+
+
+def assert_same(actual, expected, rtol=0.0):
+    expected = np.asarray(expected, dtype=np.float64)
+    np.testing.assert_array_equal(np.isnan(actual), np.isnan(expected))
+    np.testing.assert_allclose(actual, expected, rtol=rtol, atol=0)
+
+
+@pytest.mark.parametrize('leading_nan', [0, 7])
+@pytest.mark.parametrize('period', [9, 26, 200])
+def test_ema_sma_match_talib(period, leading_nan):
+    _, _, close = candles(5000, leading_nan=leading_nan)
+    assert_same(stream(EMA(period), close), talib.EMA(close, period), RTOL)
+    assert_same(stream(SMA(period), close), talib.SMA(close, period))
+
+
+@pytest.mark.parametrize('leading_nan', [0, 7])
+@pytest.mark.parametrize('period', [14, 84, 112])
+def test_rsi_matches_talib(period, leading_nan):
+    _, _, close = candles(5000, seed=1, leading_nan=leading_nan)
+    assert_same(stream(RSI(period), close), talib.RSI(close, period), RTOL)
+
+
+@pytest.mark.parametrize('period', [14, 26])
+def test_atr_matches_talib(period):
+    high, low, close = candles(5000, seed=2)
+    assert_same(stream(ATR(period), high, low, close), talib.ATR(high, low, close, period), RTOL)
+
+
+def test_rolling_extremes_equal_pandas():
+    high, low, _ = candles(5000, seed=3)
+    high[100:103] = np.nan
+    assert_same(stream(RollingMax(14), high), pd.Series(high).rolling(14).max())
+    assert_same(stream(RollingMin(14), low), pd.Series(low).rolling(14).min())
+
+
+def test_bollinger_bands_match_qtpylib():
+    qtpylib = pytest.importorskip('technical.qtpylib')
+    _, _, close = candles(5000, seed=4)
+    expected = qtpylib.bollinger_bands(pd.Series(close), window=20, stds=2)
+    bands = BollingerBands(20, 2)
+    lower, mid, upper = np.array([bands.update(x) for x in close]).T
+    assert_same(lower, expected['lower'], RTOL)
+    assert_same(mid, expected['mid'], RTOL)
+    assert_same(upper, expected['upper'], RTOL)
+
+
+def test_streaming_equals_a_full_pass_over_the_history():
+    high, low, close = candles(1300, seed=5)
+    history = pd.DataFrame({
+        'date': pd.date_range('2024-01-01', periods=len(close), freq='5min', tz='UTC'),
+        'high': high, 'low': low, 'close': close,
+    })
+    indicators = [
+        Indicator('ema', EMA, 'close', 50),
+        Indicator('rsi', RSI, 'close', 14),
+        Indicator('atr', ATR, ('high', 'low', 'close'), 14),
+        Indicator('hh', RollingMax, 'high', 14),
+    ]
+    engine = IncrementalIndicators(indicators)
+    window = 1000
+    for end in range(window, len(history) + 1, 3):
+        # the dataframe of a live run: the last window candles, up to 3 new per call
+        dataframe = history.iloc[end - window:end].reset_index(drop=True)
+        outputs = engine.update('BTC/USDT', dataframe)
+
+    full = IncrementalIndicators(indicators).update('BTC/USDT', history.iloc[:end])
+    for name, values in outputs.items():
+        np.testing.assert_array_equal(values, full[name][end - window:])
+
+
+def ohlcv(length, seed=0):
+    high, low, close = candles(length, seed)
+    return pd.DataFrame({
+        'date': pd.date_range('2024-01-01', periods=length, freq='10min', tz='UTC'),
+        'open': close,
+        'high': high,
+        'low': low,
+        'close': close,
+        'volume': 1.0,
+    })
+
+
+class AnalyzedDataProvider:
+
+    def __init__(self, dataframe):
+        self.dataframe = dataframe
+        self.analyzed = pd.Timestamp('2024-01-01', tz='UTC')
+
+    def get_analyzed_dataframe(self, pair, timeframe):
+        return self.dataframe, self.analyzed
+
+
+def appended_fastk(dataframe, pc):
+    """KamaFama_2 custom_exit before FormingFastK: STOCHF over the analyzed candles + pc."""
+    from talib import abstract as ta
+    df = dataframe.copy()
+    df = pd.concat([df, pc.to_frame().T], ignore_index=True).infer_objects()   # df._append(pc, ignore_index=True)
+    stoch_fast = ta.STOCHF(df, 5, 3, 0, 3, 0)
+    df['fastk'] = stoch_fast['fastk']
+    return df.iloc[-1].squeeze()['fastk']
+
+
+def forming_candle(dataframe, rng):
+    last = dataframe['close'].iat[-1] if len(dataframe) else 100.0
+    close = last * (1 + rng.normal(0, 0.01))
+    return pd.Series({'date': pd.Timestamp('2030-01-01', tz='UTC'), 'open': last,
+                      'high': max(last, close) * 1.001, 'low': min(last, close) * 0.999, 'close': close, 'volume': 1.0})
+
+
+@pytest.mark.parametrize('length', [0, 1, 3, 6, 7, 300])
+def test_forming_fastk_equals_stochf_over_the_appended_frame(length):
+    rng = np.random.default_rng(length)
+    history = ohlcv(length + 20, seed=length)
+    if length > 50:
+        # flat candles: high == low
+        history.loc[100:110, ['open', 'high', 'low', 'close']] = 100.0
+    fastk = FormingFastK(5, 3)
+    dp = AnalyzedDataProvider(history.iloc[:length])
+
+    for end in range(length, length + 20):
+        # a new analyzed candle, then several ticks of the forming one
+        dp.dataframe = history.iloc[:end].reset_index(drop=True)
+        dp.analyzed += pd.Timedelta(minutes=10)
+        for _ in range(3):
+            pc = forming_candle(dp.dataframe, rng)
+            actual = fastk.get(dp, 'BTC/USDT', '10m', pc['high'], pc['low'], pc['close'])
+            expected = appended_fastk(dp.dataframe, pc)
+            if np.isnan(expected):
+                assert np.isnan(actual)
+            else:
+                assert actual == expected
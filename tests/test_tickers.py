@@ -0,0 +1,155 @@
+import pytest
+
+from strategy_utils.tickers import TickerSnapshot, TickersNotSupported, exchange_tickers
+
+
+class Clock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeDataProvider:
+    """dp.ticker(pair), counting the requests."""
+
+    def __init__(self, prices):
+        self.prices = prices
+        self.requests = []
+
+    def ticker(self, pair):
+        self.requests.append(pair)
+        return {'symbol': pair, 'last': self.prices[pair]}
+
+
+class FakeTickers:
+    """fetch_tickers(dp) returning the given snapshots (or raising given exceptions) in turn."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = 0
+
+    def __call__(self, dp):
+        result = self.results[min(self.calls, len(self.results) - 1)]
+        self.calls += 1
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def tickers(**prices):
+    return {pair.replace('_', '/'): {'symbol': pair, 'last': last} for pair, last in prices.items()}
+
+
+def test_snapshot_reused_within_ttl():
+    clock = Clock()
+    fetch = FakeTickers(tickers(BTC_USDT=100.0, ETH_USDT=10.0), tickers(BTC_USDT=101.0, ETH_USDT=11.0))
+    snapshot = TickerSnapshot(ttl=3, fetch_tickers=fetch, clock=clock)
+    dp = FakeDataProvider({})
+
+    assert snapshot.last(dp, 'BTC/USDT') == 100.0
+    clock.now = 2.9
+    assert snapshot.last(dp, 'ETH/USDT') == 10.0
+    assert fetch.calls == 1
+
+    clock.now = 3.5
+    assert snapshot.last(dp, 'BTC/USDT') == 101.0
+    assert fetch.calls == 2
+    assert dp.requests == []
+
+
+def test_missing_pair_asks_the_data_provider():
+    snapshot = TickerSnapshot(fetch_tickers=FakeTickers(tickers(BTC_USDT=100.0)), clock=Clock())
+    dp = FakeDataProvider({'NEW/USDT': 5.0})
+
+    assert snapshot.last(dp, 'NEW/USDT') == 5.0
+    assert dp.requests == ['NEW/USDT']
+
+
+def test_transient_error_keeps_the_snapshot_and_retries():
+    clock = Clock()
+    fetch = FakeTickers(tickers(BTC_USDT=100.0), ConnectionError('timeout'), tickers(BTC_USDT=102.0))
+    snapshot = TickerSnapshot(ttl=3, fetch_tickers=fetch, clock=clock)
+    dp = FakeDataProvider({'BTC/USDT': 0.0})
+
+    assert snapshot.last(dp, 'BTC/USDT') == 100.0
+    clock.now = 4
+    assert snapshot.last(dp, 'BTC/USDT') == 100.0
+    assert snapshot.failures == 1
+    clock.now = 5
+    assert fetch.calls == 2     # no new attempt before ttl
+    clock.now = 8
+    assert snapshot.last(dp, 'BTC/USDT') == 102.0
+    assert snapshot.failures == 0
+    assert dp.requests == []
+
+
+def test_snapshot_older_than_max_age_asks_the_data_provider():
+    clock = Clock()
+    fetch = FakeTickers(tickers(BTC_USDT=100.0), ConnectionError('rate limit'), ConnectionError('rate limit'),
+                        ConnectionError('rate limit'), tickers(BTC_USDT=103.0))
+    snapshot = TickerSnapshot(ttl=3, max_age=10, fetch_tickers=fetch, clock=clock)
+    dp = FakeDataProvider({'BTC/USDT': 101.0})
+
+    assert snapshot.last(dp, 'BTC/USDT') == 100.0
+    clock.now = 4
+    assert snapshot.last(dp, 'BTC/USDT') == 100.0     # 4s old
+    clock.now = 8
+    assert snapshot.last(dp, 'BTC/USDT') == 100.0     # 8s old
+    assert dp.requests == []
+    clock.now = 12
+    assert snapshot.last(dp, 'BTC/USDT') == 101.0     # 12s old: dropped
+    assert dp.requests == ['BTC/USDT']
+    assert snapshot.failures == 3
+    clock.now = 16
+    assert snapshot.last(dp, 'BTC/USDT') == 103.0
+    assert fetch.calls == 5
+    assert dp.requests == ['BTC/USDT']
+
+
+@pytest.mark.parametrize('error', [
+    TickersNotSupported('no fetchTickers'),
+    RuntimeError('does not support fetching tickers in batch'),
+])
+def test_not_supported_falls_back_for_good(error):
+    if isinstance(error, RuntimeError):
+        # freqtrade wraps the ccxt error: raise OperationalException(...) from e
+        error.__cause__ = TickersNotSupported('no fetchTickers')
+    clock = Clock()
+    fetch = FakeTickers(error, tickers(BTC_USDT=100.0))
+    snapshot = TickerSnapshot(ttl=3, fetch_tickers=fetch, clock=clock)
+    dp = FakeDataProvider({'BTC/USDT': 99.0})
+
+    assert snapshot.last(dp, 'BTC/USDT') == 99.0
+    clock.now = 100
+    assert snapshot.last(dp, 'BTC/USDT') == 99.0
+    assert fetch.calls == 1
+    assert dp.requests == ['BTC/USDT', 'BTC/USDT']
+
+
+class FakeExchange:
+    name = 'fake'
+
+    def __init__(self, has_tickers):
+        self.has_tickers = has_tickers
+
+    def exchange_has(self, endpoint):
+        return endpoint == 'fetchTickers' and self.has_tickers
+
+    def get_tickers(self, cached=True):
+        assert cached is False
+        return tickers(BTC_USDT=100.0)
+
+
+class ExchangeDataProvider:
+
+    def __init__(self, exchange):
+        self._exchange = exchange
+
+
+def test_exchange_tickers():
+    assert exchange_tickers(ExchangeDataProvider(FakeExchange(True)))['BTC/USDT']['last'] == 100.0
+    with pytest.raises(TickersNotSupported):
+        exchange_tickers(ExchangeDataProvider(FakeExchange(False)))
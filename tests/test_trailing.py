@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from strategy_utils.trailing import replay_trailing_buy
+
+
+def candles(length, seed):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.004, length)))
+    signal = (rng.random(length) < 0.05).astype(int)
+    return signal, close
+
+
+def live_trailing_buy(signal, close, offset, max_buy=0.0, max_stop=None):
+    """
+    The live branches before the state machine, candle by candle with the close as price:
+    TrailingBuyStrat (NASOSv5) populate_buy_trend, with the max_buy / max_stop checks of
+    TrailingBuyStrat2 (BB_RPB_TSL_RNG_TBS_GOLD).
+    """
+    trailing_buy = {'trailing_buy_order_started': False, 'trailing_buy_order_uplimit': 0, 'start_trailing_price': 0}
+    buy = np.zeros(len(close), dtype=np.int64)
+    for i, current_price in enumerate(close):
+        if not trailing_buy['trailing_buy_order_started'] and signal[i] == 1:
+            trailing_buy['trailing_buy_order_started'] = True
+            trailing_buy['start_trailing_price'] = current_price
+            trailing_buy['trailing_buy_order_uplimit'] = current_price
+        elif trailing_buy['trailing_buy_order_started']:
+            if current_price < trailing_buy['trailing_buy_order_uplimit']:
+                trailing_buy['trailing_buy_order_uplimit'] = min(current_price * (1 + offset), trailing_buy['trailing_buy_order_uplimit'])
+            elif current_price < (trailing_buy['start_trailing_price'] * (1 + max_buy)):
+                buy[i] = 1
+                trailing_buy['trailing_buy_order_started'] = False
+                trailing_buy['trailing_buy_order_uplimit'] = 0
+                trailing_buy['start_trailing_price'] = None
+            elif max_stop is not None and current_price > (trailing_buy['start_trailing_price'] * (1 + max_stop)):
+                trailing_buy['trailing_buy_order_started'] = False
+                trailing_buy['trailing_buy_order_uplimit'] = 0
+                trailing_buy['start_trailing_price'] = 0
+    return buy
+
+
+@pytest.mark.parametrize('max_buy, max_stop', [(0.0, None), (0.0, 0.02), (0.002, 0.01)])
+@pytest.mark.parametrize('length, seed', [(0, 0), (1, 1), (3, 2), (2000, 3), (2000, 4)])
+def test_replay_equals_the_live_branch(length, seed, max_buy, max_stop):
+    signal, close = candles(length, seed)
+    expected = live_trailing_buy(signal, close, 0.005, max_buy, max_stop)
+    np.testing.assert_array_equal(replay_trailing_buy(signal, close, 0.005, max_buy, max_stop), expected)
+    if length > 100:
+        assert expected.sum() > 0
+
+
+def test_replay_gives_up_after_max_candles():
+    close = np.array([100.0, 99.0, 98.0, 97.0, 99.5, 99.0])
+    signal = np.array([1, 0, 0, 0, 0, 0])
+    np.testing.assert_array_equal(replay_trailing_buy(signal, close, 0.005), [0, 0, 0, 0, 1, 0])
+    np.testing.assert_array_equal(replay_trailing_buy(signal, close, 0.005, max_candles=3), [0] * 6)
+
+
+def test_trailing_buy_strat_live_equals_replay(monkeypatch):
+    pytest.importorskip('freqtrade')
+    from freqtrade.enums import RunMode
+    from NASOSv5.NASOSv5_mod3 import NASOSv5_mod3, TrailingBuyStrat
+
+    signal, close = candles(400, 5)
+    frame = pd.DataFrame({
+        'close': close,
+        'buy': np.where(signal == 1, 1.0, np.nan),
+        'buy_tag': np.where(signal == 1, 'ewo1', None),
+    })
+    # the buy signals of NASOSv5_mod3 as given above
+    monkeypatch.setattr(NASOSv5_mod3, 'populate_buy_trend', lambda self, dataframe, metadata: dataframe)
+
+    strategy = TrailingBuyStrat({'runmode': RunMode.DRY_RUN})
+    live = []
+    for end in range(1, len(frame) + 1):
+        # process_only_new_candles: the price is the close of the last candle
+        dataframe = strategy.populate_buy_trend(frame.iloc[max(0, end - 50):end].copy(), {'pair': 'BTC/USDT'})
+        live.append(dataframe['buy'].iat[-1])
+
+    expected = replay_trailing_buy(signal, close, strategy.trailing_buy_offset)
+    np.testing.assert_array_equal(live, expected)
+    assert expected.sum() > 0
+
+    strategy.config = {'runmode': RunMode.BACKTEST}
+    strategy.trailing_buy_replay = True
+    np.testing.assert_array_equal(strategy.populate_buy_trend(frame.copy(), {'pair': 'ETH/USDT'})['buy'], expected)
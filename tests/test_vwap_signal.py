@@ -0,0 +1,84 @@
+"""
+VWAP_signal of VWAPStrategy_14 against the per-row loop it replaced.
+
+    python tests/test_vwap_signal.py 200000     # times both on 200k candles
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def vwap_signal_loop(dataframe: pd.DataFrame) -> list:
+    """The former loop of VWAPStrategy_14.populate_indicators."""
+    VWAP_signal = [0] * len(dataframe)
+    backcandles = 15
+
+    for row in range(backcandles, len(dataframe)):
+
+        up_trend = 1
+        down_trend = 1
+
+        for i in range(row - backcandles, row + 1):
+
+            if max(dataframe['open'][i], dataframe['close'][i]) >= dataframe['VWAP'][i]:
+                down_trend = 0  # Set down_trend to 0
+
+            if min(dataframe['open'][i], dataframe['close'][i]) <= dataframe['VWAP'][i]:
+                up_trend = 0  # Set up_trend to 0
+
+        if up_trend == 1 and down_trend == 1:
+            VWAP_signal[row] = 3  # Neutral signal
+        elif up_trend == 1:
+
+            VWAP_signal[row] = 2
+        elif down_trend == 1:
+
+            VWAP_signal[row] = 1
+
+    return VWAP_signal
+
+
+def candles(length: int, seed: int = 0, warmup: int = 20) -> pd.DataFrame:
+    """Random walk with a slow VWAP, so that long trends on both sides occur; NaN VWAP first."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.004, length)))
+    open_ = np.concatenate((close[:1], close[:-1])) * (1 + rng.normal(0, 0.0005, length))
+    vwap = pd.Series(close).rolling(60, min_periods=1).mean().to_numpy(copy=True)
+    vwap[:warmup] = np.nan
+    return pd.DataFrame({'open': open_, 'close': close, 'VWAP': vwap})
+
+
+def vwap_signal_function():
+    pytest.importorskip('freqtrade')
+    pytest.importorskip('pandas_ta')
+    from VWAPStrategy.VWAPStrategy_14 import VWAP_signal
+    return VWAP_signal
+
+
+@pytest.mark.parametrize('length, warmup', [(1000, 20), (1000, 0), (10, 5), (16, 16), (0, 0)])
+def test_matches_loop(length, warmup):
+    VWAP_signal = vwap_signal_function()
+    dataframe = candles(length, warmup=warmup)
+    signal = VWAP_signal(dataframe)
+    expected = vwap_signal_loop(dataframe)
+    np.testing.assert_array_equal(signal, np.array(expected, dtype=np.int64))
+    if length >= 1000:
+        # both trends occur, 3 only with a full window of NaN VWAP
+        assert set(expected) == ({0, 1, 2, 3} if warmup > 15 else {0, 1, 2})
+
+
+if __name__ == '__main__':
+    VWAP_signal = vwap_signal_function()
+    dataframe = candles(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
+    start = time.perf_counter()
+    expected = vwap_signal_loop(dataframe)
+    loop_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    signal = VWAP_signal(dataframe)
+    function_seconds = time.perf_counter() - start
+    np.testing.assert_array_equal(signal, np.array(expected, dtype=np.int64))
+    print(f'{len(dataframe)} candles: loop {loop_seconds:.2f}s, VWAP_signal {function_seconds * 1000:.1f}ms, '
+          f'same output')